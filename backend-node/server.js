@@ -6,6 +6,9 @@ import cors from "cors";
 const app = express();
 app.use(cors());
 
+// Standalone alternative to the Python backend (same port). It scrapes the
+// yearly PDF link lists on every request; the Python backend instead serves
+// image highlight cards from a background-refreshed snapshot.
 app.get("/api/taskbook/highlights", async (req, res) => {
   try {
     const url = "https://taskbook.nasaprs.com/tbp/highlights.cfm";
@@ -1,17 +1,121 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import csv
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+from fastapi.responses import StreamingResponse
 import os
-import httpx
+import json
+import hashlib
+import time
+import threading
 import asyncio
-from bs4 import BeautifulSoup
-from utils.fetch_article_content import fetch_article_content
-from ai_utils import router as ai_router
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from utils.fetch_article_content import fetch_article_content_async, build_article_response, is_fetch_error
+from utils.fetch_article_selenium import driver_pool
+from utils.article_catalog import ArticleCatalog
+from utils.search_index import SearchIndex
+from utils.content_store import open_article_store
+from utils.http_client import create_async_client, pool_stats, ConnectionMetrics
+from utils.upstream import create_upstream
+from utils.encoding import FastJSONResponse, encoded_response, dumps, loads
+from utils.taskbook import HighlightsSnapshot, TASKBOOK_URL, DEFAULT_SNAPSHOT_PATH as DEFAULT_TASKBOOK_PATH
+from utils.rate_limiter import AsyncHostRateLimiter
+from utils.single_flight import SingleFlight
+from utils.response_cache import ResponseCache, cached_json_response, etag_matches
+from utils.pipeline import bounded_map, timed_section, timing_summary
+from utils.dataset_catalog import DatasetSnapshot, DEFAULT_SNAPSHOT_PATH, dataset_index, dataset_record, placeholder_record
+from utils.dataset_search import DatasetSearch
+from ai_utils import router as ai_router, llm, llm_cache, summary_store, summary_version
 
-app = FastAPI(title="NASA Space Biology API")
+@asynccontextmanager
+async def lifespan(app):
+    # Index bodies persisted by earlier runs without holding up startup
+    threading.Thread(target=index_stored_articles, daemon=True).start()
+    if os.getenv("SELENIUM_POOL_PREWARM", "0") == "1":
+        threading.Thread(target=driver_pool.warm, daemon=True).start()
+    refreshers = [
+        asyncio.create_task(refresh_dataset_snapshot_periodically()),
+        asyncio.create_task(refresh_taskbook_periodically()),
+    ]
+    yield
+    for refresher in refreshers:
+        refresher.cancel()
+    await article_http_client.aclose()
+    await osdr_client.aclose()
+    driver_pool.shutdown()
 
-# Cache for article content
-article_cache = {}
+app = FastAPI(title="NASA Space Biology API", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Persistent two-tier cache for fetched article content (memory LRU + SQLite)
+article_store = open_article_store()
+
+OSDR_API = "https://visualization.osdr.nasa.gov/biodata/api/v2"
+
+# Shared keep-alive clients; every OSDR proxy route reuses one connection pool
+article_http_metrics = ConnectionMetrics()
+article_http_client = create_async_client(timeout=15.0, metrics=article_http_metrics)
+osdr_metrics = ConnectionMetrics()
+osdr_client = create_async_client(
+    timeout=float(os.getenv("OSDR_TIMEOUT", "30")),
+    max_connections=int(os.getenv("OSDR_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("OSDR_MAX_KEEPALIVE", "40")),
+    metrics=osdr_metrics,
+)
+
+# Retries, per-host circuit breakers and adaptive concurrency for every upstream GET. Only the
+# idempotent OSDR API calls are hedged; a duplicate article request would bypass the per-host
+# politeness limits below
+osdr_upstream = create_upstream(osdr_client)
+web_upstream = create_upstream(article_http_client, hedge=False)
+
+# Per-host politeness for article fetches
+article_rate_limiter = AsyncHostRateLimiter(
+    min_interval=float(os.getenv("ARTICLE_HOST_MIN_INTERVAL", "1.0")),
+    jitter=float(os.getenv("ARTICLE_HOST_JITTER", "1.0")),
+    max_concurrent=int(os.getenv("ARTICLE_HOST_MAX_CONCURRENT", "4")),
+)
+
+# Concurrent requests for the same uncached article share one fetch
+article_fetches = SingleFlight()
+
+# Stale-while-revalidate cache for OSDR proxy responses, keyed by upstream URL
+osdr_cache = ResponseCache(max_bytes=int(os.getenv("OSDR_CACHE_MB", "32")) * 1024 * 1024)
+OSDR_CACHE_NEGATIVE_TTL = float(os.getenv("OSDR_CACHE_NEGATIVE_TTL", "300"))
+# (ttl, stale_ttl) in seconds per kind of OSDR resource
+OSDR_CACHE_TTLS = {
+    "datasets": (600, 3600),
+    "dataset": (3600, 24 * 3600),
+    "assays": (3600, 24 * 3600),
+    "assay-details": (3600, 24 * 3600),
+    "samples": (3600, 24 * 3600),
+    "files": (1800, 24 * 3600),
+}
+
+# Upstream dataset requests kept in flight by /api/datasets/bulk
+OSDR_BULK_CONCURRENCY = int(os.getenv("OSDR_BULK_CONCURRENCY", "32"))
+last_bulk_run = {}
+
+# Persisted dataset records behind /api/datasets/bulk, refreshed incrementally in the background
+dataset_snapshot = DatasetSnapshot(
+    os.getenv("OSDR_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH),
+    max_age=float(os.getenv("OSDR_SNAPSHOT_MAX_AGE_HOURS", "168")) * 3600,
+)
+OSDR_SNAPSHOT_REFRESH_HOURS = float(os.getenv("OSDR_SNAPSHOT_REFRESH_HOURS", "6"))
+snapshot_tasks = set()
+
+# Task Book highlights are scraped on a schedule and served from the last good snapshot
+taskbook_highlights = HighlightsSnapshot(os.getenv("TASKBOOK_SNAPSHOT_PATH", DEFAULT_TASKBOOK_PATH))
+TASKBOOK_REFRESH_HOURS = float(os.getenv("TASKBOOK_REFRESH_HOURS", "12"))
+# Facet/text index over the snapshot, rebuilt when the snapshot changes
+dataset_search = None
+dataset_search_lock = threading.Lock()
+
+# Compresses dynamic responses; pre-encoded cache hits already carry Content-Encoding.
+# Streams are left alone: GZipMiddleware would buffer the events and lines clients render as they arrive.
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+app.add_middleware(GZipMiddleware, minimum_size=1024,
+                   exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + STREAMING_MEDIA_TYPES)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,24 +123,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Cache", "X-Snapshot-Age"],
 )
 
 app.include_router(ai_router, prefix="/ai")
 
-def load_articles():
-    articles = []
-    try:
-        with open("SB_publication_PMC.csv", "r", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                articles.append({
-                    "title": row["Title"],
-                    "link": row["Link"]
-                })
-        return articles
-    except Exception as e:
-        print(f"Error loading CSV: {e}")
-        return []
+# Publication catalog, parsed once and hot-reloaded when the CSV changes
+catalog = ArticleCatalog("SB_publication_PMC.csv")
+
+# Full-text index over catalog titles and every article body fetched so far.
+# Documents are keyed by Article.key (a hash of the link), not the row index,
+# so indexed bodies stay with their article when the CSV is reordered.
+search_index = SearchIndex()
+search_index_lock = threading.Lock()
+_indexed_catalog_digest = None
+
+def sync_search_index():
+    """Index catalog titles, re-indexing once whenever the catalog has been reloaded"""
+    global _indexed_catalog_digest
+    if _indexed_catalog_digest == catalog.digest:
+        return
+    with search_index_lock:
+        digest = catalog.digest
+        if _indexed_catalog_digest == digest:
+            return
+        articles = catalog.all()
+        for article in articles:
+            search_index.add(article.key, "title", article.title)
+        # Drops the titles and bodies of articles no longer in the catalog
+        for stale_key in search_index.doc_ids() - {article.key for article in articles}:
+            search_index.remove(stale_key)
+        _indexed_catalog_digest = digest
+
+def index_article_body(article, content):
+    """Add a fetched article body to the search index"""
+    if not is_fetch_error(content):
+        search_index.add(article.key, "body", content, is_html=True)
+
+def index_stored_articles():
+    count = 0
+    for _, link_hash, stored in article_store.iter_fresh():
+        article = catalog.get_by_key(link_hash)
+        if article is not None:
+            index_article_body(article, stored.get("content", ""))
+            count += 1
+    print(f"✓ Indexed {count} stored article bodies")
+
+sync_search_index()
 
 @app.get("/")
 def read_root():
@@ -47,50 +180,98 @@ def test_endpoint():
     return {"status": "Backend is running", "endpoints": ["/api/datasets", "/api/dataset/{id}", "/api/articles"]}
 
 @app.get("/articles")
-def get_articles():
-    articles = load_articles()
-    return [{"id": idx, "title": a["title"], "link": a["link"]} for idx, a in enumerate(articles)]
+def get_articles(
+    request: Request,
+    response: Response,
+    offset: int = 0,
+    limit: int = None,
+    q: str = None,
+    prefix: str = None,
+    article_type: str = Query(None, alias="type"),
+    sort: str = "id",
+):
+    """List articles with optional title search, type filter, sorting and paging"""
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset and limit must be non-negative")
+
+    # ETag covers both the CSV contents and the query, so repeat loads get a 304
+    query_key = f"{offset}|{limit}|{q}|{prefix}|{article_type}|{sort}"
+    etag = f'W/"{catalog.digest}-{hashlib.md5(query_key.encode()).hexdigest()[:12]}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    if not any([q, prefix, article_type]) and sort == "id":
+        results = catalog.listing()
+    else:
+        try:
+            results = catalog.query(q=q, prefix=prefix, article_type=article_type, sort=sort)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    response.headers["ETag"] = etag
+    response.headers["X-Total-Count"] = str(len(results))
+    end = offset + limit if limit is not None else None
+    return results[offset:end]
+
+@app.get("/articles/types")
+def get_article_types(request: Request, response: Response):
+    """Article types with their counts, for building type filters without listing the catalog"""
+    etag = f'W/"{catalog.digest}-types"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return [{"type": article_type, "count": count} for article_type, count in catalog.types()]
+
+@app.get("/articles/search")
+def search_articles(q: str, limit: int = 20):
+    """Ranked (BM25) search over article titles and fetched article bodies; supports "quoted phrases" """
+    started = time.perf_counter()
+    sync_search_index()
+    results = []
+    for key, score in search_index.search(q, limit=max(1, min(limit, 100))):
+        article = catalog.get_by_key(key)
+        if article is None:
+            continue
+        result = article.to_dict()
+        result["score"] = round(score, 4)
+        result["content_indexed"] = search_index.has_field(key, "body")
+        results.append(result)
+    return {
+        "query": q,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+async def fetch_and_store_article(article):
+    print(f"Fetching article: {article.title}")
+    print(f"URL: {article.link}")
+    
+    result = await fetch_article_content_async(article.link, web_upstream, article_rate_limiter)
+    response = build_article_response(article, result)
+    content = response["content"]
+    
+    # Cache the result (failed fetches are retried next time)
+    if not is_fetch_error(content):
+        await asyncio.to_thread(article_store.put, article.link, response, article.id)
+        await asyncio.to_thread(index_article_body, article, content)
+        print(f"✓ Cached article {article.id}")
+    
+    return response
 
 @app.get("/articles/{article_id}")
-def get_article_content(article_id: int):
+async def get_article_content(article_id: int, request: Request):
+    article = catalog.get(article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    
     try:
-        articles = load_articles()
-        if article_id < 0 or article_id >= len(articles):
-            raise HTTPException(status_code=404, detail="Article not found")
-        
-        article = articles[article_id]
-        
-        # Check cache first
-        if article_id in article_cache:
-            print(f"✓ Serving cached article: {article['title']}")
-            return article_cache[article_id]
-        
-        print(f"Fetching article: {article['title']}")
-        print(f"URL: {article['link']}")
-        
-        result = fetch_article_content(article["link"])
-        
-        # Handle both string and dict responses
-        if isinstance(result, dict):
-            content = result.get("content", "")
-            tables = result.get("tables", [])
-        else:
-            content = result
-            tables = []
+        # Check cache first; hits are sent as the stored compressed bytes
+        cached = await asyncio.to_thread(article_store.get_encoded, article.link, article_id)
+        if cached is not None:
+            print(f"✓ Serving cached article: {article.title}")
+            return encoded_response(request, cached)
         
-        response = {
-            "id": article_id,
-            "title": article["title"],
-            "link": article["link"],
-            "content": content,
-            "tables": tables
-        }
-        
-        # Cache the result
-        article_cache[article_id] = response
-        print(f"✓ Cached article {article_id}")
-        
-        return response
+        return await article_fetches.do(article_id, lambda: fetch_and_store_article(article))
     except Exception as e:
         print(f"ERROR: {str(e)}")
         import traceback
@@ -103,201 +284,575 @@ def get_article_content(article_id: int):
             "tables": []
         }
 
+@app.get("/api/metrics")
+def get_metrics():
+    """Runtime counters for the fetch pipeline and upstream connection pools"""
+    return {
+        "article_store": article_store.stats(),
+        "webdriver_pool": driver_pool.stats(),
+        "article_rate_limiter": article_rate_limiter.stats(),
+        "article_fetch_coalescing": article_fetches.stats(),
+        "article_http": {**pool_stats(article_http_client), **article_http_metrics.stats()},
+        "osdr_http": {**pool_stats(osdr_client), **osdr_metrics.stats()},
+        "upstream_hosts": {**osdr_upstream.stats(), **web_upstream.stats()},
+        "osdr_cache": osdr_cache.stats(),
+        "datasets_bulk_last_run": last_bulk_run,
+        "dataset_snapshot": dataset_snapshot.stats(),
+        "taskbook_highlights": taskbook_highlights.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm": llm.stats(),
+        "precomputed_summaries": summary_store.stats(summary_version()),
+    }
+
+@app.get("/api/cache/articles")
+def get_article_cache_stats():
+    """Hit/miss/eviction counters and sizes for the article content store"""
+    return article_store.stats()
+
+@app.delete("/api/cache/articles")
+def clear_article_cache():
+    return {"removed": article_store.invalidate()}
+
+@app.delete("/api/cache/articles/{article_id}")
+def invalidate_article_cache(article_id: int):
+    article = catalog.get(article_id)
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return {"removed": article_store.invalidate(article.link)}
+
+@app.get("/api/cache/osdr")
+def get_osdr_cache_stats():
+    return osdr_cache.stats()
+
+@app.delete("/api/cache/osdr")
+def clear_osdr_cache():
+    osdr_cache.invalidate()
+    return {"cleared": True}
+
+async def fetch_osdr_json(url):
+    """
+    (status, json) for an OSDR URL. 404s are returned for the negative cache;
+    any other non-2xx (5xx, 429, 401/403, ...) raises so it is never cached.
+    """
+    response = await osdr_upstream.get(url)
+    if response.status_code == 404:
+        try:
+            return 404, response.json()
+        except ValueError:
+            return 404, {"detail": "Not found"}
+    response.raise_for_status()
+    return response.status_code, response.json()
+
+async def cached_osdr_get(url, kind):
+    ttl, stale_ttl = OSDR_CACHE_TTLS[kind]
+    return await osdr_cache.get(url, lambda: fetch_osdr_json(url), ttl, stale_ttl, OSDR_CACHE_NEGATIVE_TTL)
+
 @app.get("/api/dataset/{dataset_id}")
-async def get_dataset(dataset_id: str):
+async def get_dataset(dataset_id: str, request: Request):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/")
-            data = response.json()
-            print(f"Dataset {dataset_id} response keys:", list(data.keys()) if isinstance(data, dict) else type(data))
-            return data
+        entry, cache_status = await cached_osdr_get(f"{OSDR_API}/dataset/{dataset_id}/", "dataset")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_json_response(entry, cache_status, request)
 
 @app.get("/api/dataset/{dataset_id}/assays")
-async def get_dataset_assays(dataset_id: str):
+async def get_dataset_assays(dataset_id: str, request: Request):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/assays/")
-            data = response.json()
-            print(f"Assays for {dataset_id}:", data)
-            return data
+        entry, cache_status = await cached_osdr_get(f"{OSDR_API}/dataset/{dataset_id}/assays/", "assays")
     except Exception as e:
         print(f"Error fetching assays for {dataset_id}:", str(e))
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_json_response(entry, cache_status, request)
 
-@app.get("/api/dataset/{dataset_id}/files")
-async def get_dataset_files(dataset_id: str):
+async def cached_osdr_files(url, request):
+    """Files listings answer [] for unknown resources and upstream errors"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/files/")
-            if response.status_code == 404:
-                return []
-            return response.json()
-    except Exception as e:
+        entry, cache_status = await cached_osdr_get(url, "files")
+    except Exception:
         return []
+    if entry.status == 404:
+        return cached_json_response(entry, cache_status, request, body=b"[]", status_code=200)
+    return cached_json_response(entry, cache_status, request)
+
+@app.get("/api/dataset/{dataset_id}/files")
+async def get_dataset_files(dataset_id: str, request: Request):
+    return await cached_osdr_files(f"{OSDR_API}/dataset/{dataset_id}/files/", request)
+
+def is_osdr_api_url(url):
+    """True for URLs under OSDR_API; anything else must not reach the shared upstream client"""
+    parts, api = urlsplit(url), urlsplit(OSDR_API)
+    return (parts.scheme, parts.netloc.lower()) == (api.scheme, api.netloc) and \
+        (parts.path.rstrip("/") + "/").startswith(api.path + "/")
 
 @app.get("/api/assay-details")
-async def get_assay_details(url: str):
+async def get_assay_details(url: str, request: Request):
     """Proxy endpoint to fetch assay details from NASA API"""
+    # Every new host would add per-host upstream state that is never evicted
+    if not is_osdr_api_url(url):
+        raise HTTPException(status_code=400, detail=f"url must be under {OSDR_API}")
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            return response.json()
+        entry, cache_status = await cached_osdr_get(url, "assay-details")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_json_response(entry, cache_status, request)
 
 @app.get("/api/dataset/{dataset_id}/assay/{assay_name}/samples")
-async def get_assay_samples(dataset_id: str, assay_name: str):
+async def get_assay_samples(dataset_id: str, assay_name: str, request: Request):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/assay/{assay_name}/samples/")
-            return response.json()
+        entry, cache_status = await cached_osdr_get(f"{OSDR_API}/dataset/{dataset_id}/assay/{assay_name}/samples/", "samples")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return cached_json_response(entry, cache_status, request)
 
 @app.get("/api/dataset/{dataset_id}/assay/{assay_name}/files")
-async def get_assay_files(dataset_id: str, assay_name: str):
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/assay/{assay_name}/files/")
-            if response.status_code == 404:
-                return []
-            return response.json()
-    except Exception as e:
-        return []
+async def get_assay_files(dataset_id: str, assay_name: str, request: Request):
+    return await cached_osdr_files(f"{OSDR_API}/dataset/{dataset_id}/assay/{assay_name}/files/", request)
 
 @app.get("/api/dataset/{dataset_id}/assay/{assay_name}/sample/{sample_name}/files")
-async def get_sample_files(dataset_id: str, assay_name: str, sample_name: str):
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/assay/{assay_name}/sample/{sample_name}/files/")
-            if response.status_code == 404:
-                return []
-            return response.json()
-    except Exception as e:
+async def get_sample_files(dataset_id: str, assay_name: str, sample_name: str, request: Request):
+    return await cached_osdr_files(f"{OSDR_API}/dataset/{dataset_id}/assay/{assay_name}/sample/{sample_name}/files/", request)
+
+EXPERIMENT_SECTIONS = ("dataset", "assays", "files")
+
+async def osdr_json(url, kind):
+    """Parsed OSDR JSON via the response cache; None when upstream answers 404"""
+    entry, _ = await cached_osdr_get(url, kind)
+    return None if entry.status == 404 else loads(entry.body)
+
+def unwrap_accession(data):
+    """OSDR wraps every payload as {accession: {...}}"""
+    value = next(iter(data.values()), {}) if isinstance(data, dict) and data else {}
+    return value if isinstance(value, dict) else {}
+
+def osdr_entries(listing, key):
+    """
+    `[(name, info)]` for the `key` mapping (assays, files, samples) of an
+    unwrapped OSDR payload. Entries that are not objects get an empty info
+    dict, so a malformed upstream entry degrades instead of raising.
+    """
+    entries = listing.get(key)
+    if not isinstance(entries, dict):
         return []
+    return [(name, info if isinstance(info, dict) else {}) for name, info in entries.items()]
+
+async def resolve_assay(dataset_id, assay, depth, timings):
+    """Fill in assay details (depth >= 2) and its sample listing (depth >= 3) concurrently"""
+    async def details():
+        data = unwrap_accession(await osdr_json(assay["url"], "assay-details"))
+        assay_data = unwrap_accession(data.get("assays", {}))
+        assay["metadata"] = assay_data.get("metadata", {})
+        assay["samples"] = [{"name": name, "url": info.get("REST_URL")}
+                            for name, info in osdr_entries(assay_data, "samples") if name != "REST_URL"]
+
+    async def sample_listing():
+        assay["sample_listing"] = await osdr_json(
+            f"{OSDR_API}/dataset/{dataset_id}/assay/{assay['name']}/samples/", "samples")
+
+    work = {"details": details()}
+    if depth >= 3:
+        work["sample_listing"] = sample_listing()
+    results = await asyncio.gather(*(timed_section(timings, f"{assay['name']}:{name}", job)
+                                     for name, job in work.items()), return_exceptions=True)
+    errors = {name: str(result) for name, result in zip(work, results) if isinstance(result, Exception)}
+    if errors:
+        assay["errors"] = errors
+    return assay
+
+@app.get("/api/dataset/{dataset_id}/experiment")
+async def get_experiment(dataset_id: str, depth: int = 2, fields: str = ",".join(EXPERIMENT_SECTIONS)):
+    """
+    Everything ExperimentPage needs in one document, resolved concurrently:
+    depth 1 = dataset, assay list and file list; depth 2 adds each assay's
+    metadata and samples; depth 3 adds each assay's sample listing.
+    `fields` selects the top-level sections (dataset, assays, files).
+    Sections that fail upstream are reported under `errors`.
+    """
+    sections = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = set(sections) - set(EXPERIMENT_SECTIONS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(sorted(unknown))}")
+    if not 1 <= depth <= 3:
+        raise HTTPException(status_code=400, detail="depth must be 1, 2 or 3")
+
+    started = time.perf_counter()
+    timings = {}
+    urls = {
+        "dataset": (f"{OSDR_API}/dataset/{dataset_id}/", "dataset"),
+        "assays": (f"{OSDR_API}/dataset/{dataset_id}/assays/", "assays"),
+        "files": (f"{OSDR_API}/dataset/{dataset_id}/files/", "files"),
+    }
+    results = await asyncio.gather(*(timed_section(timings, name, osdr_json(*urls[name])) for name in sections),
+                                   return_exceptions=True)
+    fetched = dict(zip(sections, results))
+
+    document = {"accession": dataset_id, "depth": depth}
+    errors = {}
+    for name, result in fetched.items():
+        if name == "dataset":
+            if isinstance(result, Exception):
+                raise HTTPException(status_code=500, detail=str(result))
+            if result is None:
+                raise HTTPException(status_code=404, detail=f"Dataset {dataset_id} not found")
+            document["dataset"] = unwrap_accession(result)
+            continue
+        if isinstance(result, Exception):
+            errors[name] = str(result)
+            result = None
+        if name == "assays":
+            document["assays"] = [{"name": assay_name, "url": info.get("REST_URL")}
+                                  for assay_name, info in osdr_entries(unwrap_accession(result), "assays")]
+        else:
+            document["files"] = [{"name": file_name, "url": info.get("URL") or info.get("REST_URL"), "rest_url": info.get("REST_URL")}
+                                 for file_name, info in osdr_entries(unwrap_accession(result), "files")]
+
+    if depth >= 2 and document.get("assays"):
+        async for assay, result, _ in bounded_map(
+                document["assays"], lambda assay: resolve_assay(dataset_id, assay, depth, timings), OSDR_BULK_CONCURRENCY):
+            if isinstance(result, Exception):
+                assay.setdefault("errors", {})["details"] = str(result)
+
+    if errors:
+        document["errors"] = errors
+    document["timing"] = {"total_ms": round((time.perf_counter() - started) * 1000, 1), "upstream_ms": timings}
+    return document
+
+CHECKSUM_KEYS = ("checksum", "md5", "MD5", "sha256", "SHA256")
+
+def iter_listed_files(data):
+    """(name, info) for every entry under a "files" key anywhere in an OSDR files payload"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "files" and isinstance(value, dict):
+                for name, info in value.items():
+                    if isinstance(info, dict):
+                        yield name, info
+            else:
+                yield from iter_listed_files(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_listed_files(value)
+
+class ManifestLevel:
+    """Request/failure tally for one level of the manifest walk"""
+
+    def __init__(self):
+        self.requested = 0
+        self.ok = 0
+        self.not_found = 0
+        self.failed = 0
+        self.errors = []
+
+    def record(self, label, result):
+        self.requested += 1
+        if isinstance(result, Exception):
+            self.failed += 1
+            if len(self.errors) < 20:
+                self.errors.append({"source": label, "error": str(result)})
+        elif result is None:
+            self.not_found += 1
+        else:
+            self.ok += 1
+
+    def to_dict(self):
+        status = "ok" if not self.failed else ("failed" if not self.ok and not self.not_found else "partial")
+        return {"status": status, "requested": self.requested, "ok": self.ok,
+                "not_found": self.not_found, "failed": self.failed, "errors": self.errors}
+
+async def walk_manifest(dataset_id, concurrency, levels, seen):
+    """
+    Yield unique file records for a dataset: dataset files, then every
+    assay's files, then every sample's files. At most `concurrency` upstream
+    calls are in flight at any time (an assay needs two, so the bound is on
+    the calls, not on the per-assay workers); failures are tallied in
+    `levels` instead of being turned into empty listings.
+    """
+    upstream_slots = asyncio.Semaphore(concurrency)
+
+    async def fetch(url, kind):
+        async with upstream_slots:
+            return await osdr_json(url, kind)
+
+    def unique(listing, level, assay=None, sample=None):
+        for name, info in iter_listed_files(listing):
+            url = info.get("URL") or info.get("REST_URL")
+            checksum = next((info[key] for key in CHECKSUM_KEYS if info.get(key)), None)
+            keys = [key for key in (url and f"url:{url}", checksum and f"sum:{checksum}") if key]
+            if not keys:
+                keys = [f"name:{level}:{assay}:{sample}:{name}"]
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            record = {key: value for key, value in info.items() if key not in ("URL", "REST_URL")}
+            record.update({"name": name, "url": url, "rest_url": info.get("REST_URL"),
+                           "checksum": checksum, "level": level, "assay": assay, "sample": sample})
+            yield record
+
+    async def safe(work):
+        try:
+            return await work
+        except Exception as e:
+            return e
+
+    dataset_files, assays = await asyncio.gather(
+        safe(fetch(f"{OSDR_API}/dataset/{dataset_id}/files/", "files")),
+        safe(fetch(f"{OSDR_API}/dataset/{dataset_id}/assays/", "assays")),
+    )
+    levels["dataset"].record("files", dataset_files)
+    levels["dataset"].record("assays", assays)
+    if not isinstance(dataset_files, Exception):
+        for record in unique(dataset_files, "dataset"):
+            yield record
+    if isinstance(assays, Exception) or assays is None:
+        return
+
+    assay_urls = {name: info.get("REST_URL") or f"{OSDR_API}/dataset/{dataset_id}/assay/{name}/"
+                  for name, info in osdr_entries(unwrap_accession(assays), "assays")}
+
+    async def assay_listings(assay_name):
+        return await asyncio.gather(
+            safe(fetch(f"{OSDR_API}/dataset/{dataset_id}/assay/{assay_name}/files/", "files")),
+            safe(fetch(assay_urls[assay_name], "assay-details")),
+        )
+
+    samples = []
+    assay_names = list(assay_urls)
+    async for assay_name, (files, details), _ in bounded_map(assay_names, assay_listings, concurrency):
+        levels["assay"].record(f"{assay_name} files", files)
+        levels["assay"].record(f"{assay_name} details", details)
+        if not isinstance(files, Exception):
+            for record in unique(files, "assay", assay_name):
+                yield record
+        if not isinstance(details, Exception):
+            assay_data = unwrap_accession(unwrap_accession(details).get("assays", {}))
+            samples.extend((assay_name, sample_name) for sample_name, _ in osdr_entries(assay_data, "samples")
+                           if sample_name != "REST_URL")
+
+    async def sample_listing(pair):
+        assay_name, sample_name = pair
+        return await fetch(
+            f"{OSDR_API}/dataset/{dataset_id}/assay/{assay_name}/sample/{sample_name}/files/", "files")
+
+    async for (assay_name, sample_name), files, _ in bounded_map(samples, sample_listing, concurrency):
+        levels["sample"].record(f"{assay_name}/{sample_name}", files)
+        if not isinstance(files, Exception):
+            for record in unique(files, "sample", assay_name, sample_name):
+                yield record
+
+@app.get("/api/dataset/{dataset_id}/manifest")
+async def get_dataset_manifest(dataset_id: str, concurrency: int = OSDR_BULK_CONCURRENCY):
+    """
+    Every file of a dataset across the dataset, assay and sample levels,
+    deduplicated by URL or checksum and streamed as one JSON document:
+    `{"accession", "files": [...], "levels": {...}, "summary": {...}}`.
+    Each level reports ok / partial / failed with the upstream errors.
+    """
+    concurrency = max(1, min(concurrency, osdr_client.max_connections))
+
+    async def stream():
+        started = time.perf_counter()
+        levels = {"dataset": ManifestLevel(), "assay": ManifestLevel(), "sample": ManifestLevel()}
+        seen = set()
+        count = 0
+        yield f'{{"accession": {json.dumps(dataset_id)}, "files": ['
+        async for record in walk_manifest(dataset_id, concurrency, levels, seen):
+            yield (b"," if count else b"") + dumps(record)
+            count += 1
+        level_status = {name: level.to_dict() for name, level in levels.items()}
+        statuses = {level["status"] for level in level_status.values() if level["requested"]}
+        summary = {
+            "files": count,
+            "status": "ok" if statuses <= {"ok"} else "partial",
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        yield f'], "levels": {json.dumps(level_status)}, "summary": {json.dumps(summary)}}}'
+
+    return StreamingResponse(stream(), media_type="application/json")
 
 @app.get("/api/datasets")
-async def get_datasets():
-    async with httpx.AsyncClient() as client:
-        res = await client.get("https://visualization.osdr.nasa.gov/biodata/api/v2/datasets/")
-        return res.json()
+async def get_datasets(request: Request):
+    entry, cache_status = await cached_osdr_get(f"{OSDR_API}/datasets/", "datasets")
+    return cached_json_response(entry, cache_status, request)
 
 @app.get("/api/datasets/bulk")
-async def get_datasets_bulk():
-    """Fetch all datasets with metadata in bulk for fast loading"""
+async def get_datasets_bulk(request: Request, format: str = "json", concurrency: int = OSDR_BULK_CONCURRENCY, live: bool = False):
+    """
+    All datasets with metadata in bulk.
+
+    Served from the persisted dataset snapshot once one exists (ETag plus
+    X-Snapshot-Age headers); otherwise, or with `live=true`, fetched from
+    OSDR and streamed as datasets arrive. `format=json` returns one JSON
+    array; `format=ndjson` emits one `{"type": "dataset", "data"}` line per
+    dataset and a final `{"type": "summary"}` line with timing or snapshot age.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+    if not live and dataset_snapshot.refreshed_at is not None:
+        return snapshot_response(request, format == "ndjson")
+    concurrency = max(1, min(concurrency, osdr_client.max_connections))
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Get all dataset IDs
-            datasets_res = await client.get("https://visualization.osdr.nasa.gov/biodata/api/v2/datasets/")
-            all_datasets = datasets_res.json()
-            dataset_ids = list(all_datasets.keys())
-            
-            # Fetch metadata for all datasets in parallel (limited batches)
-            results = []
-            batch_size = 20
-            
-            for i in range(0, len(dataset_ids), batch_size):
-                batch = dataset_ids[i:i + batch_size]
-                batch_tasks = []
-                
-                for dataset_id in batch:
-                    batch_tasks.append(fetch_dataset_metadata(client, dataset_id))
-                
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                for result in batch_results:
-                    if not isinstance(result, Exception) and result:
-                        results.append(result)
-            
-            return results
+        # Get all dataset IDs
+        datasets_res = await osdr_upstream.get(f"{OSDR_API}/datasets/")
+        dataset_ids = list(dataset_index(datasets_res))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    if format == "ndjson":
+        return StreamingResponse(stream_datasets_bulk(dataset_ids, concurrency, True),
+                                 media_type="application/x-ndjson")
+    return StreamingResponse(stream_datasets_bulk(dataset_ids, concurrency, False), media_type="application/json")
+
+async def stream_datasets_bulk(dataset_ids, concurrency, ndjson):
+    started = time.perf_counter()
+    timings = []
+    returned = 0
+    if not ndjson:
+        yield "["
+    async for dataset_id, record, elapsed in bounded_map(
+            dataset_ids, lambda dataset_id: fetch_dataset_metadata(osdr_upstream, dataset_id), concurrency):
+        timings.append((elapsed, dataset_id))
+        if isinstance(record, Exception) or not record:
+            continue
+        if ndjson:
+            yield dumps({"type": "dataset", "elapsed_ms": round(elapsed * 1000, 1), "data": record}) + b"\n"
+        else:
+            yield (b"," if returned else b"") + dumps(record)
+        returned += 1
+
+    summary = {
+        **timing_summary(timings, time.perf_counter() - started),
+        "source": "live",
+        "datasets": len(dataset_ids),
+        "returned": returned,
+        "concurrency": concurrency,
+        "finished_at": time.time(),
+    }
+    last_bulk_run.clear()
+    last_bulk_run.update(summary)
+    print(f"✓ Bulk datasets: {returned}/{len(dataset_ids)} in {summary['total_seconds']}s (concurrency {concurrency})")
+    yield json.dumps({"type": "summary", **summary}) + "\n" if ndjson else "]"
+
 async def fetch_dataset_metadata(client, dataset_id):
     """Helper function to fetch individual dataset metadata"""
     try:
-        response = await client.get(f"https://visualization.osdr.nasa.gov/biodata/api/v2/dataset/{dataset_id}/")
+        response = await client.get(f"{OSDR_API}/dataset/{dataset_id}/")
         if response.status_code != 200:
             return None
-            
-        data = response.json()
-        dataset_key = list(data.keys())[0]
-        dataset = data[dataset_key]
-        metadata = dataset.get('metadata', {})
-        
-        return {
-            "accession": dataset_id,
-            "title": metadata.get("study title", dataset_id),
-            "description": metadata.get("study description", "No description available"),
-            "organism": metadata.get("organism", "N/A"),
-            "material": metadata.get("material type", "N/A"),
-            "factor": metadata.get("study factor name", "N/A"),
-            "funding": metadata.get("study funding agency", "N/A"),
-            "publication": metadata.get("study publication title", "N/A")
-        }
+        return dataset_record(dataset_id, response.json())
     except Exception:
-        return {
-            "accession": dataset_id,
-            "title": dataset_id,
-            "description": "Error loading details",
-            "organism": "N/A",
-            "material": "N/A",
-            "factor": "N/A",
-            "funding": "N/A",
-            "publication": "N/A"
-        }
-
+        return placeholder_record(dataset_id)
 
+def snapshot_response(request, ndjson):
+    headers = {
+        "ETag": dataset_snapshot.etag,
+        "X-Snapshot-Age": str(int(dataset_snapshot.age())),
+        "Cache-Control": "no-cache",
+    }
+    if not ndjson:
+        if etag_matches(request.headers.get("if-none-match"), dataset_snapshot.etag):
+            return Response(status_code=304, headers=headers)
+        return encoded_response(request, dataset_snapshot.json_payload(), headers=headers)
+    return encoded_response(request, dataset_snapshot.ndjson_payload(), headers=headers, media_type="application/x-ndjson")
 
-@app.get("/api/taskbook/highlights")
-async def get_taskbook_highlights():
-    """Fetch NASA Task Book highlights with images"""
-    url = "https://taskbook.nasaprs.com/tbp/highlights.cfm"
+async def refresh_dataset_snapshot(full=False):
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            highlights = []
-            for img in soup.find_all('img'):
-                img_src = img.get('src', '')
-                if img_src and not img_src.endswith('.gif'):
-                    parent = img.find_parent(['a', 'div', 'td'])
-                    if parent:
-                        text = parent.get_text().strip()
-                        if len(text) > 50:
-                            full_img_url = img_src if img_src.startswith('http') else f"https://taskbook.nasaprs.com{img_src}"
-                            highlights.append({
-                                "title": text[:100],
-                                "summary": text,
-                                "image": full_img_url
-                            })
-    except:
-        pass
-    
-    if not highlights:
-        highlights = [
-            {"title": "Spaceflight Allows Botanists To Probe Fundamental Questions About Plants", "summary": "Research by Ferl/Paul exploring how spaceflight environments enable scientists to study fundamental aspects of plant biology, including growth patterns, gene expression, and adaptation mechanisms in microgravity conditions.", "image": "https://images.unsplash.com/photo-1530836369250-ef72a3f5cda8?w=400"},
-            {"title": "Microgravity Offers a Unique Opportunity to Study Human Immune Function", "summary": "Hughes-Fulford's research demonstrates how microgravity provides unprecedented insights into human immune system function, revealing changes in immune cell behavior and response mechanisms that are masked by Earth's gravity.", "image": "https://images.unsplash.com/photo-1576086213369-97a306d36557?w=400"},
-            {"title": "Space Flies Model How Gravity Affects the Human Immune System", "summary": "Beckingham/Kimbrell use fruit flies as model organisms to understand how gravitational forces influence immune system development and function, with direct applications to human health in space and on Earth.", "image": "https://images.unsplash.com/photo-1614935151651-0bea6508db6b?w=400"},
-            {"title": "Spaceflight Promotes Unique Bacterial Biofilm Structure", "summary": "Collins' research reveals that bacteria form distinct biofilm structures in microgravity, with implications for spacecraft contamination control, crew health, and potential biotechnology applications.", "image": "https://images.unsplash.com/photo-1579154204601-01588f351e67?w=400"},
-            {"title": "Growing Plants in Spaceflight Could Help Reveal How They Sense Their World", "summary": "Gilroy's studies on plant growth in space provide insights into how plants perceive and respond to their environment, including gravity sensing mechanisms and signal transduction pathways.", "image": "https://images.unsplash.com/photo-1466692476868-aef1dfb1e735?w=400"},
-            {"title": "Studying Infections in Space to Help Provide Better Medicine Back on Earth", "summary": "Nickerson's research on microbial behavior in spaceflight conditions leads to discoveries about pathogen virulence and infection mechanisms, contributing to improved medical treatments for Earth-based diseases.", "image": "https://images.unsplash.com/photo-1582719471384-894fbb16e074?w=400"},
-            {"title": "Research on Latent Virus Reactivation Helps Keep Astronauts and the Public Healthy", "summary": "Mehta/Pierson investigate how spaceflight stress causes reactivation of dormant viruses in astronauts, leading to better understanding and prevention strategies for viral infections in both space and terrestrial populations.", "image": "https://images.unsplash.com/photo-1532187863486-abf9dbad1b69?w=400"},
-            {"title": "Observing Microorganisms on ISS Leads to a Novel Understanding of Life on Earth", "summary": "The Microbial Observatory project monitors microorganisms aboard the International Space Station, providing unprecedented data on microbial ecology, evolution, and adaptation in closed environments.", "image": "https://images.unsplash.com/photo-1451187580459-43490279c0fa?w=400"},
-            {"title": "Standing up to Gravity: Drug Shows Promise as Treatment for Orthostatic Intolerance", "summary": "Cohen/Meck's research identifies pharmaceutical interventions to prevent orthostatic intolerance (dizziness upon standing) experienced by astronauts after spaceflight, with applications for patients on Earth.", "image": "https://images.unsplash.com/photo-1471864190281-a93a3070b6de?w=400"},
-            {"title": "Transgenic Plants Help Answer Questions about the Effects of Space Flight on Plant Biology", "summary": "Ferl/Paul use genetically modified plants to track molecular and cellular responses to spaceflight, revealing how plants adapt at the genetic level to microgravity environments.", "image": "https://images.unsplash.com/photo-1518531933037-91b2f5f229cc?w=400"}
-        ]
-    
+        summary = await dataset_snapshot.refresh(osdr_upstream, OSDR_API, concurrency=OSDR_BULK_CONCURRENCY, full=full)
+        print(f"✓ Dataset snapshot refreshed: {summary['datasets']} datasets, {summary['added']} added, "
+              f"{summary['changed']} changed, {summary['removed']} removed, {summary['failed']} failed "
+              f"in {summary['total_seconds']}s")
+    except Exception as e:
+        print(f"⚠ Dataset snapshot refresh failed: {e}")
+
+async def refresh_dataset_snapshot_periodically():
+    while True:
+        await refresh_dataset_snapshot()
+        await asyncio.sleep(OSDR_SNAPSHOT_REFRESH_HOURS * 3600)
+
+def current_dataset_search():
+    global dataset_search
+    with dataset_search_lock:
+        if dataset_search is None or dataset_search.version != dataset_snapshot.etag:
+            dataset_search = DatasetSearch(dataset_snapshot.records(), version=dataset_snapshot.etag)
+        return dataset_search
+
+@app.get("/api/datasets/search")
+def search_datasets(
+    q: str = "",
+    organism: list[str] = Query(default=[]),
+    material: list[str] = Query(default=[]),
+    factor: list[str] = Query(default=[]),
+    funding: list[str] = Query(default=[]),
+    offset: int = 0,
+    limit: int = 25,
+    facet_limit: int = 20,
+):
+    """
+    Faceted search over the dataset snapshot. Repeat a facet parameter to
+    match any of several values; different facets must all match. `q`
+    ranks accession/title/description matches with BM25.
+    """
+    if dataset_snapshot.refreshed_at is None:
+        raise HTTPException(status_code=503, detail="Dataset snapshot is still being built")
+    if offset < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="offset must be >= 0 and limit >= 1")
+    started = time.perf_counter()
+    result = current_dataset_search().search(
+        q,
+        filters={"organism": organism, "material": material, "factor": factor, "funding": funding},
+        offset=offset,
+        limit=min(limit, 100),
+        facet_limit=max(1, facet_limit),
+    )
     return {
-        "source": url,
-        "citation": "Data from NASA Task Book (https://taskbook.nasaprs.com)",
-        "highlights": highlights[:10]
+        "query": q,
+        "offset": offset,
+        "limit": min(limit, 100),
+        **result,
+        "snapshot_age_seconds": round(dataset_snapshot.age(), 1),
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
     }
 
+@app.get("/api/datasets/snapshot")
+def get_dataset_snapshot_status():
+    return dataset_snapshot.stats()
+
+@app.post("/api/datasets/snapshot/refresh")
+async def trigger_dataset_snapshot_refresh(full: bool = False):
+    """Start an incremental (or with `full=true`, complete) snapshot refresh in the background"""
+    if dataset_snapshot.refreshing:
+        return {"started": False, "detail": "A refresh is already running"}
+    task = asyncio.create_task(refresh_dataset_snapshot(full=full))
+    snapshot_tasks.add(task)
+    task.add_done_callback(snapshot_tasks.discard)
+    return {"started": True, "full": full}
+
+@app.get("/api/taskbook/highlights")
+async def get_taskbook_highlights(request: Request):
+    """
+    NASA Task Book highlights with images, served from the background-refreshed
+    snapshot. Never scrapes in the request path: before the first refresh
+    finishes, the fallback highlights are returned with `fallback: true`.
+    """
+    age = taskbook_highlights.age()
+    headers = {"ETag": taskbook_highlights.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), taskbook_highlights.etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse({
+        "source": TASKBOOK_URL,
+        "citation": "Data from NASA Task Book (https://taskbook.nasaprs.com)",
+        "highlights": taskbook_highlights.current()[:10],
+        "snapshot_age_seconds": round(age, 1) if age is not None else None,
+        "fallback": taskbook_highlights.is_fallback(),
+    }, headers=headers)
+
+async def refresh_taskbook_periodically():
+    while True:
+        # An unexpected error must not end the task, or the snapshot silently stops refreshing
+        try:
+            await taskbook_highlights.refresh(web_upstream)
+        except Exception as e:
+            print(f"⚠ Task Book highlights refresh crashed, retrying next cycle: {e}")
+        await asyncio.sleep(TASKBOOK_REFRESH_HOURS * 3600)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Precompute the comprehensive AI summary of every article in SB_publication_PMC.csv.
+
+    python precompute_summaries.py --concurrency 4 --rpm 60 --max-requests 2000
+
+Article text comes from the article content store, so run
+prefetch_articles.py first. Each summary is written to the summary store
+(SUMMARY_STORE_PATH) as soon as it finishes, tagged with a fingerprint of
+the article text and the model/prompt version; articles whose stored
+summary is still current are skipped, so re-runs only process new, changed
+or failed articles and an interrupted run resumes where it left off.
+/ai/comprehensive-summary serves these results and generates live only for
+missing or stale entries.
+
+LLM_BACKEND=stub runs the whole job offline.
+"""
+import argparse
+import asyncio
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+from ai_utils import llm, run_comprehensive_summary, summary_store, summary_version
+from utils.article_catalog import ArticleCatalog
+from utils.checkpoint import Checkpoint
+from utils.content_store import open_article_store
+from utils.fetch_article_content import is_fetch_error
+from utils.pipeline import bounded_map, timing_summary
+from utils.summary_store import content_fingerprint
+
+DEFAULT_CHECKPOINT = "cache/summaries_checkpoint.json"
+# One keyword call and one summary call per article
+MODEL_CALLS_PER_ARTICLE = 2
+
+
+def article_text(content):
+    """The text AnalysisPage sends for an article: tags replaced by spaces, whitespace collapsed"""
+    return re.sub(r'\s+', ' ', re.sub(r'<[^>]*>', ' ', content)).strip()
+
+
+class ModelRequestLimiter:
+    """
+    Keeps model traffic under `rpm` requests per minute. Every article makes
+    MODEL_CALLS_PER_ARTICLE requests, so article starts are spaced by that
+    many request intervals; bounded_map already caps how many run at once.
+    """
+
+    def __init__(self, rpm):
+        self.interval = 60.0 * MODEL_CALLS_PER_ARTICLE / rpm if rpm else 0.0
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        # No await between reading and bumping the schedule, so this is race-free
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+        yield
+
+
+class Budget:
+    """
+    Stops scheduling new articles once the request or token budget is spent.
+    Requests are reserved per scheduled article; tokens are what the model
+    reported, so articles already in flight may overshoot `max_tokens`.
+    """
+
+    def __init__(self, max_requests, max_tokens):
+        self.max_requests = max_requests
+        self.max_tokens = max_tokens
+        self.scheduled = 0
+        self.reason = None
+
+    def allow(self):
+        usage = llm.usage()
+        if self.max_requests and (self.scheduled + 1) * MODEL_CALLS_PER_ARTICLE > self.max_requests:
+            self.reason = f"request budget of {self.max_requests} reached"
+        elif self.max_tokens and usage["prompt_tokens"] + usage["completion_tokens"] >= self.max_tokens:
+            self.reason = f"token budget of {self.max_tokens} reached"
+        else:
+            self.scheduled += 1
+            return True
+        return False
+
+
+def select_articles(catalog, articles, checkpoint, version, args):
+    """`(work, skipped)`: work items are `(article, text, content_hash)`"""
+    selected, skipped = [], Counter()
+    wanted = set(args.ids) if args.ids else None
+    for article in catalog.all():
+        if wanted is not None and article.id not in wanted:
+            continue
+        stored = articles.get(article.link, article.id)
+        if stored is None or is_fetch_error(stored.get("content", "")):
+            skipped["no_content"] += 1
+            continue
+        text = article_text(stored["content"])
+        content_hash = content_fingerprint(text)
+        if not args.force and summary_store.is_current(article.id, content_hash, version):
+            skipped["current"] += 1
+            continue
+        if not args.retry_failed and checkpoint.attempts(article.id) >= args.max_attempts:
+            skipped["gave_up"] += 1
+            continue
+        selected.append((article, text, content_hash))
+    if args.limit:
+        selected = selected[:args.limit]
+    return selected, skipped
+
+
+async def run(work, checkpoint, version, args):
+    limiter = ModelRequestLimiter(args.rpm)
+    budget = Budget(args.max_requests, args.max_tokens)
+
+    def scheduled():
+        for item in work:
+            if not budget.allow():
+                return
+            yield item
+
+    async def summarize(item):
+        article, text, content_hash = item
+        async with limiter.slot():
+            result, complete, timing = await run_comprehensive_summary(article.title, text)
+        if not complete:
+            raise RuntimeError("model stage fell back; not stored")
+        await asyncio.to_thread(summary_store.put, article.id, article.title, content_hash, version, result)
+        return timing
+
+    timings, failures = [], {}
+    started = time.perf_counter()
+    done = 0
+    async for item, outcome, elapsed in bounded_map(scheduled(), summarize, args.concurrency):
+        done += 1
+        article = item[0]
+        if isinstance(outcome, Exception):
+            failures[article.id] = str(outcome) or type(outcome).__name__
+            await asyncio.to_thread(checkpoint.record, article.id, failures[article.id])
+            status = "✗"
+        else:
+            timings.append((elapsed, article.id))
+            await asyncio.to_thread(checkpoint.record, article.id)
+            status = "✓"
+        print(f"[{done}/{len(work)}] {status} {article.id}: {article.title[:70]} ({elapsed:.1f}s)")
+    return timings, failures, budget, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute comprehensive summaries for the publication catalog")
+    parser.add_argument("--csv", default="SB_publication_PMC.csv")
+    parser.add_argument("--concurrency", type=int, default=4, help="articles summarized at once")
+    parser.add_argument("--rpm", type=float, default=60, help="max model requests started per minute (0 = unlimited)")
+    parser.add_argument("--max-requests", type=int, default=0, help="stop after this many model requests (0 = no limit)")
+    parser.add_argument("--max-tokens", type=int, default=0, help="stop once this many tokens are used (0 = no limit)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--max-attempts", type=int, default=3, help="skip articles that already failed this often")
+    parser.add_argument("--retry-failed", action="store_true", help="ignore --max-attempts for earlier failures")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the stored summary is current")
+    parser.add_argument("--limit", type=int, default=0, help="summarize at most this many articles")
+    parser.add_argument("--ids", type=int, nargs="*", help="only these article ids")
+    args = parser.parse_args()
+
+    catalog = ArticleCatalog(args.csv)
+    checkpoint = Checkpoint(args.checkpoint)
+    version = summary_version()
+
+    work, skipped = select_articles(catalog, open_article_store(), checkpoint, version, args)
+    print(f"Catalog: {len(catalog)} articles | to summarize: {len(work)} | current: {skipped['current']} | "
+          f"no stored content: {skipped['no_content']} | given up: {skipped['gave_up']} | version: {version}")
+
+    timings, failures, budget, elapsed = asyncio.run(run(work, checkpoint, version, args))
+
+    usage = llm.usage()
+    print("\n=== PRECOMPUTE REPORT ===")
+    print(f"Summarized: {len(timings)}")
+    print(f"Failed:     {len(failures)}")
+    print(f"Skipped:    {skipped['current']} current, {skipped['no_content']} without stored content, "
+          f"{skipped['gave_up']} after {args.max_attempts} failed attempts")
+    if budget.reason:
+        print(f"Stopped:    {budget.reason}; {len(work) - budget.scheduled} articles left for the next run")
+    print(f"Model:      {usage['calls']} requests, {usage['prompt_tokens']} prompt + "
+          f"{usage['completion_tokens']} completion tokens")
+    summary = timing_summary(timings, elapsed)
+    print(f"Wall time:  {elapsed:.1f}s")
+    if timings:
+        print(f"Throughput: {len(timings) / elapsed:.2f} articles/s")
+        print(f"Latency:    p50 {summary['p50_ms'] / 1000:.2f}s | p95 {summary['p95_ms'] / 1000:.2f}s | "
+              f"max {summary['max_ms'] / 1000:.2f}s")
+    if failures:
+        print("Top errors:")
+        for error, count in Counter(error[:80] for error in failures.values()).most_common(5):
+            print(f"  {count}x {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Warm the article content store with every publication in SB_publication_PMC.csv.
+
+    python prefetch_articles.py --concurrency 4 --per-host 2 --delay 1.0
+
+Articles that are already stored and fresh are skipped, so re-runs only
+fetch missing or expired entries. Progress is checkpointed after every
+article; after a crash, running the same command resumes where it left off.
+With PMC_MIRROR_DIR pointing at a local JATS/OA mirror the corpus can be
+rebuilt fully offline.
+"""
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.article_catalog import ArticleCatalog
+from utils.checkpoint import Checkpoint
+from utils.content_store import open_article_store
+from utils.fetch_article_content import fetch_article_content, build_article_response, is_fetch_error
+from utils.fetch_article_jats import has_mirror_copy
+from utils.fetch_article_selenium import driver_pool
+from utils.rate_limiter import HostRateLimiter
+
+DEFAULT_CHECKPOINT = "cache/prefetch_checkpoint.json"
+
+
+def prefetch_one(article, store, throttle):
+    started = time.perf_counter()
+    if has_mirror_copy(article.link):
+        # Local JATS copy: no network, so no politeness delay
+        response = build_article_response(article, fetch_article_content(article.link))
+    else:
+        with throttle.slot(article.link):
+            started = time.perf_counter()
+            response = build_article_response(article, fetch_article_content(article.link))
+    elapsed = time.perf_counter() - started
+    if is_fetch_error(response["content"]):
+        raise RuntimeError(response["content"])
+    store.put(article.link, response, article.id)
+    return elapsed
+
+
+def select_articles(catalog, store, checkpoint, args):
+    selected, skipped = [], Counter()
+    wanted = set(args.ids) if args.ids else None
+    for article in catalog.all():
+        if wanted is not None and article.id not in wanted:
+            continue
+        if not args.force and store.is_fresh(article.link):
+            skipped["fresh"] += 1
+            continue
+        if not args.retry_failed and checkpoint.attempts(article.id) >= args.max_attempts:
+            skipped["gave_up"] += 1
+            continue
+        selected.append(article)
+    if args.limit:
+        selected = selected[:args.limit]
+    return selected, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch and store every article in the publication catalog")
+    parser.add_argument("--csv", default="SB_publication_PMC.csv")
+    parser.add_argument("--concurrency", type=int, default=4, help="articles fetched at once")
+    parser.add_argument("--per-host", type=int, default=2, help="max concurrent fetches against one host")
+    parser.add_argument("--delay", type=float, default=1.0, help="min seconds between request starts per host")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds per start")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--max-attempts", type=int, default=3, help="skip articles that already failed this often")
+    parser.add_argument("--retry-failed", action="store_true", help="ignore --max-attempts for earlier failures")
+    parser.add_argument("--force", action="store_true", help="refetch even if a fresh copy is stored")
+    parser.add_argument("--limit", type=int, default=0, help="fetch at most this many articles")
+    parser.add_argument("--ids", type=int, nargs="*", help="only these article ids")
+    args = parser.parse_args()
+
+    catalog = ArticleCatalog(args.csv)
+    store = open_article_store()
+    checkpoint = Checkpoint(args.checkpoint)
+    throttle = HostRateLimiter(min_interval=args.delay, jitter=args.jitter, max_concurrent=args.per_host)
+
+    articles, skipped = select_articles(catalog, store, checkpoint, args)
+    print(f"Catalog: {len(catalog)} articles | to fetch: {len(articles)} | "
+          f"fresh: {skipped['fresh']} | given up: {skipped['gave_up']}")
+
+    latencies, failures = [], {}
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            futures = {pool.submit(prefetch_one, article, store, throttle): article for article in articles}
+            for done, future in enumerate(as_completed(futures), start=1):
+                article = futures[future]
+                try:
+                    latencies.append(future.result())
+                    checkpoint.record(article.id)
+                    status = "✓"
+                except Exception as e:
+                    failures[article.id] = str(e)
+                    checkpoint.record(article.id, str(e))
+                    status = "✗"
+                print(f"[{done}/{len(articles)}] {status} {article.id}: {article.title[:70]}")
+    finally:
+        # Selenium fallbacks leave Chrome processes behind otherwise
+        driver_pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print("\n=== PREFETCH REPORT ===")
+    print(f"Fetched:    {len(latencies)}")
+    print(f"Failed:     {len(failures)}")
+    print(f"Skipped:    {skipped['fresh']} fresh, {skipped['gave_up']} after {args.max_attempts} failed attempts")
+    print(f"Wall time:  {elapsed:.1f}s")
+    if elapsed > 0 and articles:
+        print(f"Throughput: {len(latencies) / elapsed:.2f} articles/s")
+    if latencies:
+        print(f"Latency:    p50 {latencies[len(latencies) // 2]:.2f}s | "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:.2f}s | max {latencies[-1]:.2f}s")
+    if failures:
+        print("Top errors:")
+        for error, count in Counter(error[:80] for error in failures.values()).most_common(5):
+            print(f"  {count}x {error}")
+
+
+if __name__ == "__main__":
+    main()
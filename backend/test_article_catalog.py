@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from utils.article_catalog import ArticleCatalog, classify_article_type
+
+ROWS = [
+    ("Microgravity induces pelvic bone loss in mice", "https://pmc.ncbi.nlm.nih.gov/articles/PMC4136787/"),
+    ("A review of plant gravitropism in space", "https://pmc.ncbi.nlm.nih.gov/articles/pmc3630201/"),
+    ("Erratum: Stem cell health in spaceflight", "https://pmc.ncbi.nlm.nih.gov/articles/PMC5587110/"),
+    ("Bone, muscle and immune response", "https://example.org/no-pmc-id"),
+]
+
+
+def write_csv(path, rows, header="Title,Link"):
+    lines = [header] + [",".join(f'"{value}"' for value in row) for row in rows]
+    path.write_text("﻿" + "\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, ROWS)
+    return ArticleCatalog(str(path), check_interval=0)
+
+
+def test_lookups_by_id_pmc_id_title_and_link(catalog):
+    assert len(catalog) == 4
+    assert catalog.get(0).title.startswith("Microgravity")
+    assert catalog.get(4) is None and catalog.get(-1) is None
+    assert catalog.get_by_pmc_id("pmc3630201").id == 1
+    assert catalog.get(3).pmc_id is None
+    assert catalog.get_by_title("microgravity induces pelvic BONE loss in mice!").id == 0
+    assert catalog.get_by_key(catalog.get(2).key) is catalog.get(2)
+    assert [article.type for article in catalog.all()] == ["Research Article", "Review", "Correction", "Research Article"]
+
+
+def test_query_filters_and_sorts_the_listing(catalog):
+    assert [a["id"] for a in catalog.query(q="bone")] == [0, 3]
+    assert [a["id"] for a in catalog.query(prefix="a review")] == [1]
+    assert [a["id"] for a in catalog.query(article_type="research article", sort="-title")] == [0, 3]
+    assert [a["id"] for a in catalog.query(sort="title")] == [1, 3, 2, 0]
+    assert catalog.listing()[1] == {"id": 1, "title": ROWS[1][0], "link": ROWS[1][1], "type": "Review"}
+    with pytest.raises(ValueError):
+        catalog.query(sort="link")
+
+
+def test_csv_is_reparsed_only_when_it_changes(tmp_path):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, ROWS)
+    catalog = ArticleCatalog(str(path), check_interval=0)
+    version, digest = catalog.version, catalog.digest
+    assert catalog.version == version
+
+    write_csv(path, ROWS[:2] + [("New study of rodent habitats", "https://example.org/new")], header="Title,Link")
+    os.utime(path, (1, 1))
+    assert catalog.version == version + 1
+    assert catalog.digest != digest
+    assert len(catalog) == 3 and catalog.get(2).title == "New study of rodent habitats"
+
+
+def test_unreadable_csv_keeps_the_loaded_snapshot(catalog, tmp_path):
+    (tmp_path / "catalog.csv").write_text("Name,URL\nx,y\n", encoding="utf-8")
+    os.utime(tmp_path / "catalog.csv", (2, 2))
+    assert len(catalog) == 4
+
+
+def test_type_column_overrides_title_cues(tmp_path):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, [("A review of bone loss", "https://example.org/1", "Research Article")], header="Title,Link,Type")
+    assert ArticleCatalog(str(path)).get(0).type == "Research Article"
+    assert classify_article_type("Editorial: the next decade") == "Editorial"
@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app as backend
+from utils.article_catalog import ArticleCatalog
+from utils.response_cache import etag_matches
+
+
+@pytest.fixture
+def http(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.csv"
+    path.write_text(
+        "Title,Link\n"
+        "Bone loss in mice,https://pmc.ncbi.nlm.nih.gov/articles/PMC1/\n"
+        "A review of plant gravitropism,https://pmc.ncbi.nlm.nih.gov/articles/PMC2/\n"
+        "Immune response to spaceflight,https://pmc.ncbi.nlm.nih.gov/articles/PMC3/\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(backend, "catalog", ArticleCatalog(str(path)))
+    return TestClient(backend.app)
+
+
+def test_types_are_counted_over_the_whole_catalog(http):
+    response = http.get("/articles/types")
+    assert response.json() == [{"type": "Research Article", "count": 2}, {"type": "Review", "count": 1}]
+    again = http.get("/articles/types", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+    page = http.get("/articles", params={"type": "Research Article", "sort": "-title", "limit": 1})
+    assert page.headers["X-Total-Count"] == "2"
+    assert [article["title"] for article in page.json()] == ["Immune response to spaceflight"]
+
+
+@pytest.mark.parametrize("path", ["/articles?limit=2", "/articles/types"])
+def test_if_none_match_accepts_lists_wildcards_and_weak_tags(http, path):
+    etag = http.get(path).headers["ETag"]
+    for header in ['"other", ' + etag, "*", etag.removeprefix("W/"), f'"other",{etag} , "more"']:
+        assert http.get(path, headers={"If-None-Match": header}).status_code == 304
+    assert http.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_paging_is_validated_before_the_etag_check(http):
+    response = http.get("/articles", params={"offset": -1}, headers={"If-None-Match": "*"})
+    assert response.status_code == 400
+
+
+def test_etag_matches():
+    assert etag_matches('W/"a"', '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"ab"', '"a"')
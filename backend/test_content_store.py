@@ -0,0 +1,69 @@
+import sqlite3
+import time
+
+from utils.content_store import ArticleStore, url_hash
+
+LINK_A = "https://pmc.ncbi.nlm.nih.gov/articles/PMC1000001/"
+LINK_B = "https://pmc.ncbi.nlm.nih.gov/articles/PMC1000002/"
+
+
+def response(article_id, link, text="Microgravity alters bone density in mice. " * 40):
+    return {"id": article_id, "title": "t", "link": link, "content": f"<p>{text}</p>", "tables": []}
+
+
+def test_entries_follow_their_link_when_rows_move(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"))
+    store.put(LINK_A, response(0, LINK_A), 0)
+    store.put(LINK_B, response(1, LINK_B), 1)
+
+    # A row was inserted above both: A is now row 1 and B row 2. Storing
+    # a third article at row 0 must not evict anything.
+    store.put("https://example.org/new", response(0, "https://example.org/new"), 0)
+    assert store.get(LINK_A, 1)["link"] == LINK_A
+    assert store.get(LINK_B, 2)["link"] == LINK_B
+    assert store.stats()["disk_entries"] == 3
+
+
+def test_hit_under_an_old_id_is_restamped_not_refetched(tmp_path):
+    path = str(tmp_path / "articles.sqlite3")
+    store = ArticleStore(path)
+    store.put(LINK_A, response(0, LINK_A), 0)
+
+    assert store.get(LINK_A, 5)["id"] == 5
+    # Persisted too: a fresh process (empty memory tier) sees the new id
+    assert ArticleStore(path).get(LINK_A)["id"] == 5
+    assert store.stats()["misses"] == 0
+
+
+def test_miss_expiry_and_invalidate(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite3"), ttl_seconds=0.05)
+    assert store.get(LINK_A) is None
+    store.put(LINK_A, response(0, LINK_A), 0)
+    assert store.is_fresh(LINK_A)
+    time.sleep(0.06)
+    assert not store.is_fresh(LINK_A)
+    assert store.get(LINK_A) is None
+
+    store.put(LINK_A, response(0, LINK_A), 0, ttl_seconds=60)
+    store.put(LINK_B, response(1, LINK_B), 1, ttl_seconds=60)
+    assert store.invalidate(LINK_A) == 1
+    assert store.get(LINK_A) is None and store.get(LINK_B) is not None
+    assert store.invalidate() == 1
+
+
+def test_rows_of_the_old_schema_are_migrated(tmp_path):
+    path = str(tmp_path / "articles.sqlite3")
+    old = ArticleStore(str(tmp_path / "scratch.sqlite3"))
+    payload = old.put(LINK_A, response(3, LINK_A), 3)
+    db = sqlite3.connect(path)
+    db.execute("""CREATE TABLE articles (article_id INTEGER NOT NULL, url_hash TEXT NOT NULL, stored_at REAL NOT NULL,
+                  expires_at REAL NOT NULL, size INTEGER NOT NULL, payload BLOB NOT NULL,
+                  PRIMARY KEY (article_id, url_hash))""")
+    db.execute("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?)",
+               (3, url_hash(LINK_A), time.time(), time.time() + 60, payload.raw_size, payload.gzip))
+    db.commit()
+    db.close()
+
+    store = ArticleStore(path)
+    assert store.get(LINK_A, 3)["link"] == LINK_A
+    assert [(article_id, link_hash) for article_id, link_hash, _ in store.iter_fresh()] == [(3, url_hash(LINK_A))]
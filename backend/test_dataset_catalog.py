@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from utils.dataset_catalog import DatasetSnapshot
+
+API = "https://osdr.test/osdr/data/osdr"
+INDEX = {f"OSD-{n}": {"REST_URL": f"{API}/dataset/OSD-{n}/"} for n in (1, 2, 3)}
+
+
+def osdr_client(index_status=200, index_body=None):
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/datasets/"):
+            return httpx.Response(index_status, json=INDEX if index_body is None else index_body)
+        dataset_id = path.rstrip("/").rsplit("/", 1)[-1]
+        return httpx.Response(200, json={dataset_id: {"metadata": {"study title": f"Study {dataset_id}"}}})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def refresh(snapshot, client):
+    async def run():
+        async with client:
+            return await snapshot.refresh(client, API)
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("status, body", [
+    (503, {"error": "maintenance"}),
+    (200, {"error": "maintenance"}),
+    (200, ["OSD-1"]),
+])
+def test_failed_index_keeps_previous_snapshot(tmp_path, status, body):
+    path = str(tmp_path / "datasets.json")
+    snapshot = DatasetSnapshot(path)
+    summary = refresh(snapshot, osdr_client())
+    assert summary["added"] == 3
+    etag = snapshot.etag
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+
+    with pytest.raises(Exception):
+        refresh(snapshot, osdr_client(status, body))
+
+    assert [record["accession"] for record in snapshot.records()] == ["OSD-1", "OSD-2", "OSD-3"]
+    assert snapshot.etag == etag
+    assert snapshot.last_refresh["added"] == 3
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f) == saved
+    assert [record["accession"] for record in DatasetSnapshot(path).records()] == ["OSD-1", "OSD-2", "OSD-3"]
@@ -0,0 +1,60 @@
+import pytest
+
+from utils.dataset_search import DatasetSearch, facet_values
+
+
+def record(accession, title, organism, material="N/A", factor="Spaceflight", funding="NASA"):
+    return {"accession": accession, "title": title, "description": f"{title} aboard the ISS",
+            "organism": organism, "material": material, "factor": factor, "funding": funding}
+
+
+RECORDS = [
+    record("OSD-48", "Rodent Research 1 liver", "Mus musculus", "Liver"),
+    record("OSD-120", "Arabidopsis root growth", "Arabidopsis thaliana", "Root", "Spaceflight; Light"),
+    record("OSD-137", "Rodent Research bone loss", "Mus musculus", "Bone, Femur", "Spaceflight, Hindlimb Unloading"),
+    record("OSD-200", "Yeast gene expression", "Saccharomyces cerevisiae", "n/a", "Microgravity", "ESA"),
+]
+
+
+@pytest.fixture
+def search():
+    return DatasetSearch(RECORDS, version="v1")
+
+
+def counts(result, field):
+    return {facet["value"]: facet["count"] for facet in result["facets"][field]}
+
+
+def test_facet_values_split_packed_strings_and_drop_missing():
+    assert facet_values("Spaceflight; Light, spaceflight") == {"spaceflight": "Spaceflight", "light": "Light"}
+    assert facet_values("N/A") == {}
+    assert facet_values(["Mus musculus", ""]) == {"mus musculus": "Mus musculus"}
+
+
+def test_values_of_one_facet_are_ored_and_facets_anded(search):
+    result = search.search(filters={"organism": ["mus musculus", "Arabidopsis thaliana"]})
+    assert [r["accession"] for r in result["results"]] == ["OSD-48", "OSD-120", "OSD-137"]
+    result = search.search(filters={"organism": ["Mus musculus"], "factor": ["Hindlimb Unloading"]})
+    assert [r["accession"] for r in result["results"]] == ["OSD-137"]
+
+
+def test_facet_counts_are_disjunctive(search):
+    result = search.search(filters={"organism": ["Mus musculus"]})
+    # The organism facet ignores its own filter so the alternatives stay visible
+    assert counts(result, "organism") == {"Mus musculus": 2, "Arabidopsis thaliana": 1, "Saccharomyces cerevisiae": 1}
+    assert counts(result, "material") == {"Liver": 1, "Bone": 1, "Femur": 1}
+    assert counts(result, "funding") == {"NASA": 2}
+
+
+def test_text_query_ranks_and_narrows_the_facets(search):
+    result = search.search(q="rodent", limit=1)
+    assert result["total"] == 2
+    assert len(result["results"]) == 1 and result["results"][0]["score"] > 0
+    assert counts(result, "organism") == {"Mus musculus": 2}
+    assert search.search(q="rodent", offset=1)["results"][0]["accession"] in {"OSD-48", "OSD-137"}
+
+
+def test_unknown_facets_are_rejected(search):
+    with pytest.raises(ValueError):
+        search.search(filters={"mission": ["RR-1"]})
+    assert search.search(filters={"mission": []})["total"] == 4
@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+
+from utils.encoding import EncodedPayload, accepted_encodings
+
+RAW = b'{"description":"' + b"Rodent Research 1 " * 200 + b'"}'
+
+
+@pytest.fixture
+def payload():
+    payload = EncodedPayload.from_raw(RAW)
+    if payload.br is None:
+        pytest.skip("brotli is not installed")
+    return payload
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("br, gzip", "br"),
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("BR;Q=0.9, gzip;q=0.9", "br"),
+    ("gzip;q=0", None),
+    ("gzip;q=0, br;q=0", None),
+    ("*", "br"),
+    ("*;q=0.1, br;q=0", "gzip"),
+    ("identity", None),
+    ("", None),
+    (None, None),
+    ("gzip;q=abc", None),
+])
+def test_select_honours_q_values(payload, header, expected):
+    body, coding = payload.select(header)
+    assert coding == expected
+    assert {"br": payload.br, "gzip": payload.gzip, None: RAW}[coding] == body
+
+
+def test_identity_is_recovered_from_gzip_when_not_kept():
+    payload = EncodedPayload.from_raw(RAW, keep_identity=False)
+    body, coding = payload.select("gzip;q=0")
+    assert coding is None and body == RAW == gzip.decompress(payload.gzip)
+
+
+def test_small_payloads_are_only_stored_plain():
+    payload = EncodedPayload.from_raw(b"[]")
+    assert payload.select("br, gzip") == (b"[]", None)
+
+
+def test_accepted_encodings_parses_weights():
+    assert accepted_encodings("gzip;q=0.5, br , deflate;level=1;q=0") == {"gzip": 0.5, "br": 1.0, "deflate": 0.0}
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import h2.config
+import h2.connection
+import httpx
+
+from utils import fetch_article_content
+from utils.fetch_article_content import fetch_article_content_async, is_fetch_error
+from utils.fetch_article_requests import BROWSER_HEADERS, fetch_article_with_httpx
+
+# RFC 9113 8.2.2: connection-specific fields are malformed in HTTP/2
+CONNECTION_SPECIFIC = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+def test_browser_headers_have_no_connection_specific_fields():
+    assert not CONNECTION_SPECIFIC & {name.lower() for name in BROWSER_HEADERS}
+
+
+def test_browser_headers_pass_strict_h2_validation():
+    # Without normalisation h2 rejects connection-specific headers instead of
+    # dropping them, which is what a stricter stack would do on the wire
+    config = h2.config.H2Configuration(client_side=True, normalize_outbound_headers=False)
+    conn = h2.connection.H2Connection(config=config)
+    conn.initiate_connection()
+    headers = [(":method", "GET"), (":authority", "pmc.ncbi.nlm.nih.gov"), (":scheme", "https"), (":path", "/")]
+    headers += [(name.lower(), value) for name, value in BROWSER_HEADERS.items()]
+    conn.send_headers(1, headers, end_stream=True)
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.slots = []
+
+    @asynccontextmanager
+    async def slot(self, url):
+        self.slots.append(url)
+        yield
+
+
+ARTICLE_PAGE = "<html><body><nav>Menu</nav><div class='sec'><p>" + "Mice flown on the ISS lost bone density. " * 30 + "</p></div></body></html>"
+
+
+def test_static_pages_go_through_the_shared_client(monkeypatch):
+    requested = []
+
+    def handler(request):
+        requested.append(request)
+        return httpx.Response(200, text=ARTICLE_PAGE)
+
+    def no_selenium(url):
+        raise AssertionError("Selenium should not be needed")
+
+    monkeypatch.setattr(fetch_article_content, "fetch_article_html", no_selenium)
+    limiter = RecordingLimiter()
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_article_content_async("https://example.org/article", client, limiter)
+
+    result = asyncio.run(run())
+    assert "lost bone density" in result["content"] and "Menu" not in result["content"]
+    assert limiter.slots == ["https://example.org/article"]
+    assert requested[0].headers["User-Agent"] == BROWSER_HEADERS["User-Agent"]
+
+
+def test_thin_static_pages_fall_back_to_selenium_off_the_event_loop(monkeypatch):
+    def slow_selenium(url):
+        time.sleep(0.1)
+        return {"content": f"<p>Rendered {url}</p>", "tables": []}
+
+    monkeypatch.setattr(fetch_article_content, "fetch_article_html", slow_selenium)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text="<p>Too short</p>")))
+    limiter = RecordingLimiter()
+
+    async def run():
+        urls = [f"https://example.org/{i}" for i in range(4)]
+        return await asyncio.gather(*(fetch_article_content_async(url, client, limiter) for url in urls))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    # Four blocking renders overlap in worker threads instead of running back to back on the loop
+    assert time.perf_counter() - started < 0.3
+    assert [r["content"] for r in results] == [f"<p>Rendered https://example.org/{i}</p>" for i in range(4)]
+    assert len(limiter.slots) == 8
+
+
+def test_upstream_errors_become_an_error_paragraph():
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+    result = asyncio.run(fetch_article_with_httpx("https://example.org/down", client))
+    assert is_fetch_error(result["content"])
@@ -0,0 +1,129 @@
+import glob
+import os
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from bench_extractor import HAND_WRITTEN_MARKER, MAX_FIXTURE_BYTES, slim_page
+from utils.fetch_article_selenium import extract_main_content_selenium
+from utils.html_extractor import extract_main_content
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pmc")
+BASE_URL = "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC4136787/"
+
+CONTAINERS = [
+    ("article", None), ("div", "article"), ("div", "pmc-articlecontent"), ("div", "article-body"),
+    ("div", "tsec"), ("div", "sec"), ("div", "article-content"), ("main", None), ("div", "content"),
+    ("div", "main-content"), ("div", "entry-content"), ("section", None), ("div", None),
+]
+SENTENCES = [
+    "Mice were housed in the Bion-M 1 biosatellite for thirty days in orbit.",
+    "Bone mineral density decreased by 8% in the flight group compared with controls.",
+    "Gene expression of CDKN1a/p21 was elevated in osteoblasts after spaceflight.",
+    "Subscribe to our newsletter for related articles and updates.",
+    "Cookie settings and privacy policy apply to this site navigation menu.",
+    "Short one.",
+    "Copyright 2014, all rights reserved by the authors.",
+    "Survival after landing was lower in the flight animals than in ground controls & vivarium mice.",
+    "  Whitespace   around   this sentence   should be handled identically by both extractors.  ",
+]
+IMAGES = [
+    '<img src="/pmc/articles/PMC4136787/bin/fig1.jpg" alt="Figure 1">',
+    '<img data-src="bin/fig2.png" alt="Figure 2">',
+    '<img src="https://www.ncbi.nlm.nih.gov/corehtml/pmc/pmcgifs/logo.gif" alt="logo">',
+    '<img src="data:image/gif;base64,R0lGODlhAQABAAAAACw=" alt="">',
+    '<img alt="missing source">',
+]
+
+
+def sentence(rng):
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 3)))
+
+
+def block(rng, depth):
+    kind = rng.choice(["p", "p", "p", "h", "img", "figure", "table", "list", "quote", "div", "empty"])
+    if kind == "p":
+        inline = f" <em>{rng.choice(SENTENCES)}</em>" if rng.random() < 0.3 else ""
+        return f"<p>{sentence(rng)}{inline}</p>"
+    if kind == "h":
+        return f"<h{rng.randint(1, 6)}>{rng.choice(['Results', 'Methods', 'Menu', 'Discussion of findings', 'Ab'])}</h{rng.randint(1, 6)}>"
+    if kind == "img":
+        return rng.choice(IMAGES)
+    if kind == "figure":
+        caption = f"<figcaption>{sentence(rng)}</figcaption>" if rng.random() < 0.7 else ""
+        return f"<figure>{rng.choice(IMAGES)}{caption}</figure>"
+    if kind == "table":
+        head = "<thead><tr><th>Group</th><th>Mass (g)</th></tr></thead>" if rng.random() < 0.6 else ""
+        rows = "".join(f"<tr><td>Group {i}</td><td>{rng.randint(10, 40)}</td></tr>" for i in range(rng.randint(0, 4)))
+        return f"<table>{head}<tbody>{rows}</tbody></table>"
+    if kind == "list":
+        tag = rng.choice(["ul", "ol"])
+        items = "".join(f"<li>{rng.choice(SENTENCES)}</li>" for _ in range(rng.randint(0, 4)))
+        return f"<{tag}>{items}</{tag}>"
+    if kind == "quote":
+        return f"<blockquote>{sentence(rng)}</blockquote>"
+    if kind == "div" and depth < 3:
+        return section(rng, depth + 1)
+    return "<div></div>"
+
+
+def section(rng, depth=0):
+    name, css_class = rng.choice(CONTAINERS)
+    attrs = f' class="{css_class} extra"' if css_class else (' role="main"' if rng.random() < 0.1 else "")
+    body = "".join(block(rng, depth) for _ in range(rng.randint(0, 7)))
+    return f"<{name}{attrs}>{body}</{name}>"
+
+
+def random_page(seed):
+    rng = random.Random(seed)
+    header = '<header><nav><ul class="menu"><li>Search PMC</li><li>Log in</li></ul></nav></header>'
+    sections = "".join(section(rng) for _ in range(rng.randint(1, 4)))
+    return f"<html><head><title>PMC</title><script>var x = 1;</script></head><body>{header}{sections}</body></html>"
+
+
+def assert_same_output(html):
+    reference = extract_main_content_selenium(BeautifulSoup(html, "html.parser"), BASE_URL)
+    single_pass = extract_main_content(BeautifulSoup(html, "html.parser"), BASE_URL)
+    assert single_pass == reference
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_reference_on_generated_pages(seed):
+    assert_same_output(random_page(seed))
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))), ids=os.path.basename)
+def test_matches_reference_on_fixtures(path):
+    with open(path, "r", encoding="utf-8") as f:
+        assert_same_output(f.read())
+
+
+def test_recorded_pages_are_present():
+    recorded = []
+    for path in glob.glob(os.path.join(FIXTURE_DIR, "*.html")):
+        with open(path, "r", encoding="utf-8") as f:
+            if HAND_WRITTEN_MARKER not in f.read():
+                recorded.append(path)
+    if not recorded:
+        message = ("no recorded PMC pages in fixtures/pmc; parity is only checked on synthetic markup. "
+                   "Record some with: python bench_extractor.py --record-catalog 5")
+        # Set where the fixtures are expected (e.g. CI after recording), so their absence fails the run
+        if os.getenv("REQUIRE_RECORDED_PMC") == "1":
+            pytest.fail(message)
+        pytest.skip(message)
+    for path in recorded:
+        assert os.path.getsize(path) <= MAX_FIXTURE_BYTES
+
+
+def test_recording_keeps_licensed_pages_and_strips_scripts():
+    page = ('<html><head><script>var big = "x";</script><style>p {}</style></head><body><article><p>Text</p>'
+            '<a href="https://creativecommons.org/licenses/by/4.0/">CC BY 4.0</a><svg><path d="M0"/></svg>'
+            '</article></body></html>')
+    html, licence = slim_page(page)
+    assert licence == "creativecommons.org/licenses/by/4.0"
+    assert "<script" not in html and "<style" not in html and "<svg" not in html
+    assert "<p>Text</p>" in html
+
+    assert slim_page(page.replace("creativecommons.org/licenses/by/4.0/", "example.org/terms"))[0] is None
+    assert slim_page(page.replace("<p>Text</p>", "<p>" + "x" * (MAX_FIXTURE_BYTES + 1) + "</p>"))[0] is None
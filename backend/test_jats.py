@@ -0,0 +1,42 @@
+import io
+
+from utils.fetch_article_jats import parse_jats
+
+ARTICLE = b"""<?xml version="1.0"?>
+<article xmlns:xlink="http://www.w3.org/1999/xlink">
+  <front><article-meta><title-group><article-title>Nested blocks</article-title></title-group></article-meta></front>
+  <body>
+    <sec>
+      <title>Methods</title>
+      <p>Intro to the <italic>protocol</italic> steps: <list list-type="order">
+          <list-item><p>Seed the cultures.</p></list-item>
+          <list-item><p>Load the flight hardware.</p></list-item>
+        </list> trailing text.</p>
+      <p>Results are summarized below <table-wrap id="t1"><label>Table 1</label>
+          <table><tr><th>Group</th><th>Mass</th></tr><tr><td>Flight</td><td>21</td></tr></table>
+        </table-wrap> and discussed in the next section.</p>
+      <p>A plain paragraph with enough words to be kept.</p>
+    </sec>
+  </body>
+</article>
+"""
+
+
+def test_blocks_nested_in_paragraphs_keep_surrounding_text_in_order():
+    result = parse_jats(io.BytesIO(ARTICLE), "PMC1")
+    content = result["content"]
+
+    intro = content.index("Intro to the protocol steps:")
+    first_item = content.index("Seed the cultures.")
+    trailing = content.index("trailing text.")
+    assert intro < first_item < trailing
+    assert content.count("Seed the cultures.") == 1
+    assert "<ol" in content
+
+    before_table = content.index("Results are summarized below")
+    table = content.index("<table")
+    after_table = content.index("and discussed in the next section.")
+    assert before_table < table < after_table
+    assert result["tables"] == [{"label": "Table 1", "caption": "", "headers": ["Group", "Mass"], "rows": [["Flight", "21"]]}]
+
+    assert content.index("and discussed") < content.index("A plain paragraph")
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "0")
+
+from utils.llm import LLMClient, StubBackend  # noqa: E402
+
+PROMPT = "Summarize the effects of microgravity on mouse bone density and immune function"
+
+
+def test_stub_stream_times_out_like_generate():
+    backend = StubBackend(latency=0.14)
+    assert len(backend._words(PROMPT)) == 7
+    with pytest.raises(TimeoutError):
+        backend.generate("stub-model", PROMPT, timeout=0.05)
+
+    chunks = []
+    with pytest.raises(TimeoutError):
+        for chunk in backend.stream("stub-model", PROMPT, timeout=0.05):
+            chunks.append(chunk)
+    # Words are due every 0.02s, so two arrive before the 0.05s timeout
+    assert [chunk.completion_tokens for chunk in chunks] == [1, 2]
+
+    assert len(list(backend.stream("stub-model", PROMPT, timeout=1.0))) == 7
+
+
+def test_client_stream_counts_stub_timeouts():
+    client = LLMClient(StubBackend(latency=0.14), timeout=0.05)
+
+    async def run():
+        return [chunk async for chunk in client.stream("summary", PROMPT)]
+
+    with pytest.raises((TimeoutError, asyncio.TimeoutError)):
+        asyncio.run(run())
+    stats = client.stats()
+    assert sum(model["timeouts"] for model in stats["models"].values()) == 1
+
+
+def test_generate_runs_off_the_event_loop():
+    client = LLMClient(StubBackend(latency=0.1), max_concurrency=4)
+    ticks = []
+
+    async def ticker():
+        for _ in range(20):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def run():
+        started = time.perf_counter()
+        responses, _ = await asyncio.gather(
+            asyncio.gather(*(client.generate("summary", f"{PROMPT} {i}") for i in range(4))), ticker())
+        return responses, time.perf_counter() - started
+
+    responses, elapsed = asyncio.run(run())
+    # Four 0.1s calls overlap on the executor while the loop keeps ticking
+    assert elapsed < 0.25
+    assert len(ticks) == 20 and max(b - a for a, b in zip(ticks, ticks[1:])) < 0.05
+    assert client.usage()["calls"] == 4
+    assert all(response.completion_tokens for response in responses)
+
+
+def test_max_concurrency_bounds_calls_in_flight():
+    client = LLMClient(StubBackend(latency=0.05), max_concurrency=2)
+
+    async def run():
+        started = time.perf_counter()
+        await asyncio.gather(*(client.generate("summary", PROMPT) for _ in range(4)))
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.095
+
+
+def test_generate_timeout_is_accounted():
+    client = LLMClient(StubBackend(latency=0.2), timeout=0.05)
+    with pytest.raises((TimeoutError, asyncio.TimeoutError)):
+        asyncio.run(client.generate("chat", PROMPT))
+    model = client.stats()["models"]["gemini-2.5-flash"]
+    assert (model["calls"], model["timeouts"], model["errors"]) == (1, 1, 0)
+
+
+def test_comprehensive_summary_runs_its_model_stages_concurrently(monkeypatch):
+    import ai_utils
+
+    monkeypatch.setattr(ai_utils, "llm", LLMClient(StubBackend(latency=0.15)))
+    content = "<h2>Abstract</h2><p>" + "Mice flown aboard the ISS showed reduced bone density. " * 40 + "</p>"
+
+    started = time.perf_counter()
+    result, _, timing = asyncio.run(ai_utils.run_comprehensive_summary("Bone loss in mice", content))
+    elapsed = time.perf_counter() - started
+    # Keywords and summary are two 0.15s model calls; run in parallel they cost about one
+    assert elapsed < 0.28
+    assert timing["stages_ms"]["keywords"] >= 140 and timing["stages_ms"]["summary"] >= 140
+    assert set(result) == {"summary", "keywords", "chartData", "metadata"}
+    assert ai_utils.llm.usage()["calls"] == 2
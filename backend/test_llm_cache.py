@@ -0,0 +1,90 @@
+import asyncio
+import os
+import types
+
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import ai_utils  # noqa: E402
+from utils.encoding import dumps, gzip_bytes  # noqa: E402
+from utils.llm_cache import LLMResponseCache, llm_cache_key  # noqa: E402
+
+
+def test_keys_address_model_prompt_version_and_input():
+    key = llm_cache_key("gemini-2.5-flash", "summarize:1", "text")
+    assert key == llm_cache_key("gemini-2.5-flash", "summarize:1", "text")
+    assert key != llm_cache_key("gemini-2.5-pro", "summarize:1", "text")
+    assert key != llm_cache_key("gemini-2.5-flash", "summarize:2", "text")
+    assert llm_cache_key("m", "p", "ab", "c") != llm_cache_key("m", "p", "a", "bc")
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LLMResponseCache(path)
+    assert cache.get("keywords", "k") is None
+    cache.put("keywords", "k", "stub", {"keywords": ["mice", "bone"]})
+    reopened = LLMResponseCache(path)
+    assert reopened.get("keywords", "k") == {"keywords": ["mice", "bone"]}
+    assert reopened.current_bytes == cache.current_bytes > 0
+    stats = cache.stats()["endpoints"]["keywords"]
+    assert (stats["hits"], stats["misses"], stats["writes"], stats["entries"]) == (0, 1, 1, 1)
+
+
+def test_least_recently_used_rows_are_evicted_past_the_budget(tmp_path):
+    value = {"summary": os.urandom(600).hex()}
+    size = len(gzip_bytes(dumps(value)))
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), max_bytes=int(size * 2.5))
+    cache.put("summarize", "a", "stub", value)
+    cache.put("summarize", "b", "stub", value)
+    cache.get("summarize", "a")
+    cache.put("summarize", "c", "stub", value)
+    assert cache.get("summarize", "b") is None
+    assert cache.get("summarize", "a") == value and cache.get("summarize", "c") == value
+    assert cache.evictions == 1 and cache.current_bytes == 2 * size
+
+
+def test_invalidate_one_endpoint(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    cache.put("summarize", "a", "stub", {"summary": "x"})
+    cache.put("keywords", "b", "stub", {"keywords": []})
+    assert cache.invalidate("summarize") == 1
+    assert cache.get("summarize", "a") is None and cache.get("keywords", "b") is not None
+    assert cache.invalidate() == 1 and cache.current_bytes == 0
+
+
+def test_endpoint_answers_repeat_requests_from_the_cache(tmp_path, monkeypatch):
+    import app as backend
+
+    calls = []
+
+    async def generate(role, prompt):
+        calls.append(role)
+        await asyncio.sleep(0)
+        return types.SimpleNamespace(text="Mice lost bone density in orbit.")
+
+    monkeypatch.setattr(ai_utils, "llm_cache", LLMResponseCache(str(tmp_path / "llm.sqlite3")))
+    monkeypatch.setattr(ai_utils.llm, "generate", generate)
+    http = TestClient(backend.app)
+
+    first = http.post("/ai/summarize", json={"text": "Mice flown on the ISS for 30 days."})
+    second = http.post("/ai/summarize", json={"text": "Mice flown on the ISS for 30 days."})
+    assert first.json() == second.json() == {"summary": "Mice lost bone density in orbit."}
+    assert calls == ["analysis"]
+    http.post("/ai/summarize", json={"text": "A different article."})
+    assert len(calls) == 2
+
+
+def test_failed_model_calls_are_not_cached(tmp_path, monkeypatch):
+    import app as backend
+
+    async def failing(role, prompt):
+        raise TimeoutError("model timed out")
+
+    cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setattr(ai_utils, "llm_cache", cache)
+    monkeypatch.setattr(ai_utils.llm, "generate", failing)
+    response = TestClient(backend.app).post("/ai/summarize", json={"text": "Mice flown on the ISS."})
+    assert response.json() == {"summary": "AI summarization temporarily unavailable."}
+    assert cache.stats()["endpoints"]["summarize"]["writes"] == 0
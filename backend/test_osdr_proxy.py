@@ -0,0 +1,251 @@
+import asyncio
+import gc
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app as backend
+from utils.response_cache import ResponseCache, body_etag
+from utils.upstream import UpstreamClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    responses = {}
+
+    def handler(request):
+        status, body = responses[request.url.path.rstrip("/").rsplit("/", 1)[-1]]
+        return httpx.Response(status, json=body)
+
+    upstream = UpstreamClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), retries=0, hedge=False)
+    monkeypatch.setattr(backend, "osdr_upstream", upstream)
+    backend.osdr_cache.invalidate()
+    yield TestClient(backend.app), responses
+    backend.osdr_cache.invalidate()
+
+
+@pytest.mark.parametrize("status", [429, 401, 403, 503])
+def test_upstream_errors_are_not_cached(client, status):
+    http, responses = client
+    responses["OSD-9"] = (status, {"error": "nope"})
+    assert http.get("/api/dataset/OSD-9").status_code == 500
+
+    responses["OSD-9"] = (200, {"OSD-9": {"metadata": {}}})
+    response = http.get("/api/dataset/OSD-9")
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json() == {"OSD-9": {"metadata": {}}}
+
+
+def test_not_found_is_negatively_cached_with_its_status(client):
+    http, responses = client
+    responses["OSD-404"] = (404, {"detail": "Not found"})
+    first = http.get("/api/dataset/OSD-404")
+    assert (first.status_code, first.headers["X-Cache"]) == (404, "MISS")
+
+    responses["OSD-404"] = (200, {"OSD-404": {}})
+    second = http.get("/api/dataset/OSD-404")
+    assert (second.status_code, second.headers["X-Cache"]) == (404, "HIT")
+
+
+def test_missing_files_listing_is_an_empty_list_with_its_own_etag(client):
+    http, responses = client
+    responses["files"] = (404, {"error": "Dataset OSD-0 not found"})
+
+    response = http.get("/api/dataset/OSD-0/files")
+    assert (response.status_code, response.json()) == (200, [])
+    assert response.headers["ETag"] == body_etag(b"[]")
+    revalidated = http.get("/api/dataset/OSD-0/files", headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_stale_refresh_task_is_held_until_it_finishes():
+    cache = ResponseCache()
+    fetched = []
+
+    async def fetch():
+        fetched.append(True)
+        await asyncio.sleep(0.01)
+        return 200, {"n": len(fetched)}
+
+    async def run():
+        await cache.get("https://example.org/a", fetch, ttl=0, stale_ttl=60)
+        entry, status = await cache.get("https://example.org/a", fetch, ttl=0, stale_ttl=60)
+        assert (status, entry.status) == ("STALE", 200)
+        assert len(cache._refresh_tasks) == 1
+        # Nothing else references the task; the cache must keep it alive
+        gc.collect()
+        await asyncio.gather(*cache._refresh_tasks)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cache._refresh_tasks == set()
+    assert cache.counters["refreshes"] == 1
+    assert len(fetched) == 2
+
+
+def test_experiment_degrades_on_non_object_entries(client):
+    http, responses = client
+    responses["OSD-7"] = (200, {"OSD-7": {"title": "Rodent Research"}})
+    responses["assays"] = (200, {"OSD-7": {"assays": {"OSD-7_assay": "unexpected", "OSD-7_other": None}}})
+    responses["files"] = (200, {"OSD-7": {"files": ["not", "a", "mapping"]}})
+
+    response = http.get("/api/dataset/OSD-7/experiment", params={"depth": 1})
+    assert response.status_code == 200
+    document = response.json()
+    assert document["assays"] == [{"name": "OSD-7_assay", "url": None}, {"name": "OSD-7_other", "url": None}]
+    assert document["files"] == []
+
+
+def test_cached_responses_are_served_brotli_encoded(client):
+    http, responses = client
+    responses["OSD-48"] = (200, {"OSD-48": {"description": "Rodent Research 1 " * 200}})
+
+    response = http.get("/api/dataset/OSD-48", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.json()["OSD-48"]["description"].startswith("Rodent Research 1")
+    assert http.get("/api/dataset/OSD-48", headers={"Accept-Encoding": "gzip"}).headers["Content-Encoding"] == "gzip"
+
+
+def test_manifest_bounds_upstream_calls_not_assays(monkeypatch):
+    in_flight, peak = [0], [0]
+
+    async def fake_osdr_json(url, kind):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.005)
+        in_flight[0] -= 1
+        if kind == "assays":
+            return {"OSD-1": {"assays": {f"assay-{i}": {} for i in range(6)}}}
+        if kind == "assay-details":
+            return {"OSD-1": {"assays": {"a": {"samples": {"s1": {}, "s2": {}}}}}}
+        return {"OSD-1": {"files": {url: {"URL": url}}}}
+
+    monkeypatch.setattr(backend, "osdr_json", fake_osdr_json)
+    levels = {"dataset": backend.ManifestLevel(), "assay": backend.ManifestLevel(), "sample": backend.ManifestLevel()}
+
+    async def walk():
+        return [record async for record in backend.walk_manifest("OSD-1", 3, levels, set())]
+
+    records = asyncio.run(walk())
+    assert peak[0] <= 3
+    assert len(records) == 1 + 6 + 12
+    assert levels["sample"].ok == 12
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.org/biodata/api/v2/dataset/OSD-1/assay/a/",
+    "http://visualization.osdr.nasa.gov/biodata/api/v2/dataset/OSD-1/",
+    "https://visualization.osdr.nasa.gov/biodata/api/v2evil/",
+    "https://visualization.osdr.nasa.gov.evil.test/biodata/api/v2/",
+])
+def test_assay_details_rejects_urls_outside_the_osdr_api(client, url):
+    http, responses = client
+    assert http.get("/api/assay-details", params={"url": url}).status_code == 400
+    assert backend.osdr_upstream.hosts == {}
+
+
+def test_assay_details_proxies_osdr_api_urls(client):
+    http, responses = client
+    responses["OSD-1-assay"] = (200, {"OSD-1": {"assays": {}}})
+    url = f"{backend.OSDR_API}/dataset/OSD-1/assay/OSD-1-assay/"
+    assert http.get("/api/assay-details", params={"url": url}).status_code == 200
+
+
+def test_live_ndjson_stream_is_not_gzipped(client, monkeypatch):
+    http, responses = client
+    responses["datasets"] = (200, {f"OSD-{i}": {} for i in range(20)})
+
+    async def fake_metadata(upstream, dataset_id):
+        return {"id": dataset_id, "description": "Mice flown aboard the ISS. " * 10}
+
+    monkeypatch.setattr(backend, "fetch_dataset_metadata", fake_metadata)
+    response = http.get("/api/datasets/bulk?format=ndjson&live=true", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    lines = response.text.strip().split("\n")
+    assert len(lines) == 21 and '"summary"' in lines[-1]
+
+
+API_PATH = "/biodata/api/v2"
+EXPERIMENT_UPSTREAM = {
+    "/dataset/OSD-9/": {"OSD-9": {"metadata": {"study title": "Rodent Research 9"}}},
+    "/dataset/OSD-9/assays/": {"OSD-9": {"assays": {
+        "rna-seq": {"REST_URL": f"{backend.OSDR_API}/dataset/OSD-9/assay/rna-seq/"},
+        "proteomics": {"REST_URL": f"{backend.OSDR_API}/dataset/OSD-9/assay/proteomics/"},
+    }}},
+    "/dataset/OSD-9/files/": {"OSD-9": {"files": {"counts.csv": {"URL": "https://osdr.nasa.gov/counts.csv"}}}},
+    "/dataset/OSD-9/assay/rna-seq/": {"OSD-9": {"assays": {"rna-seq": {
+        "metadata": {"platform": "Illumina"}, "samples": {"Mmus_F1": {"REST_URL": "s1"}, "REST_URL": "x"}}}}},
+    "/dataset/OSD-9/assay/proteomics/": {"OSD-9": {"assays": {"proteomics": {
+        "metadata": {"platform": "Orbitrap"}, "samples": {"Mmus_F2": {"REST_URL": "s2"}}}}}},
+    "/dataset/OSD-9/assay/rna-seq/samples/": {"OSD-9": {"samples": ["Mmus_F1"]}},
+}
+
+
+@pytest.fixture
+def experiment_upstream(monkeypatch):
+    requested = []
+
+    def handler(request):
+        path = request.url.path.removeprefix(API_PATH)
+        requested.append(path)
+        if path not in EXPERIMENT_UPSTREAM:
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json=EXPERIMENT_UPSTREAM[path])
+
+    upstream = UpstreamClient(httpx.AsyncClient(transport=httpx.MockTransport(handler)), retries=0, hedge=False)
+    monkeypatch.setattr(backend, "osdr_upstream", upstream)
+    backend.osdr_cache.invalidate()
+    yield TestClient(backend.app), requested
+    backend.osdr_cache.invalidate()
+
+
+def test_experiment_depth_1_lists_assays_and_files_only(experiment_upstream):
+    http, requested = experiment_upstream
+    document = http.get("/api/dataset/OSD-9/experiment?depth=1").json()
+    assert document["dataset"]["metadata"]["study title"] == "Rodent Research 9"
+    assert [assay["name"] for assay in document["assays"]] == ["rna-seq", "proteomics"]
+    assert "metadata" not in document["assays"][0]
+    assert document["files"] == [{"name": "counts.csv", "url": "https://osdr.nasa.gov/counts.csv", "rest_url": None}]
+    assert sorted(requested) == ["/dataset/OSD-9/", "/dataset/OSD-9/assays/", "/dataset/OSD-9/files/"]
+
+
+def test_experiment_depth_2_adds_assay_metadata_and_samples(experiment_upstream):
+    http, requested = experiment_upstream
+    document = http.get("/api/dataset/OSD-9/experiment").json()
+    assert document["depth"] == 2
+    rna_seq, proteomics = document["assays"]
+    assert rna_seq["metadata"] == {"platform": "Illumina"}
+    assert rna_seq["samples"] == [{"name": "Mmus_F1", "url": "s1"}]
+    assert proteomics["samples"] == [{"name": "Mmus_F2", "url": "s2"}]
+    assert "sample_listing" not in rna_seq
+    assert len(requested) == 5 and "errors" not in document
+
+
+def test_experiment_depth_3_adds_sample_listings_and_reports_missing_ones(experiment_upstream):
+    http, _ = experiment_upstream
+    rna_seq, proteomics = http.get("/api/dataset/OSD-9/experiment?depth=3").json()["assays"]
+    assert rna_seq["sample_listing"] == {"OSD-9": {"samples": ["Mmus_F1"]}}
+    # Upstream 404 for the proteomics listing: the section is empty, not an error
+    assert proteomics["sample_listing"] is None
+
+
+def test_experiment_fields_select_sections(experiment_upstream):
+    http, requested = experiment_upstream
+    document = http.get("/api/dataset/OSD-9/experiment?fields=files&depth=3").json()
+    assert set(document) == {"accession", "depth", "files", "timing"}
+    assert requested == ["/dataset/OSD-9/files/"]
+
+
+@pytest.mark.parametrize("query", ["depth=0", "depth=4", "fields=dataset,samples"])
+def test_experiment_rejects_bad_parameters(experiment_upstream, query):
+    http, requested = experiment_upstream
+    assert http.get(f"/api/dataset/OSD-9/experiment?{query}").status_code == 400
+    assert requested == []
+
+
+def test_missing_experiment_is_a_404(experiment_upstream):
+    http, _ = experiment_upstream
+    assert http.get("/api/dataset/OSD-404/experiment").status_code == 404
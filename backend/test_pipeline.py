@@ -0,0 +1,57 @@
+import asyncio
+
+from utils.pipeline import bounded_map, timing_summary
+
+
+def test_concurrency_is_bounded_and_slow_items_do_not_stall_the_rest():
+    in_flight, peak, started = [0], [0], []
+
+    async def worker(item):
+        started.append(item)
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.2 if item == 0 else 0.01)
+        in_flight[0] -= 1
+        if item == 5:
+            raise ValueError("bad dataset")
+        return item * 10
+
+    async def run():
+        return [(item, result) async for item, result, _ in bounded_map(range(10), worker, 3)]
+
+    results = asyncio.run(run())
+    assert peak[0] == 3
+    # Item 0 holds one slot while the other nine flow through the remaining two
+    assert results[-1] == (0, 0)
+    assert isinstance(dict(results)[5], ValueError)
+    assert sorted(item for item, _ in results) == list(range(10))
+
+
+def test_closing_early_cancels_calls_in_flight():
+    cancelled = []
+
+    async def worker(item):
+        try:
+            await asyncio.sleep(0.01 if item == 0 else 1)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    async def run():
+        stream = bounded_map(range(100), worker, 4)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(run())[0] == 0
+    # Item 4 was started when item 0 freed its slot; it may be cancelled before it runs
+    assert {1, 2, 3} <= set(cancelled) <= {1, 2, 3, 4}
+
+
+def test_timing_summary():
+    summary = timing_summary([(0.1, "OSD-1"), (0.3, "OSD-2"), (0.2, "OSD-3")], 0.35, slowest=2)
+    assert (summary["count"], summary["p50_ms"], summary["max_ms"]) == (3, 200.0, 300.0)
+    assert [entry["key"] for entry in summary["slowest"]] == ["OSD-2", "OSD-3"]
+    assert timing_summary([], 0.0) == {"total_seconds": 0.0, "count": 0}
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "0")
+
+import precompute_summaries as precompute  # noqa: E402
+from utils.article_catalog import Article  # noqa: E402
+from utils.checkpoint import Checkpoint  # noqa: E402
+from utils.summary_store import SummaryStore, content_fingerprint  # noqa: E402
+
+VERSION = "stub-model:1"
+
+
+def make_args(**overrides):
+    values = {"ids": None, "force": False, "retry_failed": False, "max_attempts": 3, "limit": 0,
+              "rpm": 0, "concurrency": 2, "max_requests": 0, "max_tokens": 0}
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+class Catalog:
+    def __init__(self, count):
+        self.articles = [Article(i, f"Article {i}", f"https://example.org/{i}", f"PMC{i}") for i in range(count)]
+
+    def all(self):
+        return self.articles
+
+
+class Store:
+    def __init__(self, contents):
+        self.contents = contents
+
+    def get(self, url, article_id=None):
+        content = self.contents.get(url)
+        return {"content": content} if content is not None else None
+
+
+def test_articles_with_a_current_summary_are_skipped_until_their_text_changes(tmp_path, monkeypatch):
+    summaries = SummaryStore(str(tmp_path / "summaries.sqlite3"))
+    monkeypatch.setattr(precompute, "summary_store", summaries)
+    catalog = Catalog(3)
+    contents = {article.link: f"<p>Findings of article {article.id} in microgravity.</p>" for article in catalog.all()}
+    del contents["https://example.org/2"]
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    text = precompute.article_text(contents["https://example.org/0"])
+    summaries.put(0, "Article 0", content_fingerprint(text), VERSION, {"summary": "done"})
+
+    work, skipped = precompute.select_articles(catalog, Store(contents), checkpoint, VERSION, make_args())
+    assert [article.id for article, _, _ in work] == [1]
+    assert skipped == {"current": 1, "no_content": 1}
+
+    # Reformatted markup hashes the same; new text does not
+    contents["https://example.org/0"] = "<div>Findings of article 0\n in microgravity.</div>"
+    work, _ = precompute.select_articles(catalog, Store(contents), checkpoint, VERSION, make_args())
+    assert [article.id for article, _, _ in work] == [1]
+    contents["https://example.org/0"] = "<p>Revised findings of article 0.</p>"
+    work, _ = precompute.select_articles(catalog, Store(contents), checkpoint, VERSION, make_args())
+    assert [article.id for article, _, _ in work] == [0, 1]
+    work, _ = precompute.select_articles(catalog, Store(contents), checkpoint, "stub-model:2", make_args())
+    assert [article.id for article, _, _ in work] == [0, 1]
+
+
+def test_scheduling_stops_when_the_request_budget_is_spent(tmp_path, monkeypatch):
+    summaries = SummaryStore(str(tmp_path / "summaries.sqlite3"))
+    monkeypatch.setattr(precompute, "summary_store", summaries)
+    calls = []
+
+    async def summarize(title, text):
+        calls.append(title)
+        return {"summary": title}, True, {"total_ms": 0.0}
+
+    monkeypatch.setattr(precompute, "run_comprehensive_summary", summarize)
+    work = [(article, "text", f"hash{article.id}") for article in Catalog(5).all()]
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    timings, failures, budget, _ = asyncio.run(
+        precompute.run(work, checkpoint, VERSION, make_args(max_requests=2 * precompute.MODEL_CALLS_PER_ARTICLE + 1)))
+    assert calls == ["Article 0", "Article 1"]
+    assert len(timings) == 2 and failures == {}
+    assert budget.scheduled == 2
+    assert budget.reason.startswith("request budget")
+    assert summaries.is_current(1, "hash1", VERSION) and not summaries.is_current(2, "hash2", VERSION)
+
+
+def test_scheduling_stops_when_the_token_budget_is_spent(monkeypatch):
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    monkeypatch.setattr(precompute.llm, "usage", lambda: dict(usage))
+    budget = precompute.Budget(max_requests=0, max_tokens=1000)
+    assert budget.allow()
+    usage["completion_tokens"] = 1000
+    assert not budget.allow()
+    assert budget.scheduled == 1 and budget.reason.startswith("token budget")
+
+
+def test_model_request_limiter_spaces_article_starts():
+    # 2400 requests per minute at two requests per article: one start every 50 ms
+    limiter = precompute.ModelRequestLimiter(rpm=2400)
+    starts = []
+
+    async def start():
+        async with limiter.slot():
+            starts.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(start() for _ in range(4)))
+
+    asyncio.run(main())
+    starts.sort()
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+    assert precompute.ModelRequestLimiter(rpm=0).interval == 0.0
+
+
+def test_checkpoint_tracks_failures_only(tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text(json.dumps({"completed": [1, 2], "failures": {"3": {"attempts": 1, "error": "x"}}}))
+    checkpoint = Checkpoint(str(path))
+    checkpoint.record(3, "timeout")
+    checkpoint.record(4)
+    assert checkpoint.attempts(3) == 2
+    state = json.loads(path.read_text())
+    assert "completed" not in state
+    assert state["failures"]["3"]["error"] == "timeout"
+    checkpoint.record(3)
+    assert checkpoint.attempts(3) == 0
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from utils.rate_limiter import HostRateLimiter
+
+
+def test_threaded_limiter_spaces_starts_and_caps_concurrency_per_host():
+    limiter = HostRateLimiter(min_interval=0.05, jitter=0, max_concurrent=2)
+    starts, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def fetch(url):
+        with limiter.slot(url):
+            with lock:
+                starts.append((limiter.host_of(url), time.monotonic()))
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    urls = ["https://pmc.ncbi.nlm.nih.gov/articles/PMC%d/" % i for i in range(4)] + ["https://example.org/a"]
+    threads = [threading.Thread(target=fetch, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pmc = sorted(at for host, at in starts if host == "pmc.ncbi.nlm.nih.gov")
+    assert all(later - earlier >= 0.045 for earlier, later in zip(pmc, pmc[1:]))
+    assert peak[0] <= 2 + 1  # two PMC slots plus the other host
+    assert limiter.stats()["hosts"] == 2
+    assert limiter.stats()["throttled"] == 3
@@ -0,0 +1,84 @@
+import threading
+
+import app as backend
+from utils.article_catalog import ArticleCatalog
+from utils.search_index import SearchIndex
+
+ROWS = [
+    ("Microgravity and bone loss in mice", "https://pmc.ncbi.nlm.nih.gov/articles/PMC1000001/"),
+    ("Plant root growth on the ISS", "https://pmc.ncbi.nlm.nih.gov/articles/PMC1000002/"),
+    ("Immune response to spaceflight", "https://pmc.ncbi.nlm.nih.gov/articles/PMC1000003/"),
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Title,Link\n")
+        for title, link in rows:
+            f.write(f"{title},{link}\n")
+
+
+def use_catalog(monkeypatch, path):
+    catalog = ArticleCatalog(str(path), check_interval=0)
+    monkeypatch.setattr(backend, "catalog", catalog)
+    monkeypatch.setattr(backend, "search_index", SearchIndex())
+    monkeypatch.setattr(backend, "_indexed_catalog_digest", None)
+    return catalog
+
+
+def test_indexed_bodies_follow_their_article_when_the_csv_is_reordered(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, ROWS)
+    catalog = use_catalog(monkeypatch, path)
+    backend.sync_search_index()
+    backend.index_article_body(catalog.get(1), "<p>Arabidopsis gravitropism in orbit</p>")
+
+    write_csv(path, [ROWS[2], ROWS[1][:1] + ("https://example.org/moved",), ROWS[0]])
+    catalog.reload()
+    backend.sync_search_index()
+
+    # The plant article's link changed, so its body is dropped rather than
+    # attached to whichever article now sits at row 1
+    assert backend.search_articles("arabidopsis")["results"] == []
+    results = backend.search_articles("immune")["results"]
+    assert [(r["id"], r["link"]) for r in results] == [(0, ROWS[2][1])]
+
+
+def test_reorder_keeps_bodies_of_articles_that_moved(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, ROWS)
+    catalog = use_catalog(monkeypatch, path)
+    backend.sync_search_index()
+    backend.index_article_body(catalog.get(0), "<p>Osteoclast activity in hindlimb unloading</p>")
+
+    write_csv(path, list(reversed(ROWS)))
+    catalog.reload()
+    backend.sync_search_index()
+
+    results = backend.search_articles("osteoclast")["results"]
+    assert [(r["id"], r["link"], r["content_indexed"]) for r in results] == [(2, ROWS[0][1], True)]
+
+
+def test_concurrent_syncs_index_the_catalog_once(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.csv"
+    write_csv(path, ROWS)
+    use_catalog(monkeypatch, path)
+    added = []
+    original_add = backend.search_index.add
+    barrier = threading.Barrier(8)
+
+    def counting_add(*args, **kwargs):
+        added.append(args[0])
+        return original_add(*args, **kwargs)
+
+    def sync():
+        barrier.wait()
+        backend.sync_search_index()
+
+    monkeypatch.setattr(backend.search_index, "add", counting_add)
+    threads = [threading.Thread(target=sync) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(added) == len(ROWS)
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+        return {"content": "<p>Bone loss</p>"}
+
+    async def main():
+        return await asyncio.gather(*(flights.do(7, work) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    stats = flights.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 9, 0)
+    assert stats["coalescing_rate"] == 0.9
+
+
+def test_error_is_shared_by_followers_but_not_replayed():
+    flights = SingleFlight()
+    runs = []
+
+    async def failing():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("PMC unreachable")
+
+    async def main():
+        results = await asyncio.gather(*(flights.do("a", failing) for _ in range(5)), return_exceptions=True)
+        assert all(isinstance(r, ConnectionError) and r is results[0] for r in results)
+        with pytest.raises(ConnectionError):
+            await flights.do("a", failing)
+
+    asyncio.run(main())
+    assert len(runs) == 2
+    assert flights.stats()["failures"] == 2 and flights.stats()["coalesced"] == 4
+
+
+def test_a_cancelled_caller_does_not_cancel_the_work():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flights.do("k", work))
+        second = asyncio.ensure_future(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert flights.stats()["executions"] == 1
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "0")
+
+import ai_utils  # noqa: E402
+from ai_utils import ArticleContent, stream_comprehensive_summary  # noqa: E402
+
+ARTICLE = ArticleContent(
+    title="Mice in Bion-M 1 space mission",
+    content="Mice were flown for 30 days aboard the Bion-M 1 biosatellite. " * 40,
+)
+
+
+def collect(events):
+    async def run():
+        return [chunk async for chunk in events]
+    parsed = []
+    for chunk in asyncio.run(run()):
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        lines = dict(line.split(": ", 1) for line in text.strip().split("\n"))
+        parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+def test_stream_failure_is_flagged_and_not_cached(monkeypatch):
+    async def failing_stream(role, prompt):
+        yield "Partial summary text about the mission. " * 8
+        raise ConnectionError("stream reset")
+
+    stored = []
+    monkeypatch.setattr(ai_utils.llm, "stream", failing_stream)
+    monkeypatch.setattr(ai_utils.llm_cache, "put", lambda *args: stored.append(args))
+
+    events = collect(stream_comprehensive_summary(ARTICLE, "key", None))
+    done = events[-1]
+    assert done[0] == "done"
+    assert done[1]["incomplete"] is True
+    assert done[1]["summary"].startswith("Partial summary text")
+    assert stored == []
+
+
+def test_completed_stream_is_cached(monkeypatch):
+    async def full_stream(role, prompt):
+        yield "A complete summary of the mission results. " * 8
+
+    stored = []
+    monkeypatch.setattr(ai_utils.llm, "stream", full_stream)
+    monkeypatch.setattr(ai_utils, "generate_keywords", lambda *args: asyncio.sleep(0, (["mice"], True)))
+    monkeypatch.setattr(ai_utils.llm_cache, "put", lambda *args: stored.append(args))
+
+    done = collect(stream_comprehensive_summary(ARTICLE, "key", None))[-1]
+    assert "incomplete" not in done[1]
+    assert len(stored) == 1
+
+
+def test_sse_streams_are_not_gzipped(monkeypatch):
+    from fastapi.testclient import TestClient
+    import app as backend
+
+    async def long_stream(role, prompt):
+        for _ in range(40):
+            yield "Bone density fell in the flight group. "
+
+    monkeypatch.setattr(ai_utils.llm, "stream", long_stream)
+    response = TestClient(backend.app).post("/ai/chat/stream", json={"question": "What happened to bone?"},
+                                            headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+    assert response.text.count("event: token") == 40
@@ -0,0 +1,126 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from utils import taskbook
+from utils.taskbook import parse_highlights
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "taskbook", "highlights.html")
+
+
+def load_fixture():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def full_parse(html, limit=taskbook.MAX_HIGHLIGHTS):
+    return taskbook._scan_images(BeautifulSoup(html, 'html.parser'), limit)
+
+
+def test_parse_highlights_matches_a_full_parse():
+    highlights = parse_highlights(load_fixture())
+    assert highlights == full_parse(load_fixture())
+
+    assert [h["image"] for h in highlights] == [
+        "https://taskbook.nasaprs.com/tbp/images/highlights/plants.jpg",
+        "https://taskbook.nasaprs.com/tbp/images/highlights/immune.jpg",
+        "https://taskbook.nasaprs.com/tbp/images/highlights/biofilm.jpg",
+        "https://taskbook.nasaprs.com/tbp/images/highlights/virus.jpg",
+    ]
+    assert highlights[0]["title"].startswith("Spaceflight Allows Botanists")
+    assert "Mehta/Pierson" in highlights[3]["summary"]
+
+
+def test_parse_stops_at_the_limit():
+    card = '<td><img src="/tbp/images/highlights/{0}.jpg">' + "Highlight {0} " + "x" * 60 + "</td>"
+    html = "<table><tr>" + "".join(card.format(i) for i in range(20)) + "</tr></table>"
+    highlights = parse_highlights(html, limit=3)
+    assert [h["image"].rsplit("/", 1)[1] for h in highlights] == ["0.jpg", "1.jpg", "2.jpg"]
+
+
+CARD_PAGE = """<html><body>
+<table><tr><td>
+  <a class="menu-highlights" href="/tbp/highlights.cfm">Highlights</a>
+  <div class="highlight-item"><img src="/tbp/images/highlights/plants.jpg">
+    Spaceflight Allows Botanists To Probe Fundamental Questions About Plants (Ferl/Paul)</div>
+  <div class="highlight-item"><img src="/tbp/images/highlights/immune.jpg">
+    Microgravity Offers a Unique Opportunity to Study Human Immune Function (Hughes-Fulford)</div>
+</td></tr></table>
+</body></html>"""
+
+
+def test_highlight_classed_cards_are_parsed_without_the_layout_table():
+    strained = BeautifulSoup(CARD_PAGE, 'html.parser', parse_only=taskbook.HIGHLIGHT_STRAINER)
+    assert strained.find('td') is None
+    assert len(strained.find_all('div', class_='highlight-item')) == 2
+
+    highlights = parse_highlights(CARD_PAGE)
+    assert [h["image"] for h in highlights] == [
+        "https://taskbook.nasaprs.com/tbp/images/highlights/plants.jpg",
+        "https://taskbook.nasaprs.com/tbp/images/highlights/immune.jpg",
+    ]
+    assert highlights[1]["summary"].startswith("Microgravity Offers")
+
+
+def test_cold_start_serves_fallback_without_scraping(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import app as backend
+
+    scrapes = []
+
+    class RecordingUpstream:
+        async def get(self, url, **kwargs):
+            scrapes.append(url)
+            raise ConnectionError("offline")
+
+    monkeypatch.setattr(backend, "taskbook_highlights", taskbook.HighlightsSnapshot(str(tmp_path / "highlights.json")))
+    monkeypatch.setattr(backend, "web_upstream", RecordingUpstream())
+    response = TestClient(backend.app).get("/api/taskbook/highlights")
+    assert scrapes == []
+    assert response.status_code == 200
+    assert response.json()["fallback"] is True
+    assert response.json()["highlights"] == taskbook.FALLBACK_HIGHLIGHTS
+
+
+def test_failed_save_keeps_the_previous_snapshot(tmp_path, monkeypatch):
+    snapshot = taskbook.HighlightsSnapshot(str(tmp_path / "highlights.json"))
+
+    class Upstream:
+        async def get(self, url, **kwargs):
+            return httpx.Response(200, text=load_fixture(), request=httpx.Request("GET", url))
+
+    def failing_save(highlights, fetched_at):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot, "_save", failing_save)
+    assert asyncio.run(snapshot.refresh(Upstream())) is False
+    assert snapshot.is_fallback()
+    assert "disk full" in snapshot.last_error
+
+
+def test_refresh_loop_survives_an_unexpected_error(monkeypatch):
+    import app as backend
+
+    calls = []
+
+    class CrashingSnapshot:
+        async def refresh(self, upstream):
+            calls.append(upstream)
+            raise RuntimeError("boom")
+
+    sleep = asyncio.sleep
+
+    async def short_sleep(seconds):
+        if len(calls) >= 3:
+            raise asyncio.CancelledError
+        await sleep(0)
+
+    monkeypatch.setattr(backend, "taskbook_highlights", CrashingSnapshot())
+    monkeypatch.setattr(asyncio, "sleep", short_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(backend.refresh_taskbook_periodically())
+    assert len(calls) == 3
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+
+from utils.upstream import AIMDLimiter, UpstreamClient
+
+URL = "http://upstream.test/data"
+
+
+def slow_client(delay, started=None, cancelled=None):
+    async def handler(request):
+        if started is not None:
+            started.append(request.url)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(request.url)
+            raise
+        return httpx.Response(200, json={"ok": True})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_cancelled_probe_does_not_wedge_half_open_circuit():
+    async def scenario():
+        async with slow_client(0.2) as client:
+            upstream = UpstreamClient(client, retries=0, hedge=False, breaker_failures=1, breaker_reset=0.0)
+            breaker = upstream._host(URL).breaker
+            breaker.failure()
+            assert breaker.state == "open"
+
+            probe = asyncio.create_task(upstream.get(URL))
+            await asyncio.sleep(0.05)
+            assert breaker.state == "half_open"
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+            await asyncio.sleep(0)
+
+            response = await upstream.get(URL)
+            assert response.status_code == 200
+            assert breaker.state == "closed"
+            assert breaker.rejected == 0
+
+    asyncio.run(scenario())
+
+
+def test_caller_cancelled_during_hedge_delay_cancels_primary():
+    async def scenario():
+        started, cancelled = [], []
+        async with slow_client(1.0, started, cancelled) as client:
+            upstream = UpstreamClient(client, retries=0, min_hedge_delay=0.2)
+            state = upstream._host(URL)
+            for _ in range(upstream.hedge_min_samples):
+                state.latency.record(0.01)
+
+            call = asyncio.create_task(upstream.get(URL))
+            await asyncio.sleep(0.05)
+            assert len(started) == 1
+            call.cancel()
+            await asyncio.gather(call, return_exceptions=True)
+            await asyncio.sleep(0.05)
+
+            assert len(cancelled) == 1
+            assert state.limiter.in_flight == 0
+            assert state.counters["hedges"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_limiter_wakeup_survives_a_cancelled_waiter():
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, max_limit=1)
+        assert limiter.try_acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert len(limiter._waiters) == 2
+
+        limiter.release(None)
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1.0)
+        assert limiter.in_flight == 1
+        await asyncio.gather(first, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_hedge_rescues_a_primary_that_fails_with_a_retryable_status():
+    async def scenario():
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url)
+            if len(calls) == 1:
+                await asyncio.sleep(0.05)
+                return httpx.Response(503)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"ok": True})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            upstream = UpstreamClient(client, retries=0, min_hedge_delay=0.01)
+            state = upstream._host(URL)
+            for _ in range(upstream.hedge_min_samples):
+                state.latency.record(0.001)
+
+            response = await upstream.get(URL)
+            assert response.status_code == 200
+            assert len(calls) == 2
+            assert state.counters["hedge_wins"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_retryable_status_is_returned_when_no_hedge_answers_better():
+    async def scenario():
+        async def handler(request):
+            await asyncio.sleep(0.02)
+            return httpx.Response(503)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            upstream = UpstreamClient(client, retries=0, min_hedge_delay=0.01)
+            state = upstream._host(URL)
+            for _ in range(upstream.hedge_min_samples):
+                state.latency.record(0.001)
+            assert (await upstream.get(URL)).status_code == 503
+            assert state.counters["hedges"] == 1
+
+    asyncio.run(scenario())
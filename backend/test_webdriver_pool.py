@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from utils.webdriver_pool import PoolTimeout, WebDriverPool, _PooledDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.pages = []
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def get(self, url):
+        self.pages.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_pool(monkeypatch, **kwargs):
+    pool = WebDriverPool(**kwargs)
+    launched = []
+
+    def launch():
+        launched.append(FakeDriver())
+        with pool._cond:
+            pool.counters["launched"] += 1
+        return _PooledDriver(launched[-1])
+
+    monkeypatch.setattr(pool, "_launch", launch)
+    return pool, launched
+
+
+def test_driver_is_recycled_after_max_pages(monkeypatch):
+    pool, launched = fake_pool(monkeypatch, size=1, max_pages=3)
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver is launched[0]
+    assert launched[0].quit_called
+    assert pool.stats()["recycled"] == 1 and pool.stats()["alive"] == 0
+
+    with pool.driver() as driver:
+        assert driver is launched[1]
+    assert len(launched) == 2
+
+
+def test_driver_is_recycled_after_an_error(monkeypatch):
+    pool, launched = fake_pool(monkeypatch, size=1, max_pages=50)
+    with pytest.raises(ValueError):
+        with pool.driver():
+            raise ValueError("page crashed")
+    assert launched[0].quit_called
+    assert pool.stats()["errors"] == 1
+
+
+def test_checkout_times_out_when_every_driver_is_busy(monkeypatch):
+    pool, _ = fake_pool(monkeypatch, size=1, checkout_timeout=0.05)
+    held = pool.checkout()
+    with pytest.raises(PoolTimeout):
+        pool.checkout()
+    assert pool.stats()["timeouts"] == 1
+
+    # A checkin wakes a waiter before its timeout runs out
+    pool.checkout_timeout = 5.0
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.checkout()))
+    waiter.start()
+    pool.checkin(held)
+    waiter.join(timeout=1.0)
+    assert got and got[0] is held
+
+
+def test_shutdown_quits_idle_drivers_and_refuses_checkouts(monkeypatch):
+    pool, launched = fake_pool(monkeypatch, size=2)
+    pool.warm()
+    assert len(launched) == 2 and pool.stats()["idle"] == 2
+    pool.shutdown()
+    assert all(driver.quit_called for driver in launched)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
@@ -0,0 +1,223 @@
+import csv
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from .content_store import url_hash
+
+PMC_ID_PATTERN = re.compile(r'PMC\d+', re.IGNORECASE)
+
+# Title cues used to derive an article type when the CSV has no Type column
+TYPE_PATTERNS = [
+    ("Correction", re.compile(r'\b(erratum|correction|corrigendum)\b', re.IGNORECASE)),
+    ("Editorial", re.compile(r'^editorial\b', re.IGNORECASE)),
+    ("Review", re.compile(r'\b(review|overview|state of the art)\b', re.IGNORECASE)),
+    ("Perspective", re.compile(r'\b(perspectives?|roadmap|white paper|commentary)\b', re.IGNORECASE)),
+]
+
+SORT_KEYS = {
+    "id": lambda record: record.id,
+    "title": lambda record: record.title.lower(),
+    "type": lambda record: record.type,
+}
+
+
+def normalize_title(title):
+    """Lowercase a title and strip punctuation/extra whitespace for lookups"""
+    title = re.sub(r'[^\w\s]', ' ', title.lower())
+    return re.sub(r'\s+', ' ', title).strip()
+
+
+def classify_article_type(title):
+    """Derive a coarse publication type from the title"""
+    for article_type, pattern in TYPE_PATTERNS:
+        if pattern.search(title):
+            return article_type
+    return "Research Article"
+
+
+class Article:
+    """
+    Compact record for one row of the publication CSV. `id` is the row index;
+    `key` hashes the link, so it stays with the article when rows move.
+    """
+    __slots__ = ("id", "title", "link", "pmc_id", "type", "key")
+
+    def __init__(self, article_id, title, link, pmc_id, article_type="Research Article"):
+        self.id = article_id
+        self.title = title
+        self.link = link
+        self.pmc_id = pmc_id
+        self.type = article_type
+        self.key = url_hash(link)
+
+    def to_dict(self):
+        return {"id": self.id, "title": self.title, "link": self.link, "type": self.type}
+
+
+class _Snapshot:
+    """Immutable view of the catalog as loaded from one version of the CSV"""
+    __slots__ = ("records", "listing", "normalized_titles", "by_pmc", "by_title", "by_key", "type_counts",
+                 "sort_orders", "mtime", "version", "digest")
+
+    def __init__(self, records, mtime, version, digest=""):
+        self.records = records
+        self.listing = [record.to_dict() for record in records]
+        self.normalized_titles = [normalize_title(record.title) for record in records]
+        self.by_pmc = {}
+        self.by_title = {}
+        self.by_key = {}
+        for record, normalized in zip(records, self.normalized_titles):
+            if record.pmc_id:
+                self.by_pmc.setdefault(record.pmc_id, record)
+            self.by_title.setdefault(normalized, record)
+            self.by_key.setdefault(record.key, record)
+        self.type_counts = Counter(record.type for record in records).most_common()
+        self.sort_orders = {}
+        self.mtime = mtime
+        self.version = version
+        self.digest = digest
+
+    def sorted_ids(self, sort):
+        """Record ids ordered by `sort` ("title", "-type", ...), computed once per snapshot"""
+        order = self.sort_orders.get(sort)
+        if order is None:
+            key = SORT_KEYS[sort.lstrip("-")]
+            order = [record.id for record in sorted(self.records, key=key, reverse=sort.startswith("-"))]
+            self.sort_orders[sort] = order
+        return order
+
+
+class ArticleCatalog:
+    """
+    In-memory publication catalog built from SB_publication_PMC.csv.
+
+    The CSV is parsed once and re-parsed only when its mtime changes. The
+    mtime is checked at most every `check_interval` seconds so lookups stay
+    O(1) without a stat() per request.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._snapshot = _Snapshot((), None, 0)
+        self.reload()
+
+    def _read_rows(self):
+        """Parse the CSV, returning the records and a digest of the raw file"""
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        records = []
+        reader = csv.DictReader(raw.decode("utf-8-sig").splitlines())
+        for idx, row in enumerate(reader):
+            title = row["Title"]
+            link = row["Link"]
+            match = PMC_ID_PATTERN.search(link)
+            # The Type column is optional; type falls back to title cues
+            records.append(Article(
+                idx,
+                title,
+                link,
+                match.group(0).upper() if match else None,
+                (row.get("Type") or "").strip() or classify_article_type(title),
+            ))
+        return tuple(records), hashlib.sha1(raw).hexdigest()[:16]
+
+    def reload(self):
+        """Re-parse the CSV unconditionally"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+                records, digest = self._read_rows()
+            except Exception as e:
+                print(f"Error loading CSV: {e}")
+                return self._snapshot
+            self._snapshot = _Snapshot(records, mtime, self._snapshot.version + 1, digest)
+            self._last_check = time.monotonic()
+            print(f"✓ Loaded {len(records)} articles from {self.path} (version {self._snapshot.version})")
+            return self._snapshot
+
+    def _current(self):
+        """Return the live snapshot, reloading first if the CSV has changed"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return self._snapshot
+        self._last_check = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return self._snapshot
+        if mtime != self._snapshot.mtime:
+            return self.reload()
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._current().version
+
+    @property
+    def digest(self):
+        """Content hash of the loaded CSV; stable across restarts, used for ETags"""
+        return self._current().digest
+
+    def __len__(self):
+        return len(self._current().records)
+
+    def all(self):
+        return self._current().records
+
+    def listing(self):
+        """Pre-built listing dicts for every article, in CSV order"""
+        return self._current().listing
+
+    def types(self):
+        """`[(type, count)]` over the whole catalog, most common first"""
+        return self._current().type_counts
+
+    def get(self, article_id):
+        records = self._current().records
+        if 0 <= article_id < len(records):
+            return records[article_id]
+        return None
+
+    def get_by_pmc_id(self, pmc_id):
+        return self._current().by_pmc.get(pmc_id.upper())
+
+    def get_by_key(self, key):
+        return self._current().by_key.get(key)
+
+    def get_by_title(self, title):
+        return self._current().by_title.get(normalize_title(title))
+
+    def query(self, q=None, prefix=None, article_type=None, sort="id"):
+        """
+        Filter and sort the catalog, returning the matching listing dicts.
+
+        `q` is a case-insensitive substring of the title and `prefix` a
+        title prefix. `sort` is one of SORT_KEYS, optionally prefixed with
+        "-" for descending order.
+        """
+        snapshot = self._current()
+        if sort.lstrip("-") not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        q = normalize_title(q) if q else None
+        prefix = normalize_title(prefix) if prefix else None
+        article_type = article_type.lower() if article_type else None
+
+        results = []
+        for article_id in snapshot.sorted_ids(sort):
+            record = snapshot.records[article_id]
+            normalized = snapshot.normalized_titles[article_id]
+            if q and q not in normalized:
+                continue
+            if prefix and not normalized.startswith(prefix):
+                continue
+            if article_type and record.type.lower() != article_type:
+                continue
+            results.append(snapshot.listing[article_id])
+        return results
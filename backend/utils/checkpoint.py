@@ -0,0 +1,42 @@
+import json
+import os
+import threading
+import time
+
+
+class Checkpoint:
+    """
+    Failed attempts per article in a JSON file, rewritten atomically after
+    every finished article. Finished work is not listed: callers skip it by
+    checking their own store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {"failures": {}}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state.update(json.load(f))
+        # Written by earlier versions
+        self.state.pop("completed", None)
+
+    def attempts(self, article_id):
+        return self.state["failures"].get(str(article_id), {}).get("attempts", 0)
+
+    def record(self, article_id, error=None):
+        with self._lock:
+            if error is None:
+                self.state["failures"].pop(str(article_id), None)
+            else:
+                failure = self.state["failures"].setdefault(str(article_id), {"attempts": 0})
+                failure["attempts"] += 1
+                failure["error"] = error[:300]
+            self.state["updated_at"] = time.time()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_path, self.path)
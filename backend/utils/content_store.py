@@ -0,0 +1,248 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .encoding import EncodedPayload, MIN_COMPRESS_BYTES, brotli, dumps, gzip_bytes, loads
+
+
+DEFAULT_STORE_PATH = "cache/articles.sqlite3"
+
+
+def url_hash(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+class LRUCache:
+    """In-memory LRU bounded by the total byte size of its entries"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, value, size, expires_at):
+        with self._lock:
+            self._pop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def pop_matching(self, predicate):
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._pop(key)
+
+
+class ArticleStore:
+    """
+    Two-tier store for fetched article content.
+
+    Entries are keyed by a hash of the source URL, so they follow an
+    article when CSV rows are inserted or reordered, and a changed link
+    never serves the old article. The article id is kept alongside for
+    reporting; a hit stored under an older id is re-stamped instead of
+    refetched. The hot tier is a byte-bounded LRU of pre-encoded payloads;
+    the cold tier is a SQLite table of gzip-compressed JSON that survives
+    restarts. Both tiers keep the bytes a response needs, so a hit is
+    served without re-encoding. Both tiers honour the same TTL.
+    """
+
+    def __init__(self, path, memory_budget_bytes=64 * 1024 * 1024, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.memory = LRUCache(memory_budget_bytes)
+        self.stats_counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "writes": 0}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS article_content (
+                url_hash TEXT PRIMARY KEY,
+                article_id INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self._migrate()
+        self._db.commit()
+
+    def _migrate(self):
+        """Move rows from the old `articles` table, which was keyed by (article_id, url_hash)"""
+        exists = self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles'").fetchone()
+        if exists:
+            self._db.execute("""
+                INSERT OR REPLACE INTO article_content
+                SELECT url_hash, article_id, stored_at, expires_at, size, payload FROM articles ORDER BY stored_at
+            """)
+            self._db.execute("DROP TABLE articles")
+
+    def _count(self, counter):
+        with self._lock:
+            self.stats_counters[counter] += 1
+
+    def get(self, url, article_id=None):
+        """Return the stored response for an article, or None if missing/expired"""
+        payload = self.get_encoded(url, article_id)
+        return loads(payload.identity) if payload is not None else None
+
+    def get_encoded(self, url, article_id=None):
+        """
+        The stored response as an EncodedPayload, or None if missing/expired.
+        If `article_id` differs from the id the entry was stored under (the
+        CSV row moved), the payload's "id" is rewritten and stored again.
+        """
+        key = url_hash(url)
+        now = time.time()
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            (value, stored_id), _, expires_at = entry
+            if expires_at > now:
+                self._count("memory_hits")
+                return self._restamp(url, value, stored_id, article_id, expires_at)
+            self.memory.pop(key)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT article_id, expires_at, size, payload FROM article_content WHERE url_hash = ?", (key,),
+            ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        stored_id, expires_at, size, blob = row
+        if expires_at <= now:
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        payload = _payload_from_blob(blob, size)
+        self.memory.put(key, (payload, stored_id), payload.size, expires_at)
+        self._count("disk_hits")
+        return self._restamp(url, payload, stored_id, article_id, expires_at)
+
+    def _restamp(self, url, payload, stored_id, article_id, expires_at):
+        if article_id is None or article_id == stored_id:
+            return payload
+        value = loads(payload.identity)
+        value["id"] = article_id
+        return self.put(url, value, article_id, ttl_seconds=expires_at - time.time())
+
+    def is_fresh(self, url):
+        """True if a non-expired entry exists, without touching hit counters"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM article_content WHERE url_hash = ? AND expires_at > ?",
+                (url_hash(url), time.time()),
+            ).fetchone()
+        return row is not None
+
+    def put(self, url, value, article_id, ttl_seconds=None):
+        """Store `value` for `url` and return it as an EncodedPayload"""
+        key = url_hash(url)
+        now = time.time()
+        expires_at = now + (ttl_seconds or self.ttl_seconds)
+        raw = dumps(value)
+        payload = EncodedPayload.from_raw(raw, keep_identity=False)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO article_content VALUES (?, ?, ?, ?, ?, ?)",
+                (key, article_id, now, expires_at, len(raw), payload.gzip or gzip_bytes(raw)),
+            )
+            self._db.commit()
+            self.stats_counters["writes"] += 1
+        self.memory.put(key, (payload, article_id), payload.size, expires_at)
+        return payload
+
+    def invalidate(self, url=None):
+        """Drop one article's entry (or everything when url is None) from both tiers"""
+        with self._lock:
+            if url is None:
+                removed = self._db.execute("DELETE FROM article_content").rowcount
+            else:
+                removed = self._db.execute("DELETE FROM article_content WHERE url_hash = ?", (url_hash(url),)).rowcount
+            self._db.commit()
+        if url is None:
+            self.memory.pop_matching(lambda key: True)
+        else:
+            self.memory.pop(url_hash(url))
+        return removed
+
+    def iter_fresh(self):
+        """Yield `(article_id, url_hash, value)` for every non-expired entry on disk"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT article_id, url_hash, payload FROM article_content WHERE expires_at > ?", (time.time(),)
+            ).fetchall()
+        for article_id, link_hash, blob in rows:
+            yield article_id, link_hash, loads(gzip.decompress(blob))
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.stats_counters)
+            disk_entries, disk_bytes, disk_raw_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), COALESCE(SUM(size), 0) FROM article_content"
+            ).fetchone()
+        lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round((counters["memory_hits"] + counters["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
+            "memory_budget_bytes": self.memory.max_bytes,
+            "memory_evictions": self.memory.evictions,
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_uncompressed_bytes": disk_raw_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _payload_from_blob(blob, size):
+    """EncodedPayload for a disk row; the gzip bytes are reused as-is when possible"""
+    if brotli is not None or size < MIN_COMPRESS_BYTES:
+        return EncodedPayload.from_raw(gzip.decompress(blob), keep_identity=False)
+    return EncodedPayload(gzip=blob, raw_size=size)
+
+
+def open_article_store():
+    """ArticleStore configured from ARTICLE_STORE_PATH / ARTICLE_CACHE_MB / ARTICLE_CACHE_TTL_DAYS"""
+    return ArticleStore(
+        os.getenv("ARTICLE_STORE_PATH", DEFAULT_STORE_PATH),
+        memory_budget_bytes=int(os.getenv("ARTICLE_CACHE_MB", "64")) * 1024 * 1024,
+        ttl_seconds=int(os.getenv("ARTICLE_CACHE_TTL_DAYS", "30")) * 24 * 3600,
+    )
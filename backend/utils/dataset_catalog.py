@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from .encoding import EncodedPayload, dumps
+from .pipeline import bounded_map, timing_summary
+
+DEFAULT_SNAPSHOT_PATH = "cache/osdr_datasets.json"
+SAVE_EVERY = 100
+
+
+def dataset_record(dataset_id, data):
+    """The summary record /api/datasets/bulk serves for one OSDR dataset response"""
+    dataset_key = list(data.keys())[0]
+    dataset = data[dataset_key]
+    metadata = dataset.get('metadata', {})
+
+    return {
+        "accession": dataset_id,
+        "title": metadata.get("study title", dataset_id),
+        "description": metadata.get("study description", "No description available"),
+        "organism": metadata.get("organism", "N/A"),
+        "material": metadata.get("material type", "N/A"),
+        "factor": metadata.get("study factor name", "N/A"),
+        "funding": metadata.get("study funding agency", "N/A"),
+        "publication": metadata.get("study publication title", "N/A")
+    }
+
+
+def dataset_index(response):
+    """
+    `{dataset_id: entry}` from an OSDR /datasets/ response. Raises on an error
+    status or an unexpected body, so an outage page is never taken for an
+    index (which would drop every known dataset).
+    """
+    response.raise_for_status()
+    if response.status_code != 200:
+        raise ValueError(f"Unexpected status {response.status_code} from the dataset index")
+    index = response.json()
+    if not isinstance(index, dict) or not all(isinstance(entry, dict) for entry in index.values()):
+        raise ValueError("Dataset index is not an object of dataset entries")
+    return index
+
+
+def placeholder_record(dataset_id):
+    return {
+        "accession": dataset_id,
+        "title": dataset_id,
+        "description": "Error loading details",
+        "organism": "N/A",
+        "material": "N/A",
+        "factor": "N/A",
+        "funding": "N/A",
+        "publication": "N/A"
+    }
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class DatasetSnapshot:
+    """
+    Persisted snapshot of every OSDR dataset's bulk record.
+
+    `refresh()` reads the dataset index and fetches only datasets that are
+    new, whose index entry changed, whose last fetch failed, or whose copy
+    is older than `max_age` (revalidated with If-None-Match /
+    If-Modified-Since). Removed datasets are dropped. The snapshot is
+    written atomically to a JSON file, so it survives restarts, and its
+    serialized forms are rebuilt only when the records change.
+    """
+
+    def __init__(self, path, max_age=7 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.entries = {}
+        self.order = []
+        self.refreshed_at = None
+        self.last_refresh = {}
+        self._lock = asyncio.Lock()
+        self._views = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                self.entries = state.get("entries", {})
+                self.order = state.get("order", list(self.entries))
+                self.refreshed_at = state.get("refreshed_at")
+            except (OSError, ValueError) as e:
+                print(f"⚠ Ignoring unreadable dataset snapshot {path}: {e}")
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def refreshing(self):
+        return self._lock.locked()
+
+    def age(self):
+        return time.time() - self.refreshed_at if self.refreshed_at else None
+
+    def records(self):
+        return self._records
+
+    def _rebuild(self):
+        self._records = [self.entries[dataset_id]["record"] for dataset_id in self.order
+                         if dataset_id in self.entries and self.entries[dataset_id].get("record")]
+        self._views = {}
+        self.etag = f'W/"{_digest(self._records)}"'
+
+    def json_payload(self):
+        """The records as one JSON array, serialized and compressed once per snapshot version"""
+        if "json" not in self._views:
+            self._views["json"] = EncodedPayload.from_raw(dumps(self._records))
+        return self._views["json"]
+
+    def ndjson_payload(self):
+        """One dataset per line plus a closing summary line, encoded once per snapshot version"""
+        if "ndjson" not in self._views:
+            lines = [dumps({"type": "dataset", "data": record}) for record in self._records]
+            lines.append(dumps({"type": "summary", "source": "snapshot", "returned": len(self._records),
+                                "refreshed_at": self.refreshed_at}))
+            self._views["ndjson"] = EncodedPayload.from_raw(b"\n".join(lines) + b"\n")
+        return self._views["ndjson"]
+
+    def _stale(self, dataset_id, index_hash, now, full):
+        entry = self.entries.get(dataset_id)
+        if entry is None or not entry.get("ok") or entry.get("index_hash") != index_hash:
+            return True
+        return full or now - entry.get("fetched_at", 0) > self.max_age
+
+    async def _fetch(self, client, api, dataset_id):
+        previous = self.entries.get(dataset_id) or {}
+        headers = {}
+        if previous.get("ok"):
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+        response = await client.get(f"{api}/dataset/{dataset_id}/", headers=headers)
+        if response.status_code == 304:
+            return None
+        # Transient upstream errors keep the previous record; anything else drops it
+        if response.status_code >= 500:
+            response.raise_for_status()
+        if response.status_code != 200:
+            return {"record": None, "ok": False}
+        return {
+            "record": dataset_record(dataset_id, response.json()),
+            "ok": True,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        }
+
+    async def refresh(self, client, api, concurrency=16, full=False):
+        """Bring the snapshot up to date with the upstream index; returns a summary"""
+        async with self._lock:
+            started = time.perf_counter()
+            index = dataset_index(await client.get(f"{api}/datasets/"))
+            now = time.time()
+            index_hashes = {dataset_id: _digest(value) for dataset_id, value in index.items()}
+            removed = [dataset_id for dataset_id in self.entries if dataset_id not in index]
+            for dataset_id in removed:
+                del self.entries[dataset_id]
+            wanted = [dataset_id for dataset_id, index_hash in index_hashes.items()
+                      if self._stale(dataset_id, index_hash, now, full)]
+
+            counts = {"added": 0, "changed": 0, "unchanged": 0, "failed": 0}
+            timings = []
+            async for dataset_id, result, elapsed in bounded_map(
+                    wanted, lambda dataset_id: self._fetch(client, api, dataset_id), concurrency):
+                timings.append((elapsed, dataset_id))
+                previous = self.entries.get(dataset_id)
+                if isinstance(result, Exception):
+                    result = {"record": previous["record"] if previous and previous.get("record")
+                              else placeholder_record(dataset_id), "ok": False}
+                if result is None or (previous and previous.get("record") == result["record"] and result["ok"]):
+                    counts["unchanged"] += 1
+                    result = {**previous, **(result or {})}
+                elif not result["ok"]:
+                    counts["failed"] += 1
+                else:
+                    counts["changed" if previous else "added"] += 1
+                self.entries[dataset_id] = {**result, "index_hash": index_hashes[dataset_id], "fetched_at": time.time()}
+                if len(timings) % SAVE_EVERY == 0:
+                    # Checkpoint long refreshes so a restart resumes instead of starting over
+                    await asyncio.to_thread(self._save, self._state())
+
+            self.order = list(index)
+            self.refreshed_at = time.time()
+            self._rebuild()
+            await asyncio.to_thread(self._save, self._state())
+
+            self.last_refresh = {
+                **counts,
+                "removed": len(removed),
+                "checked": len(wanted),
+                "datasets": len(self._records),
+                "full": full,
+                "finished_at": self.refreshed_at,
+                **timing_summary(timings, time.perf_counter() - started),
+            }
+            return self.last_refresh
+
+    def _state(self):
+        return {"entries": self.entries, "order": self.order, "refreshed_at": self.refreshed_at}
+
+    def _save(self, state):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        age = self.age()
+        return {
+            "path": self.path,
+            "datasets": len(self._records),
+            "refreshed_at": self.refreshed_at,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "refreshing": self.refreshing,
+            "last_refresh": self.last_refresh,
+        }
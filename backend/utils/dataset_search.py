@@ -0,0 +1,99 @@
+import re
+from collections import Counter
+
+from .search_index import SearchIndex
+
+# Record fields exposed as facets (see dataset_record)
+FACET_FIELDS = ("organism", "material", "factor", "funding")
+MISSING_VALUES = {"", "n/a", "na", "none"}
+VALUE_SEPARATOR = re.compile(r'\s*[;,]\s*')
+
+
+def facet_values(value):
+    """Distinct facet terms of one record field; OSDR packs several values into one string"""
+    items = value if isinstance(value, list) else VALUE_SEPARATOR.split(str(value))
+    seen = {}
+    for item in items:
+        item = str(item).strip()
+        if item.lower() not in MISSING_VALUES:
+            seen.setdefault(item.lower(), item)
+    return seen
+
+
+class DatasetSearch:
+    """
+    Faceted search over the dataset snapshot records.
+
+    Built once per snapshot version: every facet field gets an inverted
+    index `value -> set of record positions`, and accessions, titles and
+    descriptions go into a BM25 SearchIndex. Values within one facet are OR'd, facets are
+    AND'd, and facet counts are disjunctive (each facet is counted against
+    the other facets' filters) so the UI can show alternatives.
+    """
+
+    def __init__(self, records, version=None):
+        self.records = records
+        self.version = version
+        self.text = SearchIndex(field_weights={"accession": 3.0, "title": 3.0, "description": 1.0})
+        self.facets = {field: {} for field in FACET_FIELDS}
+        self.labels = {field: {} for field in FACET_FIELDS}
+        self.doc_facets = []
+        for position, record in enumerate(records):
+            self.text.add(position, "accession", str(record.get("accession", "")))
+            self.text.add(position, "title", str(record.get("title", "")))
+            self.text.add(position, "description", str(record.get("description", "")))
+            keys = {}
+            for field in FACET_FIELDS:
+                values = facet_values(record.get(field, ""))
+                for key, label in values.items():
+                    self.facets[field].setdefault(key, set()).add(position)
+                    self.labels[field].setdefault(key, label)
+                keys[field] = tuple(values)
+            self.doc_facets.append(keys)
+
+    def _facet_matches(self, field, values):
+        matches = set()
+        for value in values:
+            matches |= self.facets[field].get(value.strip().lower(), set())
+        return matches
+
+    def search(self, q="", filters=None, offset=0, limit=25, facet_limit=20):
+        filters = {field: values for field, values in (filters or {}).items() if values}
+        unknown = set(filters) - set(FACET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown facet(s): {', '.join(sorted(unknown))}")
+
+        if q.strip():
+            ranked = self.text.search(q, limit=len(self.records) or 1)
+            scores = dict(ranked)
+            text_matches = set(scores)
+        else:
+            scores = {}
+            text_matches = set(range(len(self.records)))
+
+        facet_matches = {field: self._facet_matches(field, values) for field, values in filters.items()}
+        matched = set(text_matches)
+        for positions in facet_matches.values():
+            matched &= positions
+
+        facet_counts = {}
+        for field in FACET_FIELDS:
+            base = set(text_matches)
+            for other, positions in facet_matches.items():
+                if other != field:
+                    base &= positions
+            counts = Counter(key for position in base for key in self.doc_facets[position][field])
+            facet_counts[field] = [{"value": self.labels[field][key], "count": count}
+                                   for key, count in counts.most_common(facet_limit)]
+
+        if scores:
+            ordered = sorted(matched, key=lambda position: (-scores[position], position))
+        else:
+            ordered = sorted(matched)
+        results = []
+        for position in ordered[offset:offset + limit]:
+            result = dict(self.records[position])
+            if scores:
+                result["score"] = round(scores[position], 4)
+            results.append(result)
+        return {"total": len(ordered), "results": results, "facets": facet_counts}
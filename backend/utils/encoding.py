@@ -0,0 +1,129 @@
+import gzip
+import json
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pip install orjson
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pip install brotli
+    brotli = None
+
+# Payloads smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+def dumps(value):
+    """Compact JSON bytes; orjson when installed (several times faster), else the stdlib"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def gzip_bytes(raw):
+    # mtime=0 keeps the output (and anything hashed from it) deterministic
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with `dumps`"""
+
+    def render(self, content):
+        return dumps(content)
+
+
+class EncodedPayload:
+    """
+    A response body serialized once and stored in every encoding a client
+    may ask for. `identity` can be dropped to save memory; it is then
+    recovered from the gzip copy for the rare client that wants it plain.
+    """
+    __slots__ = ("_identity", "gzip", "br", "raw_size")
+
+    def __init__(self, identity=None, gzip=None, br=None, raw_size=None):
+        self._identity = identity
+        self.gzip = gzip
+        self.br = br
+        self.raw_size = raw_size if raw_size is not None else len(identity or b"")
+
+    @classmethod
+    def from_raw(cls, raw, keep_identity=True):
+        if len(raw) < MIN_COMPRESS_BYTES:
+            return cls(identity=raw)
+        br = brotli.compress(raw, quality=5) if brotli is not None else None
+        return cls(identity=raw if keep_identity else None, gzip=gzip_bytes(raw), br=br, raw_size=len(raw))
+
+    @classmethod
+    def from_value(cls, value, keep_identity=True):
+        return cls.from_raw(dumps(value), keep_identity=keep_identity)
+
+    @property
+    def identity(self):
+        if self._identity is not None:
+            return self._identity
+        return gzip.decompress(self.gzip)
+
+    @property
+    def size(self):
+        return sum(len(body) for body in (self._identity, self.gzip, self.br) if body)
+
+    def select(self, accept_encoding):
+        """
+        `(body, content_encoding)` for an Accept-Encoding header value: the
+        stored coding with the highest q-value, brotli on a tie, else the
+        plain body. `q=0` refuses a coding.
+        """
+        weights = accepted_encodings(accept_encoding)
+        best, best_q = None, 0.0
+        for coding, body in (("br", self.br), ("gzip", self.gzip)):
+            q = weights.get(coding, weights.get("*", 0.0))
+            if body is not None and q > best_q:
+                best, best_q = coding, q
+        if best is None:
+            return self.identity, None
+        return getattr(self, best), best
+
+
+def accepted_encodings(accept_encoding):
+    """`{coding: q}` from an Accept-Encoding header; a malformed q counts as 0"""
+    weights = {}
+    for token in (accept_encoding or "").split(","):
+        coding, *params = token.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def encoded_response(request, payload, status_code=200, headers=None, media_type="application/json"):
+    """Serve stored bytes in the best encoding the client accepts, without re-encoding"""
+    body, content_encoding = payload.select(request.headers.get("accept-encoding") if request else None)
+    headers = dict(headers or {})
+    if payload.gzip is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+def sse_event(event, data):
+    """One server-sent event with a JSON payload"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"
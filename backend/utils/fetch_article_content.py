@@ -1,12 +1,18 @@
+import asyncio
 from .fetch_article_selenium import fetch_article_html
-from .fetch_article_requests import fetch_article_with_requests
+from .fetch_article_requests import fetch_article_with_requests, fetch_article_with_httpx
+from .fetch_article_jats import fetch_article_from_mirror
 
 def fetch_article_content(url):
     """
-    Smart fetching: Use Selenium for PMC articles to get images/tables
+    Smart fetching: Use the local JATS mirror or Selenium for PMC articles to get images/tables
     """
     # PMC articles need Selenium for proper image/table extraction
     if 'ncbi.nlm.nih.gov/pmc' in url:
+        # A local JATS copy (PMC_MIRROR_DIR) is parsed in milliseconds, no browser needed
+        mirrored = fetch_article_from_mirror(url)
+        if mirrored is not None:
+            return mirrored
         try:
             return fetch_article_html(url)
         except Exception as e:
@@ -27,3 +33,58 @@ def fetch_article_content(url):
         return fetch_article_html(url)
     except Exception as e:
         return {"content": f"<p>Error fetching article: {e}</p>", "tables": []}
+
+
+def is_fetch_error(content):
+    """Fetchers report failures as an error paragraph rather than raising"""
+    return not content or content.startswith("<p>Error")
+
+def build_article_response(article, result):
+    """Shape a fetch result (string or {"content", "tables"}) into the /articles/{id} payload"""
+    # Handle both string and dict responses
+    if isinstance(result, dict):
+        content = result.get("content", "")
+        tables = result.get("tables", [])
+    else:
+        content = result
+        tables = []
+    
+    return {
+        "id": article.id,
+        "title": article.title,
+        "link": article.link,
+        "content": content,
+        "tables": tables
+    }
+
+async def fetch_article_content_async(url, client, limiter):
+    """
+    Non-blocking fetch_article_content: static pages go through `client`
+    (an httpx.AsyncClient or UpstreamClient), Selenium work runs in a worker thread, and per-host
+    politeness is enforced by `limiter` instead of sleeping in the request.
+    """
+    if 'ncbi.nlm.nih.gov/pmc' in url:
+        mirrored = await asyncio.to_thread(fetch_article_from_mirror, url)
+        if mirrored is not None:
+            return mirrored
+        try:
+            async with limiter.slot(url):
+                return await asyncio.to_thread(fetch_article_html, url)
+        except Exception as e:
+            return {"content": f"<p>Error fetching article: {e}</p>", "tables": []}
+    
+    try:
+        async with limiter.slot(url):
+            result = await fetch_article_with_httpx(url, client)
+        content = result.get("content", "")
+        if content and "could not be extracted" not in content.lower() and "error fetching" not in content.lower() and len(content) > 500:
+            return result
+    except Exception:
+        pass
+    
+    # Fallback to Selenium
+    try:
+        async with limiter.slot(url):
+            return await asyncio.to_thread(fetch_article_html, url)
+    except Exception as e:
+        return {"content": f"<p>Error fetching article: {e}</p>", "tables": []}
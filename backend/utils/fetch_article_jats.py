@@ -0,0 +1,291 @@
+import glob
+import gzip
+import html
+import io
+import os
+import re
+import tarfile
+import xml.etree.ElementTree as ET
+
+XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+PMC_ID_PATTERN = re.compile(r'PMC\d+', re.IGNORECASE)
+IMAGE_EXTENSION = re.compile(r'\.(jpe?g|png|gif|tiff?)$', re.IGNORECASE)
+
+# Elements rendered as a whole when they close; their children are not emitted separately
+CONTAINERS = {"fig", "table-wrap", "list", "disp-quote"}
+# Subtrees that carry no article prose
+SKIPPED = {"ref-list", "back", "fn-group", "ack", "supplementary-material", "funding-group", "author-notes"}
+
+
+def mirror_dir():
+    return os.getenv("PMC_MIRROR_DIR", "")
+
+
+def pmc_id_from_url(url):
+    match = PMC_ID_PATTERN.search(url)
+    return match.group(0).upper() if match else None
+
+
+def find_jats_source(pmc_id, directory=None):
+    """
+    Locate a JATS file for `pmc_id` in the mirror. Accepts PMC123.nxml / .xml
+    (optionally .gz), an extracted OA package directory PMC123/*.nxml, or an
+    OA package tarball PMC123.tar.gz.
+    """
+    directory = directory or mirror_dir()
+    if not directory or not pmc_id:
+        return None
+    for suffix in (".nxml", ".xml", ".nxml.gz", ".xml.gz", ".tar.gz"):
+        path = os.path.join(directory, pmc_id + suffix)
+        if os.path.isfile(path):
+            return path
+    package = sorted(glob.glob(os.path.join(directory, pmc_id, "*.nxml")))
+    return package[0] if package else None
+
+
+def has_mirror_copy(url):
+    return find_jats_source(pmc_id_from_url(url)) is not None
+
+
+def _open_source(path):
+    if path.endswith(".tar.gz"):
+        with tarfile.open(path, "r:gz") as archive:
+            for member in archive:
+                if member.name.endswith(".nxml"):
+                    return io.BytesIO(archive.extractfile(member).read())
+        raise FileNotFoundError(f"No .nxml file in {path}")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _clean(text):
+    return html.escape(re.sub(r'\s+', ' ', text).strip())
+
+
+def _text(element):
+    return _clean("".join(element.itertext()))
+
+
+def _caption_text(caption):
+    """Caption title and paragraphs are separate blocks; keep them apart"""
+    blocks = [_text(child) for child in caption] or [_text(caption)]
+    return " ".join(block for block in blocks if block)
+
+
+def _figure_html(fig, pmc_id):
+    graphic = fig.find(".//graphic")
+    href = graphic.get(XLINK_HREF) if graphic is not None else None
+    if not href:
+        return ""
+    if not IMAGE_EXTENSION.search(href):
+        href += ".jpg"
+    src = href if href.startswith("http") else f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/bin/{href}"
+    label = fig.find("label")
+    caption = fig.find("caption")
+    caption_text = " ".join(part for part in (
+        _text(label) if label is not None else "",
+        _caption_text(caption) if caption is not None else "",
+    ) if part)
+    alt = html.escape(_text(label) if label is not None else "", quote=True)
+    img_html = f'''
+    <div style="text-align: center; margin: 20px 0;">
+        <img src="{src}" alt="{alt}" title="{alt}"
+             style="max-width: 100%; height: auto; border: 1px solid #ddd; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+    </div>
+    '''
+    if caption_text:
+        return f'''
+        <figure style="margin: 25px 0; text-align: center;">
+            {img_html}
+            <figcaption style="font-size: 0.9em; color: #555; margin-top: 10px; font-style: italic; max-width: 80%; margin-left: auto; margin-right: auto;">
+                {caption_text}
+            </figcaption>
+        </figure>
+        '''
+    return f'<figure style="margin: 25px 0;">{img_html}</figure>'
+
+
+def _table(table_wrap):
+    """Return (html, structured table) for a <table-wrap>"""
+    label = table_wrap.find("label")
+    caption = table_wrap.find("caption")
+    headers = [_text(th) for th in table_wrap.iter("th")]
+    rows = []
+    for tr in table_wrap.iter("tr"):
+        cells = [_text(td) for td in tr.findall("td")]
+        if cells:
+            rows.append(cells)
+    record = {
+        "label": _text(label) if label is not None else "",
+        "caption": _caption_text(caption) if caption is not None else "",
+        "headers": headers,
+        "rows": rows,
+    }
+
+    parts = []
+    title = " ".join(part for part in (record["label"], record["caption"]) if part)
+    if title:
+        parts.append(f"<p style='font-weight: 600; margin: 20px 0 5px 0;'>{title}</p>")
+    parts.append("<div style='overflow-x: auto; margin: 20px 0;'><table style='border-collapse: collapse; width: 100%; border: 1px solid #ddd;'>")
+    if headers:
+        parts.append("<thead style='background-color: #f3f4f6;'><tr>")
+        parts.extend(f"<th style='border: 1px solid #ddd; padding: 12px; text-align: left;'>{text}</th>" for text in headers)
+        parts.append("</tr></thead>")
+    parts.append("<tbody>")
+    for cells in rows:
+        parts.append("<tr>")
+        parts.extend(f"<td style='border: 1px solid #ddd; padding: 12px;'>{text}</td>" for text in cells)
+        parts.append("</tr>")
+    parts.append("</tbody></table></div>")
+    return "".join(parts), record
+
+
+def _list_html(list_element):
+    tag = "ol" if list_element.get("list-type") in ("order", "alpha-lower", "alpha-upper", "roman-lower", "roman-upper") else "ul"
+    items = [_text(item) for item in list_element.findall("list-item")]
+    items = "".join(f"<li style='margin: 5px 0;'>{text}</li>" for text in items if text)
+    return f"<{tag} style='margin: 15px 0; padding-left: 30px;'>{items}</{tag}>" if items else ""
+
+
+def _block_html(element, pmc_id, tables):
+    """HTML for a container element; table records are appended to `tables`"""
+    if element.tag == "fig":
+        return _figure_html(element, pmc_id)
+    if element.tag == "table-wrap":
+        table_html, record = _table(element)
+        tables.append(record)
+        return table_html
+    if element.tag == "list":
+        return _list_html(element)
+    text = _text(element)
+    if text and len(text) > 20:
+        return f"<blockquote style='border-left: 4px solid #ccc; padding-left: 20px; margin: 20px 0; font-style: italic;'>{text}</blockquote>"
+    return ""
+
+
+def _flatten(element, pieces):
+    """Text of `element` as strings, with nested container elements kept whole"""
+    if element.text:
+        pieces.append(element.text)
+    for child in element:
+        if child.tag in CONTAINERS:
+            pieces.append(child)
+        elif child.tag not in SKIPPED:
+            _flatten(child, pieces)
+        if child.tail:
+            pieces.append(child.tail)
+
+
+def _paragraph_html(p, pmc_id, tables):
+    """
+    A <p> as HTML. Figures, tables and lists nested in the paragraph (common
+    for <list>) split it, so its text before and after them stays in order.
+    """
+    pieces = []
+    _flatten(p, pieces)
+    if not any(isinstance(piece, ET.Element) for piece in pieces):
+        text = _clean("".join(pieces))
+        return f"<p style='line-height: 1.6; margin: 15px 0;'>{text}</p>" if text and len(text) > 20 else ""
+
+    parts, run = [], []
+    for piece in pieces + [None]:
+        if isinstance(piece, str):
+            run.append(piece)
+            continue
+        text = _clean("".join(run))
+        if text:
+            parts.append(f"<p style='line-height: 1.6; margin: 15px 0;'>{text}</p>")
+        run = []
+        if piece is not None:
+            parts.append(_block_html(piece, pmc_id, tables))
+    return "".join(parts)
+
+
+def _abstract_heading(pending):
+    return "<h2 style='color: #333; margin: 20px 0 10px 0;'>Abstract</h2>" if pending else ""
+
+
+def parse_jats(source, pmc_id):
+    """
+    Stream a JATS document into the `{"content", "tables"}` shape produced by
+    the Selenium extractor. Elements are emitted as they close and cleared
+    right after, so memory stays flat regardless of article size.
+    """
+    parts = []
+    tables = []
+    stack = []
+    sec_depth = 0
+    in_abstract = False
+    abstract_heading_pending = False
+
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            stack.append(tag)
+            if tag == "abstract" and element.get("abstract-type") is None and "body" not in stack:
+                in_abstract = True
+                abstract_heading_pending = True
+            elif tag == "sec":
+                sec_depth += 1
+            continue
+
+        stack.pop()
+        # Containers nested in a paragraph are rendered when the paragraph closes
+        inside_container = any(name in CONTAINERS or name == "p" for name in stack)
+        skipped = any(name in SKIPPED for name in stack) or tag in SKIPPED
+        in_front = "front" in stack and not in_abstract
+
+        if tag == "sec":
+            sec_depth -= 1
+        elif tag == "abstract" and in_abstract:
+            in_abstract = False
+        elif tag in SKIPPED and not inside_container:
+            element.clear()
+            continue
+        elif skipped or in_front or inside_container:
+            continue
+        elif tag == "title" and stack and stack[-1] in ("sec", "abstract"):
+            text = _text(element)
+            if text:
+                if stack[-1] == "abstract":
+                    level = 2
+                    abstract_heading_pending = False
+                else:
+                    level = 3 if in_abstract else min(1 + sec_depth, 6)
+                parts.append(_abstract_heading(abstract_heading_pending and in_abstract))
+                abstract_heading_pending = False
+                parts.append(f"<h{level} style='color: #333; margin: 20px 0 10px 0;'>{text}</h{level}>")
+        elif tag == "p":
+            paragraph_html = _paragraph_html(element, pmc_id, tables)
+            if paragraph_html:
+                parts.append(_abstract_heading(abstract_heading_pending and in_abstract))
+                abstract_heading_pending = False
+                parts.append(paragraph_html)
+        elif tag in CONTAINERS:
+            parts.append(_block_html(element, pmc_id, tables))
+        else:
+            continue
+
+        if not inside_container:
+            element.clear()
+
+    content_html = "".join(parts)
+    return {"content": content_html if content_html else "<p>No readable content found.</p>", "tables": tables}
+
+
+def fetch_article_from_mirror(url):
+    """
+    Build article content from the local PMC JATS mirror (PMC_MIRROR_DIR).
+    Returns None when the article is not mirrored so callers can fall back.
+    """
+    pmc_id = pmc_id_from_url(url)
+    path = find_jats_source(pmc_id)
+    if path is None:
+        return None
+    try:
+        with _open_source(path) as source:
+            return parse_jats(source, pmc_id)
+    except Exception as e:
+        print(f"⚠ Could not parse JATS for {pmc_id} ({path}): {e}")
+        return None
@@ -1,44 +1,28 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup
+import os
 import time
 import random
 import re
+from .webdriver_pool import WebDriverPool
+from .html_extractor import extract_main_content, process_image_selenium, process_figure_selenium
+
+# Shared pool of headless Chrome drivers, launched on first use
+driver_pool = WebDriverPool(
+    size=int(os.getenv("SELENIUM_POOL_SIZE", "2")),
+    max_pages=int(os.getenv("SELENIUM_MAX_PAGES_PER_DRIVER", "50")),
+    checkout_timeout=float(os.getenv("SELENIUM_CHECKOUT_TIMEOUT", "60")),
+)
 
 def fetch_article_html(url):
     """
     Fetch main article content with images using Selenium
     """
     try:
-        # Setup Chrome options - OPTIMIZED FOR SPEED
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-images")  # Faster loading
-        chrome_options.add_argument("--disable-javascript")  # Faster for static content
-        chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # No images
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        # Disable loading of images, CSS, and other resources
-        prefs = {"profile.managed_default_content_settings.images": 2}
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        # Create WebDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Hide webdriver property
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        try:
+        # Reuse a warm browser from the pool instead of launching Chrome per article
+        with driver_pool.driver() as driver:
             # Navigate to URL
             driver.get(url)
             
@@ -65,24 +49,24 @@ def fetch_article_html(url):
             
             # Get page source after cleanup
             page_source = driver.page_source
-            
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Extract main content
-            content_html = extract_main_content_selenium(soup, url)
-            
-            return {"content": content_html, "tables": []}
-            
-        finally:
-            driver.quit()
+        
+        # Parse after the driver is back in the pool so it can serve the next fetch
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Extract main content
+        content_html = extract_main_content(soup, url)
+        
+        return {"content": content_html, "tables": []}
             
     except Exception as e:
         return {"content": f"<p>Error with Selenium: {str(e)}</p>", "tables": []}
 
 def extract_main_content_selenium(soup, base_url):
     """
-    Extract main content with images from Selenium-processed HTML
+    Extract main content with images from Selenium-processed HTML.
+    Reference implementation: fetch_article_html now uses
+    html_extractor.extract_main_content, which must produce the same output
+    (see bench_extractor.py).
     """
     # PMC and general article selectors
     main_selectors = [
@@ -191,70 +175,6 @@ def extract_main_content_selenium(soup, base_url):
     
     return content_html if content_html else "<p>No readable content found.</p>"
 
-def process_image_selenium(img_element, base_url):
-    """
-    Process image with proper URL handling
-    """
-    src = img_element.get('src') or img_element.get('data-src')
-    if not src:
-        return ""
-    
-    # Handle relative URLs
-    if src.startswith('//'):
-        src = 'https:' + src
-    elif src.startswith('/'):
-        from urllib.parse import urljoin
-        src = urljoin(base_url, src)
-    
-    # Skip tiny images (likely icons/decorations)
-    width = img_element.get('width')
-    height = img_element.get('height')
-    if width and height:
-        try:
-            if int(width) < 50 or int(height) < 50:
-                return ""
-        except:
-            pass
-    
-    alt = img_element.get('alt', '')
-    title = img_element.get('title', alt)
-    
-    return f'''
-    <div style="text-align: center; margin: 20px 0;">
-        <img src="{src}" alt="{alt}" title="{title}" 
-             style="max-width: 100%; height: auto; border: 1px solid #ddd; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-        {f'<p style="font-size: 0.9em; color: #666; margin-top: 8px; font-style: italic;">{alt}</p>' if alt else ''}
-    </div>
-    '''
-
-def process_figure_selenium(figure_element, base_url):
-    """
-    Process figure element with caption
-    """
-    img = figure_element.find('img')
-    if not img:
-        return ""
-    
-    img_html = process_image_selenium(img, base_url)
-    if not img_html:
-        return ""
-    
-    # Look for caption
-    caption = figure_element.find(['figcaption', 'caption', '.caption'])
-    caption_text = caption.get_text().strip() if caption else ""
-    
-    if caption_text:
-        return f'''
-        <figure style="margin: 25px 0; text-align: center;">
-            {img_html}
-            <figcaption style="font-size: 0.9em; color: #555; margin-top: 10px; font-style: italic; max-width: 80%; margin-left: auto; margin-right: auto;">
-                {caption_text}
-            </figcaption>
-        </figure>
-        '''
-    else:
-        return f'<figure style="margin: 25px 0;">{img_html}</figure>'
-
 def process_table_selenium(table_element):
     """
     Process table element
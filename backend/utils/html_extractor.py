@@ -0,0 +1,279 @@
+import re
+from urllib.parse import urljoin
+from bs4 import CData, NavigableString, Tag
+
+# Same selectors, in the same priority order, as extract_main_content_selenium
+MAIN_SELECTORS = [
+    ('article', None),
+    ('div', 'article'),
+    ('div', 'pmc-articlecontent'),
+    ('div', 'article-body'),
+    ('div', 'tsec'),
+    ('div', 'sec'),
+    ('div', 'article-content'),
+    ('main', None),
+    ('div', 'content'),
+    ('div', 'main-content'),
+    ('div', 'entry-content'),
+    ('[role="main"]', None),
+]
+
+CONTENT_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'img', 'figure', 'ul', 'ol', 'table', 'blockquote', 'div'])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+
+# One alternation instead of 19 separate searches per call
+UNWANTED_TEXT_PATTERN = re.compile('|'.join([
+    r'cookie', r'privacy policy', r'terms of service', r'subscribe',
+    r'newsletter', r'advertisement', r'sponsored', r'related articles',
+    r'share this', r'follow us', r'social media', r'navigation',
+    r'menu', r'search', r'login', r'register', r'copyright',
+    r'all rights reserved', r'contact us', r'about us'
+]))
+
+# String types that Tag.get_text() counts (excludes comments, script and style text)
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+def is_unwanted_text(text):
+    """
+    Check if text is likely navigation, ads, or other unwanted content
+    """
+    return len(text) < 10 or UNWANTED_TEXT_PATTERN.search(text.lower()) is not None
+
+
+def _matches(tag, name, css_class):
+    if name == '[role="main"]':
+        return tag.get('role') == 'main'
+    if tag.name != name:
+        return False
+    return css_class is None or css_class in tag.get('class', [])
+
+
+def find_main_content(soup):
+    """
+    Pick the main content element with the same rules as
+    extract_main_content_selenium, using one pass to find the first match
+    for every selector instead of one select_one() scan per selector.
+    """
+    first_matches = [None] * len(MAIN_SELECTORS)
+    remaining = len(MAIN_SELECTORS)
+    for tag in soup.find_all(True):
+        for index, (name, css_class) in enumerate(MAIN_SELECTORS):
+            if first_matches[index] is None and _matches(tag, name, css_class):
+                first_matches[index] = tag
+                remaining -= 1
+        if not remaining:
+            break
+
+    main_content = None
+    for main_content in first_matches:
+        if main_content and len(main_content.find_all('p', limit=3)) > 2:
+            break
+
+    # Fallback: find div with most content
+    if not main_content:
+        main_content = _largest_div(soup)
+    return main_content
+
+
+def _largest_div(soup):
+    """The div with the longest get_text(), computed bottom-up in a single traversal"""
+    text_lengths = {}
+    divs = []
+    stack = [(soup, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            length = 0
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    length += text_lengths[id(child)]
+                elif type(child) in TEXT_STRING_TYPES:
+                    length += len(child)
+            text_lengths[id(node)] = length
+            continue
+        stack.append((node, True))
+        if node.name == 'div' and node is not soup:
+            divs.append(node)
+        for child in reversed(node.contents):
+            if isinstance(child, Tag):
+                stack.append((child, False))
+
+    best = None
+    for div in divs:
+        if best is None or text_lengths[id(div)] > text_lengths[id(best)]:
+            best = div
+    return best
+
+
+def _table_html(table_element):
+    try:
+        return _build_table_html(table_element)
+    except Exception:
+        return ""
+
+
+def _build_table_html(table_element):
+    parts = ["<div style='overflow-x: auto; margin: 20px 0;'><table style='border-collapse: collapse; width: 100%; border: 1px solid #ddd;'>"]
+    headers = table_element.find_all('th')
+    if headers:
+        parts.append("<thead style='background-color: #f3f4f6;'><tr>")
+        for th in headers:
+            parts.append(f"<th style='border: 1px solid #ddd; padding: 12px; text-align: left;'>{th.get_text().strip()}</th>")
+        parts.append("</tr></thead>")
+    parts.append("<tbody>")
+    for row in table_element.find_all('tr'):
+        cells = row.find_all('td')
+        if cells:
+            parts.append("<tr>")
+            for td in cells:
+                parts.append(f"<td style='border: 1px solid #ddd; padding: 12px;'>{td.get_text().strip()}</td>")
+            parts.append("</tr>")
+    parts.append("</tbody></table></div>")
+    return "".join(parts)
+
+
+def process_image_selenium(img_element, base_url):
+    """
+    Process image with proper URL handling
+    """
+    src = img_element.get('src') or img_element.get('data-src')
+    if not src:
+        return ""
+    
+    # Handle relative URLs
+    if src.startswith('//'):
+        src = 'https:' + src
+    elif src.startswith('/'):
+        src = urljoin(base_url, src)
+    
+    # Skip tiny images (likely icons/decorations)
+    width = img_element.get('width')
+    height = img_element.get('height')
+    if width and height:
+        try:
+            if int(width) < 50 or int(height) < 50:
+                return ""
+        except:
+            pass
+    
+    alt = img_element.get('alt', '')
+    title = img_element.get('title', alt)
+    
+    return f'''
+    <div style="text-align: center; margin: 20px 0;">
+        <img src="{src}" alt="{alt}" title="{title}" 
+             style="max-width: 100%; height: auto; border: 1px solid #ddd; border-radius: 4px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+        {f'<p style="font-size: 0.9em; color: #666; margin-top: 8px; font-style: italic;">{alt}</p>' if alt else ''}
+    </div>
+    '''
+
+
+def process_figure_selenium(figure_element, base_url):
+    """
+    Process figure element with caption
+    """
+    img = figure_element.find('img')
+    if not img:
+        return ""
+    
+    img_html = process_image_selenium(img, base_url)
+    if not img_html:
+        return ""
+    
+    # Look for caption
+    caption = figure_element.find(['figcaption', 'caption', '.caption'])
+    caption_text = caption.get_text().strip() if caption else ""
+    
+    if caption_text:
+        return f'''
+        <figure style="margin: 25px 0; text-align: center;">
+            {img_html}
+            <figcaption style="font-size: 0.9em; color: #555; margin-top: 10px; font-style: italic; max-width: 80%; margin-left: auto; margin-right: auto;">
+                {caption_text}
+            </figcaption>
+        </figure>
+        '''
+    else:
+        return f'<figure style="margin: 25px 0;">{img_html}</figure>'
+
+
+def extract_main_content(soup, base_url):
+    """
+    Drop-in replacement for extract_main_content_selenium with identical
+    output: walks the main content once in document order, tests text with
+    one precompiled matcher and collects output in a list joined at the end.
+    """
+    main_content = find_main_content(soup)
+    if not main_content:
+        return "<p>Could not identify main content area.</p>"
+
+    parts = []
+    append = parts.append
+    for element in main_content.descendants:
+        name = element.name
+        if name not in CONTENT_TAGS or not isinstance(element, Tag):
+            continue
+
+        if name in HEADING_TAGS:
+            text = element.get_text().strip()
+            if text and len(text) > 2 and not is_unwanted_text(text):
+                append(f"<{name} style='color: #333; margin: 20px 0 10px 0;'>{text}</{name}>")
+
+        elif name == 'p':
+            text = element.get_text().strip()
+            if text and len(text) > 20 and not is_unwanted_text(text):
+                append(f"<p style='line-height: 1.6; margin: 15px 0;'>{text}</p>")
+
+        elif name == 'img':
+            img_html = process_image_selenium(element, base_url)
+            if img_html:
+                append(img_html)
+
+        elif name == 'figure':
+            figure_html = process_figure_selenium(element, base_url)
+            if figure_html:
+                append(figure_html)
+
+        elif name == 'table':
+            table_html = _table_html(element)
+            if table_html:
+                append(table_html)
+
+        elif name in ('ul', 'ol'):
+            list_items = element.find_all('li')
+            if list_items:
+                append(f"<{name} style='margin: 15px 0; padding-left: 30px;'>")
+                for li in list_items:
+                    text = li.get_text().strip()
+                    if text and not is_unwanted_text(text):
+                        append(f"<li style='margin: 5px 0;'>{text}</li>")
+                append(f"</{name}>")
+
+        elif name == 'blockquote':
+            text = element.get_text().strip()
+            if text and len(text) > 20:
+                append(f"<blockquote style='border-left: 4px solid #ccc; padding-left: 20px; margin: 20px 0; font-style: italic;'>{text}</blockquote>")
+
+        else:
+            # Check for PMC figure containers
+            classes = element.get('class', [])
+            if 'fig' in classes or 'table-wrap' in classes:
+                img = element.find('img')
+                if img:
+                    img_html = process_image_selenium(img, base_url)
+                    if img_html:
+                        caption = element.find(['figcaption', 'caption', 'div'], class_=['caption', 'fig-caption'])
+                        caption_text = caption.get_text().strip() if caption else ""
+                        if caption_text:
+                            append(f'<figure style="margin: 25px 0;">{img_html}<figcaption style="font-size: 0.9em; color: #555; margin-top: 10px;">{caption_text}</figcaption></figure>')
+                        else:
+                            append(img_html)
+
+                table = element.find('table')
+                if table:
+                    table_html = _table_html(table)
+                    if table_html:
+                        append(table_html)
+
+    return "".join(parts) if parts else "<p>No readable content found.</p>"
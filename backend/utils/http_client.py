@@ -0,0 +1,94 @@
+import os
+import threading
+import httpx
+
+
+def http2_available():
+    """HTTP/2 needs the optional `h2` package (pip install httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ConnectionMetrics:
+    """
+    Counts requests against new TCP/TLS connections using httpcore's trace
+    extension, so the share of requests served on a reused connection can
+    be reported.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    async def on_request(self, request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def stats(self):
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_connection_requests": reused,
+                "connection_reuse_rate": round(reused / self.requests, 4) if self.requests else 0.0,
+            }
+
+
+def create_async_client(timeout=15.0, connect_timeout=10.0, max_connections=50, max_keepalive_connections=20,
+                        keepalive_expiry=30.0, metrics=None, **kwargs):
+    """
+    Long-lived pooled httpx.AsyncClient with keep-alive. HTTP/2 is used when
+    `h2` is installed unless ENABLE_HTTP2=0. Pass a ConnectionMetrics to
+    count connection reuse.
+    """
+    http2 = os.getenv("ENABLE_HTTP2", "1") == "1" and http2_available()
+    event_hooks = {"request": [metrics.on_request]} if metrics is not None else None
+    client = httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        follow_redirects=True,
+        event_hooks=event_hooks,
+        **kwargs,
+    )
+    client.max_connections = max_connections
+    return client
+
+
+def pool_stats(client):
+    """Open/idle/active connection counts from the client's connection pool"""
+    stats = {"http2": False, "max_connections": getattr(client, "max_connections", None)}
+    try:
+        connections = client._transport._pool.connections
+    except AttributeError:
+        return stats
+    active = sum(1 for connection in connections if not connection.is_idle())
+    stats.update({
+        "http2": any(connection.is_available() and "HTTP/2" in connection.info() for connection in connections),
+        "open_connections": len(connections),
+        "active_connections": active,
+        "idle_connections": len(connections) - active,
+    })
+    if stats["max_connections"]:
+        stats["utilization"] = round(active / stats["max_connections"], 3)
+    return stats
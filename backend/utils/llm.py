@@ -0,0 +1,306 @@
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .upstream import LatencyHistogram
+
+try:
+    import google.generativeai as genai
+except ImportError:  # pip install google-generativeai (not needed with LLM_BACKEND=stub)
+    genai = None
+
+# Call sites ask for a role; the model behind each role is configuration
+# (LLM_MODEL_<ROLE>), so swapping models needs no code change
+DEFAULT_MODELS = {
+    "analysis": "gemini-1.5-pro",     # /ai/summarize, structured-summary, keywords, extract-data
+    "summary": "gemini-2.5-flash",    # /ai/comprehensive-summary
+    "chat": "gemini-2.5-flash",       # /ai/chat
+    "fast": "gemini-1.5-flash",       # /ai/test-gemini, hybrid_summarizer
+}
+WORD = re.compile(r"[A-Za-z][A-Za-z0-9-]{4,}")
+
+
+class LLMResponse:
+    """Text of one model call plus its token usage"""
+    __slots__ = ("text", "model", "prompt_tokens", "completion_tokens")
+
+    def __init__(self, text, model, prompt_tokens=0, completion_tokens=0):
+        self.text = text
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class GeminiBackend:
+    """google-generativeai, with one reusable GenerativeModel handle per model name"""
+    name = "gemini"
+
+    def __init__(self, api_key):
+        if genai is None:
+            raise RuntimeError("google-generativeai is not installed; set LLM_BACKEND=stub to run without it")
+        if api_key:
+            genai.configure(api_key=api_key)
+        else:
+            print("⚠ GEMINI_API_KEY is not set; model calls will fail (set LLM_BACKEND=stub to run without a key)")
+        self.api_key = api_key
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def model(self, model_name):
+        if not self.api_key:
+            raise RuntimeError("GEMINI_API_KEY is not set; export it or set LLM_BACKEND=stub")
+        with self._lock:
+            handle = self._models.get(model_name)
+            if handle is None:
+                handle = self._models[model_name] = genai.GenerativeModel(model_name)
+            return handle
+
+    @staticmethod
+    def _response(response, model_name, text=None):
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            response.text if text is None else text,
+            model_name,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            completion_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+        )
+
+    def generate(self, model_name, prompt, timeout):
+        response = self.model(model_name).generate_content(prompt, request_options={"timeout": timeout})
+        return self._response(response, model_name)
+
+    def stream(self, model_name, prompt, timeout):
+        """Yield an LLMResponse per chunk; usage counts are cumulative"""
+        response = self.model(model_name).generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in response:
+            # The closing chunk may carry only usage and no text parts
+            yield self._response(chunk, model_name, text=None if chunk.parts else "")
+
+
+class StubBackend:
+    """
+    Offline stand-in for benchmarks and load tests: after `latency` seconds
+    it answers with a deterministic comma-separated list of words taken
+    from the prompt, so repeated prompts give identical output. Tokens are
+    counted as whitespace-separated words.
+    """
+    name = "stub"
+
+    def __init__(self, latency=0.5, max_words=120):
+        self.latency = latency
+        self.max_words = max_words
+
+    def _words(self, prompt):
+        words = list(dict.fromkeys(WORD.findall(prompt)))
+        seed = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest(), 16)
+        start = seed % len(words) if words else 0
+        return (words[start:] + words[:start])[:self.max_words] or ["stub"]
+
+    def generate(self, model_name, prompt, timeout):
+        if self.latency:
+            time.sleep(min(self.latency, timeout) if timeout else self.latency)
+            if timeout and self.latency > timeout:
+                raise TimeoutError(f"stub latency {self.latency}s exceeds timeout {timeout}s")
+        picked = self._words(prompt)
+        return LLMResponse(", ".join(picked), model_name, prompt_tokens=len(prompt.split()), completion_tokens=len(picked))
+
+    def stream(self, model_name, prompt, timeout):
+        """
+        The `generate` text word by word, with the latency spread evenly
+        across the words. Like `generate`, a latency above `timeout` raises
+        TimeoutError once the timeout has passed, after the words due by then.
+        """
+        picked = self._words(prompt)
+        delay = self.latency / len(picked)
+        for count, word in enumerate(picked, 1):
+            if timeout and count * delay > timeout:
+                time.sleep(max(timeout - (count - 1) * delay, 0))
+                raise TimeoutError(f"stub latency {self.latency}s exceeds timeout {timeout}s")
+            time.sleep(delay)
+            yield LLMResponse(word if count == len(picked) else f"{word}, ", model_name,
+                              prompt_tokens=len(prompt.split()), completion_tokens=count)
+
+
+class _ModelStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.counters = {"calls": 0, "errors": 0, "timeouts": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+
+class LLMClient:
+    """
+    The one way the app talks to a language model.
+
+    Calls name a role (see DEFAULT_MODELS) rather than a model. Blocking
+    backend calls run on a bounded thread pool, so at most
+    `max_concurrency` are in flight and the event loop is never blocked.
+    Each call has a timeout; calls, errors, timeouts, tokens and latency
+    are accounted per model.
+    """
+
+    def __init__(self, backend, models=None, timeout=60.0, max_concurrency=8):
+        self.backend = backend
+        self.models = {**DEFAULT_MODELS, **(models or {})}
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def model_name(self, role):
+        return self.models.get(role, role)
+
+    def model_id(self, role):
+        """Backend-qualified model name, e.g. for cache keys"""
+        return f"{self.backend.name}/{self.model_name(role)}"
+
+    def _record(self, model_name, elapsed=None, response=None, error=None):
+        with self._lock:
+            stats = self._stats.get(model_name)
+            if stats is None:
+                stats = self._stats[model_name] = _ModelStats()
+            stats.counters["calls"] += 1
+            if response is not None:
+                stats.latency.record(elapsed)
+                stats.counters["prompt_tokens"] += response.prompt_tokens
+                stats.counters["completion_tokens"] += response.completion_tokens
+            elif isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+                stats.counters["timeouts"] += 1
+            else:
+                stats.counters["errors"] += 1
+
+    def generate_sync(self, role, prompt, timeout=None):
+        """Blocking call for synchronous code; accounted like `generate`"""
+        model_name = self.model_name(role)
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        try:
+            response = self.backend.generate(model_name, prompt, timeout)
+        except Exception as e:
+            self._record(model_name, error=e)
+            raise
+        self._record(model_name, time.perf_counter() - started, response)
+        return response
+
+    async def generate(self, role, prompt, timeout=None):
+        """
+        Run one model call on the executor. A call that exceeds its timeout
+        raises TimeoutError to the caller; the worker thread finishes in the
+        background (the Gemini backend passes the same timeout to its request).
+        """
+        model_name = self.model_name(role)
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        call = asyncio.get_running_loop().run_in_executor(
+            self.executor, self.backend.generate, model_name, prompt, timeout)
+        try:
+            response = await asyncio.wait_for(call, timeout)
+        except Exception as e:
+            self._record(model_name, error=e)
+            raise
+        self._record(model_name, time.perf_counter() - started, response)
+        return response
+
+    async def stream(self, role, prompt, timeout=None):
+        """
+        Yield text chunks as the model produces them. The backend's blocking
+        iterator runs on the executor and hands chunks over through a queue;
+        `timeout` bounds the whole call. Closing the generator early stops
+        the worker at its next chunk.
+        """
+        model_name = self.model_name(role)
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        finished = object()
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.backend.stream(model_name, prompt, timeout):
+                    if stopped.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+        started = time.perf_counter()
+        deadline = loop.time() + timeout
+        usage = LLMResponse("", model_name)
+        loop.run_in_executor(self.executor, produce)
+        try:
+            while True:
+                item = await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0))
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                usage.prompt_tokens = max(usage.prompt_tokens, item.prompt_tokens)
+                usage.completion_tokens = max(usage.completion_tokens, item.completion_tokens)
+                if item.text:
+                    yield item.text
+        except Exception as e:
+            self._record(model_name, error=e)
+            raise
+        finally:
+            stopped.set()
+        self._record(model_name, time.perf_counter() - started, usage)
+
+    def usage(self):
+        """Calls and tokens summed over every model"""
+        totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        with self._lock:
+            for stats in self._stats.values():
+                for name in totals:
+                    totals[name] += stats.counters[name]
+        return totals
+
+    def stats(self):
+        with self._lock:
+            models = {name: {**stats.counters, "latency": stats.latency.to_dict()}
+                      for name, stats in self._stats.items()}
+        return {
+            "backend": self.backend.name,
+            "roles": self.models,
+            "timeout_seconds": self.timeout,
+            "max_concurrency": self.max_concurrency,
+            "models": models,
+        }
+
+
+def create_llm_client():
+    """
+    LLMClient configured from the environment: LLM_BACKEND (gemini|stub),
+    GEMINI_API_KEY, LLM_MODEL_<ROLE>, LLM_TIMEOUT, LLM_MAX_CONCURRENCY and,
+    for the stub, LLM_STUB_LATENCY_MS.
+    """
+    if os.getenv("LLM_BACKEND", "gemini") == "stub":
+        backend = StubBackend(latency=float(os.getenv("LLM_STUB_LATENCY_MS", "500")) / 1000)
+    else:
+        backend = GeminiBackend(os.getenv("GEMINI_API_KEY"))
+    models = {role: os.getenv(f"LLM_MODEL_{role.upper()}", model) for role, model in DEFAULT_MODELS.items()}
+    return LLMClient(
+        backend,
+        models=models,
+        timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    )
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_llm_client():
+    """The process-wide LLMClient shared by the AI routes and the summarizer scripts"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = create_llm_client()
+        return _default_client
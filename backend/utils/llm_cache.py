@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from .encoding import dumps, gzip_bytes, loads
+
+DEFAULT_CACHE_PATH = "cache/llm_responses.sqlite3"
+# Eviction trims the cache to this fraction of its budget, so it does not run on every write
+EVICT_TO = 0.9
+
+
+def llm_cache_key(model, prompt_version, *inputs):
+    """Content address of one model response: model, prompt template version and input text"""
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, *inputs):
+        data = str(part).encode("utf-8")
+        # Length-prefixed so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent, content-addressed cache of AI endpoint responses.
+
+    Rows live in a SQLite table of gzip-compressed JSON keyed by
+    `llm_cache_key`, so the same article, prompt and model are answered
+    without calling the model again, across restarts. The total stored
+    size is bounded by `max_bytes`; when exceeded, the least recently used
+    rows are evicted. Hits and misses are counted per endpoint.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.counters = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses (last_used)")
+        self._db.commit()
+        self.current_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM llm_responses").fetchone()[0]
+
+    def _count(self, endpoint, counter):
+        counters = self.counters.setdefault(endpoint, {"hits": 0, "misses": 0, "writes": 0})
+        counters[counter] += 1
+
+    def get(self, endpoint, key):
+        """The cached response for `key`, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT payload FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(endpoint, "misses")
+                return None
+            self._db.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self._count(endpoint, "hits")
+        return loads(gzip.decompress(row[0]))
+
+    def put(self, endpoint, key, model, value):
+        raw = dumps(value)
+        blob = gzip_bytes(raw)
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute("SELECT LENGTH(payload) FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, model, now, now, len(raw), blob),
+            )
+            self.current_bytes += len(blob) - (previous[0] if previous else 0)
+            if self.current_bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+            self._count(endpoint, "writes")
+
+    def _evict(self):
+        target = self.max_bytes * EVICT_TO
+        rows = self._db.execute("SELECT key, LENGTH(payload) FROM llm_responses ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self.current_bytes <= target:
+                break
+            doomed.append((key,))
+            self.current_bytes -= size
+        self._db.executemany("DELETE FROM llm_responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def invalidate(self, endpoint=None):
+        """Drop one endpoint's responses (or everything when endpoint is None)"""
+        with self._lock:
+            if endpoint is None:
+                removed = self._db.execute("DELETE FROM llm_responses").rowcount
+            else:
+                removed = self._db.execute("DELETE FROM llm_responses WHERE endpoint = ?", (endpoint,)).rowcount
+            self._db.commit()
+            self.current_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM llm_responses").fetchone()[0]
+        return removed
+
+    def stats(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT endpoint, COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM llm_responses GROUP BY endpoint"
+            ).fetchall()
+            counters = {endpoint: dict(values) for endpoint, values in self.counters.items()}
+        stored = {endpoint: (entries, size) for endpoint, entries, size in rows}
+        endpoints = {}
+        for endpoint in sorted(set(counters) | set(stored)):
+            values = counters.get(endpoint, {"hits": 0, "misses": 0, "writes": 0})
+            lookups = values["hits"] + values["misses"]
+            entries, size = stored.get(endpoint, (0, 0))
+            endpoints[endpoint] = {
+                **values,
+                "hit_rate": round(values["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+            }
+        return {
+            "path": self.path,
+            "bytes": self.current_bytes,
+            "budget_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "endpoints": endpoints,
+        }
+
+
+def open_llm_cache():
+    """LLMResponseCache configured from LLM_CACHE_PATH / LLM_CACHE_MB"""
+    return LLMResponseCache(
+        os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+        max_bytes=int(os.getenv("LLM_CACHE_MB", "256")) * 1024 * 1024,
+    )
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+
+async def bounded_map(items, worker, concurrency):
+    """
+    Run `worker(item)` over `items` with at most `concurrency` calls in
+    flight, yielding `(item, result, elapsed_seconds)` in completion order.
+
+    A new call starts as soon as any call finishes, so one slow item only
+    occupies its own slot instead of stalling a whole batch. Exceptions are
+    yielded as the result rather than raised. Closing the generator early
+    (e.g. the client disconnected) cancels the calls still in flight.
+    """
+    iterator = iter(items)
+    pending = set()
+
+    async def timed(item):
+        started = time.perf_counter()
+        try:
+            result = await worker(item)
+        except Exception as e:
+            result = e
+        return item, result, time.perf_counter() - started
+
+    def fill():
+        while len(pending) < concurrency:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            pending.add(asyncio.create_task(timed(item)))
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            # Refill before handing results out so slots never sit idle
+            fill()
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def timed_section(timings, name, work):
+    """Await `work`, recording its wall time in milliseconds as `timings[name]`"""
+    started = time.perf_counter()
+    try:
+        return await work
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def timing_summary(timings, total_seconds, slowest=5):
+    """p50/p95/max of `(elapsed_seconds, key)` pairs plus the slowest keys"""
+    ordered = sorted(timings)
+    if not ordered:
+        return {"total_seconds": round(total_seconds, 3), "count": 0}
+    return {
+        "total_seconds": round(total_seconds, 3),
+        "count": len(ordered),
+        "p50_ms": round(ordered[len(ordered) // 2][0] * 1000, 1),
+        "p95_ms": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)][0] * 1000, 1),
+        "max_ms": round(ordered[-1][0] * 1000, 1),
+        "slowest": [{"key": key, "ms": round(elapsed * 1000, 1)} for elapsed, key in reversed(ordered[-slowest:])],
+    }
@@ -0,0 +1,95 @@
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+
+
+class _HostSchedule:
+    """
+    Per-host start times shared by the async and threaded limiters: request
+    starts against one host are spaced `min_interval` seconds apart plus up
+    to `jitter` seconds of random slack. Callers serialise `_reserve`.
+    """
+
+    def __init__(self, min_interval, jitter, max_concurrent):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+        self._next_start = defaultdict(float)
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc or url
+
+    def _reserve(self, host):
+        """Book the host's next start slot and return how long to wait for it"""
+        now = time.monotonic()
+        start = max(now, self._next_start[host])
+        self._next_start[host] = start + self.min_interval + random.uniform(0, self.jitter)
+        delay = start - now
+        if delay > 0:
+            self.throttled += 1
+            self.throttled_seconds += delay
+        return delay
+
+    def stats(self):
+        return {
+            "hosts": len(self._next_start),
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class AsyncHostRateLimiter(_HostSchedule):
+    """
+    Per-host politeness for async fetches.
+
+    Request starts against one host are spaced `min_interval` seconds apart
+    (plus up to `jitter` seconds of random slack) and at most
+    `max_concurrent` requests run against it at once. Waiting happens with
+    `asyncio.sleep`, so a throttled request never holds a worker thread.
+    """
+
+    def __init__(self, min_interval=1.0, jitter=1.0, max_concurrent=4):
+        super().__init__(min_interval, jitter, max_concurrent)
+        self._semaphores = defaultdict(lambda: asyncio.Semaphore(self.max_concurrent))
+
+    @asynccontextmanager
+    async def slot(self, url):
+        host = self.host_of(url)
+        async with self._semaphores[host]:
+            # No await between reading and bumping the schedule, so this is race-free
+            delay = self._reserve(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+
+
+class HostRateLimiter(_HostSchedule):
+    """
+    Thread-safe counterpart of AsyncHostRateLimiter for blocking fetches
+    (e.g. fetch_article_with_requests in prefetch_articles.py): same spacing
+    and per-host cap, waiting with `time.sleep` in the calling thread.
+    """
+
+    def __init__(self, min_interval=1.0, jitter=1.0, max_concurrent=4):
+        super().__init__(min_interval, jitter, max_concurrent)
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(self.max_concurrent))
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url):
+        host = self.host_of(url)
+        with self._lock:
+            semaphore = self._semaphores[host]
+        with semaphore:
+            with self._lock:
+                delay = self._reserve(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield
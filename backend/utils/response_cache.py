@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from fastapi import Response
+
+from .content_store import LRUCache
+from .encoding import EncodedPayload, encoded_response
+from .single_flight import SingleFlight
+
+
+def normalize_url(url):
+    """Cache key for an upstream URL: lowercase scheme/host, sorted query, no fragment"""
+    parts = urlsplit(url.strip())
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def body_etag(body):
+    return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match check: `*` or any listed tag, compared weakly (W/ ignored) as RFC 9110 requires"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    weak = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == weak for tag in if_none_match.split(","))
+
+
+class CachedResponse:
+    """Upstream result stored pre-serialized and pre-compressed, with its ETag and freshness window"""
+    __slots__ = ("status", "payload", "etag", "fetched_at", "ttl", "stale_ttl")
+
+    def __init__(self, status, data, ttl, stale_ttl):
+        self.status = status
+        self.payload = EncodedPayload.from_value(data)
+        self.etag = body_etag(self.payload.identity)
+        self.fetched_at = time.time()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    @property
+    def body(self):
+        return self.payload.identity
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def is_fresh(self):
+        return self.age() < self.ttl
+
+    def is_usable(self):
+        return self.age() < self.ttl + self.stale_ttl
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU of upstream JSON responses with per-call TTLs.
+
+    Fresh entries are served directly. Entries past their TTL but within
+    `stale_ttl` are served immediately while one background task refreshes
+    them (stale-while-revalidate). 404s are cached for `negative_ttl`.
+    Concurrent misses for the same URL share one upstream request, and
+    fetch errors are never cached.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.entries = LRUCache(max_bytes)
+        self.fetches = SingleFlight()
+        self.counters = {"hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0,
+                         "refreshes": 0, "refresh_failures": 0}
+        self._refreshing = set()
+        # The event loop only keeps weak references to tasks
+        self._refresh_tasks = set()
+
+    async def _fetch(self, key, fetch, ttl, stale_ttl, negative_ttl):
+        status, data = await fetch()
+        if status == 404:
+            entry = CachedResponse(status, data, negative_ttl, 0)
+        else:
+            entry = CachedResponse(status, data, ttl, stale_ttl)
+        self.entries.put(key, entry, entry.payload.size, entry.fetched_at + entry.ttl + entry.stale_ttl)
+        return entry
+
+    async def _refresh(self, key, fetch, ttl, stale_ttl, negative_ttl):
+        try:
+            await self.fetches.do(key, lambda: self._fetch(key, fetch, ttl, stale_ttl, negative_ttl))
+            self.counters["refreshes"] += 1
+        except Exception as e:
+            self.counters["refresh_failures"] += 1
+            print(f"⚠ Background refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def get(self, url, fetch, ttl, stale_ttl=0, negative_ttl=60):
+        """
+        Return `(CachedResponse, cache_status)` for `url`, where `fetch()` is a
+        coroutine factory returning `(status_code, json_data)` and raising on
+        errors that must not be cached. cache_status is HIT, STALE or MISS.
+        """
+        key = normalize_url(url)
+        cached = self.entries.get(key)
+        entry = cached[0] if cached is not None else None
+
+        if entry is not None and entry.is_fresh():
+            self.counters["negative_hits" if entry.status == 404 else "hits"] += 1
+            return entry, "HIT"
+
+        if entry is not None and entry.is_usable():
+            self.counters["stale_hits"] += 1
+            if key not in self._refreshing:
+                self._refreshing.add(key)
+                task = asyncio.create_task(self._refresh(key, fetch, ttl, stale_ttl, negative_ttl))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return entry, "STALE"
+
+        self.counters["misses"] += 1
+        entry = await self.fetches.do(key, lambda: self._fetch(key, fetch, ttl, stale_ttl, negative_ttl))
+        return entry, "MISS"
+
+    def invalidate(self, url=None):
+        if url is None:
+            self.entries.pop_matching(lambda key: True)
+        else:
+            self.entries.pop(normalize_url(url))
+
+    def stats(self):
+        counters = dict(self.counters)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["negative_hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round((lookups - counters["misses"]) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.entries.current_bytes,
+            "max_bytes": self.entries.max_bytes,
+            "evictions": self.entries.evictions,
+            "in_flight": self.fetches.stats()["in_flight"],
+        }
+
+
+def cached_json_response(entry, cache_status, request=None, body=None, status_code=None):
+    """
+    Serve a CachedResponse with Cache-Control/ETag/X-Cache headers, answering
+    a matching If-None-Match with 304. The stored bytes go out in the best
+    encoding the client accepts, with the upstream status unless
+    `status_code` is given; `body` overrides them (e.g. to map an upstream
+    404 to an empty list), and the ETag is then computed from `body`.
+    """
+    if status_code is None:
+        status_code = entry.status
+    etag = body_etag(body) if body is not None else entry.etag
+    remaining = max(int(entry.ttl - entry.age()), 0)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={remaining}, stale-while-revalidate={int(entry.stale_ttl)}",
+        "X-Cache": cache_status,
+    }
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if body is not None:
+        return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+    return encoded_response(request, entry.payload, status_code=status_code, headers=headers)
@@ -0,0 +1,153 @@
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import defaultdict
+
+TOKEN_PATTERN = re.compile(r'\w+')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+# Title matches count for more than body matches
+DEFAULT_FIELD_WEIGHTS = {"title": 3.0, "body": 1.0}
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query):
+    """Split a query into quoted phrases (lists of terms) and loose terms"""
+    phrases = [tokenize(phrase) for phrase in PHRASE_PATTERN.findall(query)]
+    phrases = [phrase for phrase in phrases if phrase]
+    terms = tokenize(PHRASE_PATTERN.sub(' ', query))
+    return phrases, terms
+
+
+class SearchIndex:
+    """
+    Incremental inverted index with positional postings and BM25 scoring.
+
+    Each document has one or more fields (title, body); every field keeps
+    its own postings `term -> {doc_id: array of positions}` and length
+    statistics, and scores are a weighted sum of per-field BM25. Adding or
+    replacing a field only touches that document's postings, so fetched
+    article bodies can be indexed one at a time without a rebuild.
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings = {field: defaultdict(dict) for field in self.field_weights}
+        self._doc_terms = {field: {} for field in self.field_weights}
+        self._doc_lengths = {field: {} for field in self.field_weights}
+        self._total_lengths = {field: 0 for field in self.field_weights}
+        self._doc_ids = set()
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def doc_ids(self):
+        with self._lock:
+            return set(self._doc_ids)
+
+    def has_field(self, doc_id, field):
+        return doc_id in self._doc_lengths[field]
+
+    def add(self, doc_id, field, text, is_html=False):
+        """Index (or re-index) one field of a document"""
+        if is_html:
+            text = TAG_PATTERN.sub(' ', text)
+        tokens = tokenize(text)
+        positions = defaultdict(lambda: array('I'))
+        for position, token in enumerate(tokens):
+            positions[token].append(position)
+
+        with self._lock:
+            self._remove_field(doc_id, field)
+            postings = self._postings[field]
+            for term, term_positions in positions.items():
+                postings[term][doc_id] = term_positions
+            self._doc_terms[field][doc_id] = tuple(positions)
+            self._doc_lengths[field][doc_id] = len(tokens)
+            self._total_lengths[field] += len(tokens)
+            self._doc_ids.add(doc_id)
+
+    def remove(self, doc_id):
+        with self._lock:
+            for field in self.field_weights:
+                self._remove_field(doc_id, field)
+            self._doc_ids.discard(doc_id)
+
+    def _remove_field(self, doc_id, field):
+        terms = self._doc_terms[field].pop(doc_id, None)
+        if terms is None:
+            return
+        postings = self._postings[field]
+        for term in terms:
+            docs = postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del postings[term]
+        self._total_lengths[field] -= self._doc_lengths[field].pop(doc_id, 0)
+
+    def _phrase_docs(self, field, phrase):
+        """Docs whose `field` contains the terms of `phrase` consecutively"""
+        postings = self._postings[field]
+        term_docs = [postings.get(term) for term in phrase]
+        if not all(term_docs):
+            return set()
+        candidates = set(term_docs[0]).intersection(*term_docs[1:])
+        matches = set()
+        for doc_id in candidates:
+            starts = set(term_docs[0][doc_id])
+            for offset, docs in enumerate(term_docs[1:], start=1):
+                starts &= {position - offset for position in docs[doc_id]}
+                if not starts:
+                    break
+            if starts:
+                matches.add(doc_id)
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Return `[(doc_id, score)]` for `query`, best first.
+
+        Loose terms are OR-ed together; every quoted phrase must appear in
+        at least one field of a matching document.
+        """
+        phrases, terms = parse_query(query)
+        terms = terms + [term for phrase in phrases for term in phrase]
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs = len(self._doc_ids)
+            scores = defaultdict(float)
+            for field, weight in self.field_weights.items():
+                postings = self._postings[field]
+                doc_lengths = self._doc_lengths[field]
+                if not doc_lengths:
+                    continue
+                avg_length = self._total_lengths[field] / len(doc_lengths) or 1.0
+                for term in set(terms):
+                    docs = postings.get(term)
+                    if not docs:
+                        continue
+                    idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for doc_id, positions in docs.items():
+                        tf = len(positions)
+                        norm = self.k1 * (1 - self.b + self.b * doc_lengths[doc_id] / avg_length)
+                        scores[doc_id] += weight * idf * tf * (self.k1 + 1) / (tf + norm)
+
+            for phrase in phrases:
+                matching = set()
+                for field in self.field_weights:
+                    matching |= self._phrase_docs(field, phrase)
+                scores = {doc_id: score for doc_id, score in scores.items() if doc_id in matching}
+
+        return heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,47 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await that same task and share its result or exception.
+    Nothing is remembered once the task finishes, so a failure is never
+    replayed to later callers. The task is shielded, so one caller
+    disconnecting does not cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.leaders = 0
+        self.followers = 0
+        self.failures = 0
+
+    async def do(self, key, work):
+        """Run `work()` (a coroutine factory) once per key across concurrent callers"""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self):
+        calls = self.leaders + self.followers
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.leaders,
+            "coalesced": self.followers,
+            "failures": self.failures,
+            "coalescing_rate": round(self.followers / calls, 4) if calls else 0.0,
+        }
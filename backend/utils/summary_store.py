@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .encoding import dumps, gzip_bytes, loads
+
+DEFAULT_STORE_PATH = "cache/summaries.sqlite3"
+TAG = re.compile(r'<[^>]+>')
+WHITESPACE = re.compile(r'\s+')
+
+
+def content_fingerprint(content):
+    """
+    Hash of an article's text with markup and all whitespace removed, so the
+    same article matches whether the client stripped tags to spaces or to
+    nothing, or collapsed whitespace
+    """
+    text = WHITESPACE.sub('', TAG.sub('', content))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SummaryStore:
+    """
+    Precomputed comprehensive summaries, one row per article.
+
+    Rows record the content fingerprint they were generated from and the
+    pipeline version (model and prompt version). A lookup only answers when
+    both match, so a changed article or a new model/prompt makes the row
+    stale and the route falls back to live generation.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.counters = {"hits": 0, "misses": 0, "stale": 0, "writes": 0}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                article_id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                version TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS summaries_content_hash ON summaries (content_hash)")
+        self._db.commit()
+
+    def is_current(self, article_id, content_hash, version):
+        """True if the stored summary was generated from this content by this pipeline version"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM summaries WHERE article_id = ? AND content_hash = ? AND version = ?",
+                (article_id, content_hash, version),
+            ).fetchone()
+        return row is not None
+
+    def lookup(self, content_hash, version):
+        """The current summary for an article's content, or None if missing or stale"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT version, payload FROM summaries WHERE content_hash = ?", (content_hash,)
+            ).fetchall()
+            current = next((payload for row_version, payload in rows if row_version == version), None)
+            if current is not None:
+                self.counters["hits"] += 1
+            else:
+                self.counters["stale" if rows else "misses"] += 1
+        return loads(gzip.decompress(current)) if current is not None else None
+
+    def put(self, article_id, title, content_hash, version, result):
+        raw = dumps(result)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (article_id, title, content_hash, version, time.time(), len(raw), gzip_bytes(raw)),
+            )
+            self._db.commit()
+            self.counters["writes"] += 1
+
+    def stats(self, version=None):
+        with self._lock:
+            counters = dict(self.counters)
+            entries, disk_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM summaries").fetchone()
+            current = self._db.execute(
+                "SELECT COUNT(*) FROM summaries WHERE version = ?", (version,)).fetchone()[0] if version else None
+        lookups = counters["hits"] + counters["misses"] + counters["stale"]
+        return {
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "current_entries": current,
+            "disk_bytes": disk_bytes,
+            "path": self.path,
+        }
+
+
+def open_summary_store():
+    """SummaryStore at SUMMARY_STORE_PATH"""
+    return SummaryStore(os.getenv("SUMMARY_STORE_PATH", DEFAULT_STORE_PATH))
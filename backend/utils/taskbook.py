@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+TASKBOOK_URL = "https://taskbook.nasaprs.com/tbp/highlights.cfm"
+DEFAULT_SNAPSHOT_PATH = "cache/taskbook_highlights.json"
+MAX_HIGHLIGHTS = 10
+
+# Highlight cards are elements whose class names them (e.g. "highlight",
+# "highlight-item"); when the page has any, only those subtrees are parsed,
+# which skips the outer layout table along with the header and navigation.
+HIGHLIGHT_CLASS = re.compile(r'highlight', re.I)
+HIGHLIGHT_CLASS_ATTR = re.compile(r'class\s*=\s*["\'][^"\']*highlight', re.I)
+HIGHLIGHT_STRAINER = SoupStrainer(class_=HIGHLIGHT_CLASS)
+# Otherwise a highlight is an image inside its nearest a/div/td. On the
+# layout-table page those containers wrap nearly the whole document, so
+# the page is parsed in full.
+CONTAINER_TAGS = ['a', 'div', 'td']
+
+# Shown only when no scrape has ever succeeded
+FALLBACK_HIGHLIGHTS = [
+    {"title": "Spaceflight Allows Botanists To Probe Fundamental Questions About Plants", "summary": "Research by Ferl/Paul exploring how spaceflight environments enable scientists to study fundamental aspects of plant biology, including growth patterns, gene expression, and adaptation mechanisms in microgravity conditions.", "image": "https://images.unsplash.com/photo-1530836369250-ef72a3f5cda8?w=400"},
+    {"title": "Microgravity Offers a Unique Opportunity to Study Human Immune Function", "summary": "Hughes-Fulford's research demonstrates how microgravity provides unprecedented insights into human immune system function, revealing changes in immune cell behavior and response mechanisms that are masked by Earth's gravity.", "image": "https://images.unsplash.com/photo-1576086213369-97a306d36557?w=400"},
+    {"title": "Space Flies Model How Gravity Affects the Human Immune System", "summary": "Beckingham/Kimbrell use fruit flies as model organisms to understand how gravitational forces influence immune system development and function, with direct applications to human health in space and on Earth.", "image": "https://images.unsplash.com/photo-1614935151651-0bea6508db6b?w=400"},
+    {"title": "Spaceflight Promotes Unique Bacterial Biofilm Structure", "summary": "Collins' research reveals that bacteria form distinct biofilm structures in microgravity, with implications for spacecraft contamination control, crew health, and potential biotechnology applications.", "image": "https://images.unsplash.com/photo-1579154204601-01588f351e67?w=400"},
+    {"title": "Growing Plants in Spaceflight Could Help Reveal How They Sense Their World", "summary": "Gilroy's studies on plant growth in space provide insights into how plants perceive and respond to their environment, including gravity sensing mechanisms and signal transduction pathways.", "image": "https://images.unsplash.com/photo-1466692476868-aef1dfb1e735?w=400"},
+    {"title": "Studying Infections in Space to Help Provide Better Medicine Back on Earth", "summary": "Nickerson's research on microbial behavior in spaceflight conditions leads to discoveries about pathogen virulence and infection mechanisms, contributing to improved medical treatments for Earth-based diseases.", "image": "https://images.unsplash.com/photo-1582719471384-894fbb16e074?w=400"},
+    {"title": "Research on Latent Virus Reactivation Helps Keep Astronauts and the Public Healthy", "summary": "Mehta/Pierson investigate how spaceflight stress causes reactivation of dormant viruses in astronauts, leading to better understanding and prevention strategies for viral infections in both space and terrestrial populations.", "image": "https://images.unsplash.com/photo-1532187863486-abf9dbad1b69?w=400"},
+    {"title": "Observing Microorganisms on ISS Leads to a Novel Understanding of Life on Earth", "summary": "The Microbial Observatory project monitors microorganisms aboard the International Space Station, providing unprecedented data on microbial ecology, evolution, and adaptation in closed environments.", "image": "https://images.unsplash.com/photo-1451187580459-43490279c0fa?w=400"},
+    {"title": "Standing up to Gravity: Drug Shows Promise as Treatment for Orthostatic Intolerance", "summary": "Cohen/Meck's research identifies pharmaceutical interventions to prevent orthostatic intolerance (dizziness upon standing) experienced by astronauts after spaceflight, with applications for patients on Earth.", "image": "https://images.unsplash.com/photo-1471864190281-a93a3070b6de?w=400"},
+    {"title": "Transgenic Plants Help Answer Questions about the Effects of Space Flight on Plant Biology", "summary": "Ferl/Paul use genetically modified plants to track molecular and cellular responses to spaceflight, revealing how plants adapt at the genetic level to microgravity environments.", "image": "https://images.unsplash.com/photo-1518531933037-91b2f5f229cc?w=400"}
+]
+
+
+def parse_highlights(html, limit=MAX_HIGHLIGHTS):
+    """
+    Highlight cards (title, summary, image) from the Task Book highlights
+    page: every non-GIF image whose nearest a/div/td container carries more
+    than 50 characters of text. Only highlight-classed subtrees are parsed
+    when the page has them; the scan stops once `limit` distinct images are
+    found.
+    """
+    if HIGHLIGHT_CLASS_ATTR.search(html):
+        highlights = _scan_images(BeautifulSoup(html, 'html.parser', parse_only=HIGHLIGHT_STRAINER), limit)
+        if highlights:
+            return highlights
+    return _scan_images(BeautifulSoup(html, 'html.parser'), limit)
+
+
+def _highlight(text, img_src):
+    """The card for an image, or None if it is a GIF or its container text is too short"""
+    if not img_src or img_src.endswith('.gif'):
+        return None
+    text = text.strip()
+    if len(text) <= 50:
+        return None
+    full_img_url = img_src if img_src.startswith('http') else f"https://taskbook.nasaprs.com{img_src}"
+    return {"title": text[:100], "summary": text, "image": full_img_url}
+
+
+def _scan_images(soup, limit):
+    highlights = []
+    seen = set()
+    for img in soup.find_all('img'):
+        parent = img.find_parent(CONTAINER_TAGS)
+        if parent is None:
+            continue
+        highlight = _highlight(parent.get_text(), img.get('src', ''))
+        if highlight and highlight["image"] not in seen:
+            seen.add(highlight["image"])
+            highlights.append(highlight)
+            if len(highlights) >= limit:
+                break
+    return highlights
+
+
+class HighlightsSnapshot:
+    """
+    Last good scrape of the Task Book highlights, persisted to JSON.
+
+    A failed or empty scrape keeps the previous snapshot; the hard-coded
+    FALLBACK_HIGHLIGHTS are used only if no scrape has ever succeeded.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.highlights = []
+        self.fetched_at = None
+        self.attempted_at = None
+        self.last_error = None
+        self._lock = asyncio.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                self.highlights = state.get("highlights", [])
+                self.fetched_at = state.get("fetched_at")
+            except (OSError, ValueError) as e:
+                print(f"⚠ Ignoring unreadable highlights snapshot {path}: {e}")
+        self._update_etag()
+
+    def _update_etag(self):
+        body = json.dumps(self.current(), sort_keys=True).encode("utf-8")
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+    def current(self):
+        return self.highlights or FALLBACK_HIGHLIGHTS
+
+    def is_fallback(self):
+        return not self.highlights
+
+    def age(self):
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    async def refresh(self, upstream):
+        async with self._lock:
+            self.attempted_at = time.time()
+            try:
+                response = await upstream.get(TASKBOOK_URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=30.0)
+                response.raise_for_status()
+                highlights = await asyncio.to_thread(parse_highlights, response.text)
+                if not highlights:
+                    raise ValueError("No highlights found on the page")
+                fetched_at = time.time()
+                await asyncio.to_thread(self._save, highlights, fetched_at)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠ Task Book highlights refresh failed, keeping last snapshot: {e}")
+                return False
+
+            self.highlights = highlights
+            self.fetched_at = fetched_at
+            self.last_error = None
+            self._update_etag()
+            return True
+
+    def _save(self, highlights, fetched_at):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"highlights": highlights, "fetched_at": fetched_at}, f)
+        os.replace(tmp_path, self.path)
+
+    def stats(self):
+        age = self.age()
+        return {
+            "highlights": len(self.highlights),
+            "fallback": self.is_fallback(),
+            "age_seconds": round(age, 1) if age is not None else None,
+            "attempted_at": self.attempted_at,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,322 @@
+import asyncio
+import bisect
+import os
+import random
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import httpx
+
+# Upstream statuses worth another attempt; everything else is returned as-is
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class CircuitOpenError(Exception):
+    """The host's circuit breaker is open; the call was not attempted"""
+
+
+class LatencyHistogram:
+    """Bucketed latency counts plus a window of recent samples for percentiles"""
+
+    def __init__(self, window=1000):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = deque(maxlen=window)
+        self._sorted = None
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.samples.append(ms)
+        self._sorted = None
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self.samples)
+        return self._sorted[min(int(len(self._sorted) * q), len(self._sorted) - 1)]
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": sum(self.counts),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds, then lets a single probe through
+    (half-open); the probe's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def allow(self):
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def failure(self):
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def abandon(self):
+        """The call ended without an outcome (cancelled); a half-open circuit may probe again"""
+        self._probe_in_flight = False
+
+    def to_dict(self):
+        return {"state": self.state, "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened, "rejected": self.rejected}
+
+
+class AIMDLimiter:
+    """
+    Adaptive concurrency limit: +1/limit per success (about +1 per round of
+    requests), halved on failure at most once per `decrease_interval`.
+    """
+
+    def __init__(self, initial=8, min_limit=1, max_limit=64, backoff=0.5, decrease_interval=1.0):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.decrease_interval = decrease_interval
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters = deque()
+
+    def try_acquire(self):
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self):
+        while not self.try_acquire():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken for a free slot but cancelled before taking it: pass the wakeup on
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self, ok):
+        """`ok` is True on success, False on failure, None when the outcome says nothing (cancelled)"""
+        self.in_flight -= 1
+        if ok is True:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        elif ok is False and time.monotonic() - self._last_decrease >= self.decrease_interval:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_decrease = time.monotonic()
+            self.decreases += 1
+        self._wake()
+
+    def _wake(self):
+        for _ in range(max(int(self.limit) - self.in_flight, 0)):
+            if not self._waiters:
+                break
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def to_dict(self):
+        return {"limit": round(self.limit, 2), "in_flight": self.in_flight,
+                "waiting": len(self._waiters), "decreases": self.decreases}
+
+
+class _HostState:
+    def __init__(self, upstream):
+        self.latency = LatencyHistogram()
+        self.breaker = CircuitBreaker(upstream.breaker_failures, upstream.breaker_reset)
+        self.limiter = AIMDLimiter(upstream.initial_limit, max_limit=upstream.max_limit)
+        self.counters = {"requests": 0, "failures": 0, "retries": 0, "hedges": 0, "hedge_wins": 0}
+
+
+class UpstreamClient:
+    """
+    Resilient GETs on top of a shared httpx.AsyncClient, tracked per host:
+
+    - hedging: if a GET has not answered after the host's recent p95
+      latency, a duplicate is sent and the first response that is not a
+      retryable status wins
+    - retries with full-jitter exponential backoff on transport errors and
+      429/502/503/504
+    - a circuit breaker that fails fast while a host keeps failing
+    - an AIMD concurrency limit that shrinks under failures and grows back
+    - latency histograms (p50/p95/p99 and buckets)
+
+    `get()` mirrors `httpx.AsyncClient.get`, so callers can swap it in.
+    """
+
+    def __init__(self, client, retries=2, backoff_base=0.25, backoff_max=4.0, hedge=True,
+                 min_hedge_delay=0.05, hedge_min_samples=20, breaker_failures=5, breaker_reset=30.0,
+                 initial_limit=16, max_limit=None):
+        self.client = client
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.min_hedge_delay = min_hedge_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.initial_limit = initial_limit
+        self.max_limit = max_limit or getattr(client, "max_connections", None) or 64
+        self.hosts = {}
+
+    @property
+    def max_connections(self):
+        return getattr(self.client, "max_connections", None) or self.max_limit
+
+    def _host(self, url):
+        host = urlparse(str(url)).netloc or str(url)
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = _HostState(self)
+        return state
+
+    def _hedge_delay(self, state):
+        if not self.hedge or len(state.latency.samples) < self.hedge_min_samples:
+            return None
+        return max(state.latency.percentile(0.95) / 1000, self.min_hedge_delay)
+
+    async def _send(self, state, url, kwargs):
+        """One physical request; the caller has already taken a limiter slot"""
+        started = time.perf_counter()
+        ok = None
+        try:
+            response = await self.client.get(url, **kwargs)
+            ok = response.status_code < 500 and response.status_code != 429
+            if ok:
+                state.latency.record(time.perf_counter() - started)
+            return response
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ok = False
+            raise
+        finally:
+            state.limiter.release(ok)
+            if ok is True:
+                state.breaker.success()
+            elif ok is False:
+                state.breaker.failure()
+                state.counters["failures"] += 1
+            else:
+                state.breaker.abandon()
+
+    async def _hedged(self, state, url, kwargs):
+        await state.limiter.acquire()
+        primary = asyncio.create_task(self._send(state, url, kwargs))
+        tasks = {primary}
+        error = None
+        try:
+            delay = self._hedge_delay(state)
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done() and state.limiter.try_acquire():
+                    state.counters["hedges"] += 1
+                    tasks.add(asyncio.create_task(self._send(state, url, kwargs)))
+            # A retryable status only wins once no other request is left to answer
+            fallback = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                    elif task.result().status_code in RETRY_STATUSES:
+                        fallback = task.result()
+                    else:
+                        if task is not primary:
+                            state.counters["hedge_wins"] += 1
+                        return task.result()
+            if fallback is not None:
+                return fallback
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def get(self, url, **kwargs):
+        state = self._host(url)
+        state.counters["requests"] += 1
+        for attempt in range(self.retries + 1):
+            if not state.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(str(url)).netloc}")
+            try:
+                response = await self._hedged(state, url, kwargs)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            state.counters["retries"] += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    def stats(self):
+        return {
+            host: {
+                **state.counters,
+                "latency": state.latency.to_dict(),
+                "circuit": state.breaker.to_dict(),
+                "concurrency": state.limiter.to_dict(),
+            }
+            for host, state in self.hosts.items()
+        }
+
+
+def create_upstream(client, prefix="UPSTREAM", **kwargs):
+    """UpstreamClient configured from `<prefix>_*` environment variables"""
+    options = {
+        "retries": int(os.getenv(f"{prefix}_RETRIES", "2")),
+        "hedge": os.getenv(f"{prefix}_HEDGE", "1") == "1",
+        "breaker_failures": int(os.getenv(f"{prefix}_BREAKER_FAILURES", "5")),
+        "breaker_reset": float(os.getenv(f"{prefix}_BREAKER_RESET", "30")),
+        "initial_limit": int(os.getenv(f"{prefix}_INITIAL_CONCURRENCY", "16")),
+    }
+    options.update(kwargs)
+    return UpstreamClient(client, **options)
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chromedriver_path():
+    """Resolve (and if needed download) chromedriver once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def chrome_options():
+    # Setup Chrome options - OPTIMIZED FOR SPEED
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-images")  # Faster loading
+    options.add_argument("--disable-javascript")  # Faster for static content
+    options.add_argument("--blink-settings=imagesEnabled=false")  # No images
+    options.add_argument("--window-size=1920,1080")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # Disable loading of images, CSS, and other resources
+    prefs = {"profile.managed_default_content_settings.images": 2}
+    options.add_experimental_option("prefs", prefs)
+    return options
+
+
+class PoolTimeout(Exception):
+    """No driver became free within the checkout timeout"""
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages", "created_at")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+
+class WebDriverPool:
+    """
+    Bounded pool of warm headless Chrome drivers.
+
+    Drivers are launched lazily (or up front via `warm()`) up to `size`.
+    Callers that find every driver busy wait up to `checkout_timeout`
+    seconds. A driver is health-checked on checkout and recycled after
+    `max_pages` pages or whenever the caller reports an error.
+    """
+
+    def __init__(self, size=2, max_pages=50, checkout_timeout=60.0):
+        self.size = size
+        self.max_pages = max_pages
+        self.checkout_timeout = checkout_timeout
+        self._idle = deque()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.counters = {
+            "launched": 0, "checkouts": 0, "recycled": 0, "unhealthy": 0,
+            "errors": 0, "timeouts": 0, "wait_seconds": 0.0, "busy_seconds": 0.0,
+        }
+
+    def _launch(self):
+        driver = webdriver.Chrome(service=Service(chromedriver_path()), options=chrome_options())
+        # Hide webdriver property
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        with self._cond:
+            self.counters["launched"] += 1
+        return _PooledDriver(driver)
+
+    @staticmethod
+    def _is_healthy(pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def warm(self, count=None):
+        """Pre-launch drivers so the first requests don't pay browser startup"""
+        for _ in range(min(count or self.size, self.size)):
+            with self._cond:
+                if self._closed or self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                pooled = self._launch()
+            except Exception as e:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                print(f"⚠ Could not pre-launch Chrome: {e}")
+                return
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def checkout(self):
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver pool is shut down")
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        launch = False
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        pooled = None
+                        launch = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        raise PoolTimeout(f"No WebDriver free after {self.checkout_timeout:.0f}s")
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+            self.counters["checkouts"] += 1
+
+        try:
+            if not launch and not self._is_healthy(pooled):
+                with self._cond:
+                    self.counters["unhealthy"] += 1
+                self._quit(pooled)
+                launch = True
+            if launch:
+                pooled = self._launch()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.counters["wait_seconds"] += time.monotonic() - started
+        return pooled
+
+    def checkin(self, pooled, failed=False, busy_seconds=0.0):
+        pooled.pages += 1
+        recycle = failed or pooled.pages >= self.max_pages or self._closed
+        if not recycle:
+            try:
+                # Drop the previous page so idle drivers don't hold its DOM
+                pooled.driver.get("about:blank")
+            except Exception:
+                recycle = True
+        if recycle:
+            self._quit(pooled)
+        with self._cond:
+            self._in_use -= 1
+            self.counters["busy_seconds"] += busy_seconds
+            if failed:
+                self.counters["errors"] += 1
+            if recycle:
+                self._created -= 1
+                self.counters["recycled"] += 1
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def driver(self):
+        """Check a driver out for the duration of a `with` block"""
+        pooled = self.checkout()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield pooled.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.checkin(pooled, failed=failed, busy_seconds=time.monotonic() - started)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def stats(self):
+        with self._cond:
+            counters = dict(self.counters)
+            return {
+                **counters,
+                "size": self.size,
+                "alive": self._created,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "utilization": round(self._in_use / self.size, 3) if self.size else 0.0,
+                "avg_wait_seconds": round(counters["wait_seconds"] / counters["checkouts"], 4) if counters["checkouts"] else 0.0,
+            }
@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react"
 import { useParams, useNavigate } from "react-router-dom"
+import { readEventStream } from "../readEventStream"
 
 
 const API_BASE = "http://127.0.0.1:8000"
@@ -50,7 +51,8 @@ function AnalysisPage() {
         
         const cleanContent = contentData.content ? contentData.content.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim() : ''
         
-        const res = await fetch(`${API_BASE}/ai/comprehensive-summary`, {
+        // Streamed: chart data, keywords and metadata arrive first, then the summary token by token
+        const res = await fetch(`${API_BASE}/ai/comprehensive-summary/stream`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({
@@ -63,29 +65,49 @@ function AnalysisPage() {
           throw new Error(`Server error: ${res.status}`)
         }
         
-        const analysisData = await res.json()
+        const scrollToHash = () => {
+          // Scroll to hash section after data loads
+          setTimeout(() => {
+            if (window.location.hash) {
+              const element = document.getElementById(window.location.hash.substring(1))
+              if (element) {
+                element.scrollIntoView({ behavior: 'smooth', block: 'start' })
+              }
+            }
+          }, 100)
+        }
+
+        let analysisData = null
+        await readEventStream(res, (event, payload) => {
+          if (event === 'meta') {
+            setData({ summary: '', ...payload })
+            setLoading(false)
+            scrollToHash()
+          } else if (event === 'token') {
+            setData(prev => ({ ...prev, summary: prev.summary + payload.text }))
+          } else if (event === 'keywords') {
+            setData(prev => ({ ...prev, keywords: payload.keywords }))
+          } else if (event === 'done') {
+            analysisData = payload
+          }
+        })
+        if (!analysisData) {
+          throw new Error('Analysis stream ended early')
+        }
         console.log('Analysis data received:', analysisData)
         
-        // Cache the result
-        localStorage.setItem(cacheKey, JSON.stringify({
-          analysis: analysisData,
-          article: foundArticle,
-          timestamp: Date.now()
-        }))
-        console.log('✓ Analysis cached')
+        // Cache the result, unless the summary stream was cut off
+        if (!analysisData.incomplete) {
+          localStorage.setItem(cacheKey, JSON.stringify({
+            analysis: analysisData,
+            article: foundArticle,
+            timestamp: Date.now()
+          }))
+          console.log('✓ Analysis cached')
+        }
         
         setData(analysisData)
         setLoading(false)
-        
-        // Scroll to hash section after data loads
-        setTimeout(() => {
-          if (window.location.hash) {
-            const element = document.getElementById(window.location.hash.substring(1))
-            if (element) {
-              element.scrollIntoView({ behavior: 'smooth', block: 'start' })
-            }
-          }
-        }, 100)
       } catch (err) {
         console.error('Analysis failed:', err)
         setData({ error: err.message })
@@ -151,8 +173,8 @@ function AnalysisPage() {
       const contentData = await contentRes.json()
       const cleanContent = contentData.content ? contentData.content.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim() : ''
       
-      // Call AI chat endpoint
-      const response = await fetch(`${API_BASE}/ai/chat`, {
+      // Call AI chat endpoint; the answer streams in token by token
+      const response = await fetch(`${API_BASE}/ai/chat/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -162,11 +184,24 @@ function AnalysisPage() {
         })
       })
       
-      const aiResponse = await response.json()
-      setChatMessages(prev => [...prev, { 
-        role: 'assistant', 
-        content: aiResponse.answer || 'Sorry, I could not generate a response.'
-      }])
+      let answer = ''
+      // The streamed answer grows in place as the last message
+      const showAnswer = (content, streaming) => {
+        setChatMessages(prev => {
+          const message = { role: 'assistant', content, streaming }
+          return prev[prev.length - 1]?.streaming ? [...prev.slice(0, -1), message] : [...prev, message]
+        })
+      }
+      await readEventStream(response, (event, payload) => {
+        if (event === 'token') {
+          answer += payload.text
+          showAnswer(answer, true)
+          setChatLoading(false)
+        } else if (event === 'done') {
+          answer = payload.answer
+        }
+      })
+      showAnswer(answer || 'Sorry, I could not generate a response.', false)
       setChatLoading(false)
     } catch (err) {
       console.error('Chat error:', err)
@@ -299,6 +334,9 @@ function AnalysisPage() {
             </div>
             
             <p style={{ fontSize: '22px', lineHeight: 1.9, color: '#f0f0f0', textAlign: 'justify', fontWeight: 300 }}>{data.summary}</p>
+            {data.incomplete && (
+              <p style={{ fontSize: '14px', color: '#FFB347', marginTop: '-10px' }}>The AI summary was interrupted and may be incomplete. Reload to try again.</p>
+            )}
           </div>
 
           {/* Chatbot */}
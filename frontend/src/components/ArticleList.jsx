@@ -1,64 +1,91 @@
-import { useState, useEffect, useMemo } from "react";
-import Fuse from "fuse.js";
+import { useState, useEffect } from "react";
+
+const ARTICLES_URL = "http://localhost:8000/articles";
+const PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 250;
+const SORT_OPTIONS = [
+  { value: "id", label: "Catalog order" },
+  { value: "title", label: "Title A-Z" },
+  { value: "-title", label: "Title Z-A" },
+  { value: "type", label: "Type" },
+];
+
+// "no-cache" revalidates with the server's ETag, so unchanged pages come back as 304s
+const fetchJson = async (url, signal) => {
+  const res = await fetch(url, { cache: "no-cache", signal });
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  return res;
+};
 
 function ArticleList({ onSelectArticle }) {
   const [articles, setArticles] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [types, setTypes] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const [searchTerm, setSearchTerm] = useState("");
-  const [yearFilter, setYearFilter] = useState("all");
+  const [query, setQuery] = useState("");
   const [typeFilter, setTypeFilter] = useState("all");
+  const [sort, setSort] = useState("id");
+  const [offset, setOffset] = useState(0);
 
+  // Filter options come from the server's type counts, not from a full listing
   useEffect(() => {
-    // Check if articles exist in session storage
-    const cachedArticles = sessionStorage.getItem('nasa_articles');
-    if (cachedArticles) {
-      setArticles(JSON.parse(cachedArticles));
-      setLoading(false);
-      return;
-    }
+    const controller = new AbortController();
+    fetchJson(`${ARTICLES_URL}/types`, controller.signal)
+      .then((res) => res.json())
+      .then((data) => setTypes(data.map((entry) => entry.type)))
+      .catch((err) => {
+        if (err.name !== "AbortError") console.error("Error fetching article types:", err);
+      });
+    return () => controller.abort();
+  }, []);
 
-    // Fetch from API if not cached
-    fetch("http://localhost:8000/articles")
-      .then((res) => {
-        if (!res.ok) throw new Error(`HTTP ${res.status}`);
-        return res.json();
-      })
-      .then((data) => {
-        // Store in session storage
-        sessionStorage.setItem('nasa_articles', JSON.stringify(data));
-        setArticles(data);
+  // Search on the server once typing pauses
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setQuery(searchTerm.trim());
+      setOffset(0);
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const params = new URLSearchParams({ offset: String(offset), limit: String(PAGE_SIZE), sort });
+    if (query) params.set("q", query);
+    if (typeFilter !== "all") params.set("type", typeFilter);
+
+    setLoadingMore(offset > 0);
+    fetchJson(`${ARTICLES_URL}?${params}`, controller.signal)
+      .then(async (res) => {
+        const page = await res.json();
+        setTotal(Number(res.headers.get("X-Total-Count") ?? page.length));
+        setArticles((prev) => (offset === 0 ? page : [...prev, ...page]));
+        setError(null);
         setLoading(false);
+        setLoadingMore(false);
       })
       .catch((err) => {
+        if (err.name === "AbortError") return;
         console.error("Error fetching articles:", err);
         setError(err.message);
         setLoading(false);
+        setLoadingMore(false);
       });
-  }, []);
+    return () => controller.abort();
+  }, [query, typeFilter, sort, offset]);
 
-  // 🔍 Setup Fuse.js
-  const fuse = useMemo(() => {
-    return new Fuse(articles, {
-      keys: ["title", "author", "abstract"], // fields to search
-      threshold: 0.3,
-    });
-  }, [articles]);
-
-  // 🔄 Apply Search + Filters
-  const filteredArticles = useMemo(() => {
-    let results = searchTerm ? fuse.search(searchTerm).map((r) => r.item) : articles;
-
-    if (yearFilter !== "all") {
-      results = results.filter((a) => String(a.year) === yearFilter);
-    }
+  const hasMore = articles.length < total;
 
-    if (typeFilter !== "all") {
-      results = results.filter((a) => a.type === typeFilter);
+  // Fetch the next page when the list is scrolled near its end
+  const handleScroll = (e) => {
+    const { scrollTop, scrollHeight, clientHeight } = e.currentTarget;
+    if (hasMore && !loadingMore && scrollHeight - scrollTop - clientHeight < 200) {
+      setOffset(articles.length);
     }
-
-    return results;
-  }, [searchTerm, yearFilter, typeFilter, fuse, articles]);
+  };
 
   if (loading) {
     return (
@@ -97,7 +124,7 @@ function ArticleList({ onSelectArticle }) {
           NASA Space Biology Publications
         </h2>
         <p className="text-gray-300 text-sm">
-          {filteredArticles.length} articles available
+          {total} articles available
         </p>
       </div>
 
@@ -114,30 +141,35 @@ function ArticleList({ onSelectArticle }) {
 
         {/* Filters */}
         <div className="flex gap-4">
-          {/* Year Filter */}
+          {/* Type Filter */}
           <select
-            value={yearFilter}
-            onChange={(e) => setYearFilter(e.target.value)}
+            value={typeFilter}
+            onChange={(e) => {
+              setTypeFilter(e.target.value);
+              setOffset(0);
+            }}
             className="px-3 py-2 border rounded-lg"
           >
-            <option value="all">All Years</option>
-            {[...new Set(articles.map((a) => a.year))].map((year) => (
-              <option key={year} value={year}>
-                {year}
+            <option value="all">All Types</option>
+            {types.map((type) => (
+              <option key={type} value={type}>
+                {type}
               </option>
             ))}
           </select>
 
-          {/* Type Filter */}
+          {/* Sort */}
           <select
-            value={typeFilter}
-            onChange={(e) => setTypeFilter(e.target.value)}
+            value={sort}
+            onChange={(e) => {
+              setSort(e.target.value);
+              setOffset(0);
+            }}
             className="px-3 py-2 border rounded-lg"
           >
-            <option value="all">All Types</option>
-            {[...new Set(articles.map((a) => a.type))].map((type) => (
-              <option key={type} value={type}>
-                {type}
+            {SORT_OPTIONS.map((option) => (
+              <option key={option.value} value={option.value}>
+                {option.label}
               </option>
             ))}
           </select>
@@ -145,14 +177,14 @@ function ArticleList({ onSelectArticle }) {
       </div>
 
       {/* Articles List */}
-      <div className="h-80 overflow-y-auto">
-        {filteredArticles.length === 0 ? (
+      <div className="h-80 overflow-y-auto" onScroll={handleScroll}>
+        {articles.length === 0 ? (
           <div className="p-8 text-center text-gray-500">
             No articles found
           </div>
         ) : (
           <div className="space-y-1">
-            {filteredArticles.map((article, index) => (
+            {articles.map((article, index) => (
               <div
                 key={article.id}
                 className="group p-4 hover:bg-gray-100 cursor-pointer border-l-4 border-transparent hover:border-gray-600 transition-all"
@@ -169,7 +201,7 @@ function ArticleList({ onSelectArticle }) {
                       {article.title}
                     </h3>
                     <p className="text-xs text-gray-500 mt-1">
-                      {article.type} • {article.year}
+                      {article.type}
                     </p>
                   </div>
                   <svg
@@ -188,6 +220,11 @@ function ArticleList({ onSelectArticle }) {
                 </div>
               </div>
             ))}
+            {loadingMore && (
+              <div className="p-4 text-center text-xs text-gray-500">
+                Loading more articles...
+              </div>
+            )}
           </div>
         )}
       </div>
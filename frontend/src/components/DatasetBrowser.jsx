@@ -1,5 +1,4 @@
-import { useState, useEffect, useMemo } from "react";
-import Fuse from 'fuse.js';
+import { useState, useEffect } from "react";
 
 // Import images from assets folder
 import cellImage from '../assets/cell.webp';
@@ -11,86 +10,104 @@ import organImage from '../assets/Organ Samples.webp';
 import equipmentImage from '../assets/Equipment.webp';
 import earthImage from '../assets/Earth from Space.jpg';
 
+const SEARCH_URL = "http://localhost:8000/api/datasets/search";
+const FACET_LABELS = { organism: "Organism", material: "Material", factor: "Factor", funding: "Funding" };
+const NO_FILTERS = { organism: [], material: [], factor: [], funding: [] };
+const SEARCH_DEBOUNCE_MS = 250;
+const SNAPSHOT_RETRY_MS = 3000;
+
 function DatasetBrowser() {
-  const [allDatasets, setAllDatasets] = useState([]);
-  const [filteredDatasets, setFilteredDatasets] = useState([]);
+  const [datasets, setDatasets] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [facets, setFacets] = useState({});
+  const [filters, setFilters] = useState(NO_FILTERS);
   const [loading, setLoading] = useState(true);
+  const [building, setBuilding] = useState(false);
+  const [error, setError] = useState(null);
+  const [retry, setRetry] = useState(0);
   const [searchTerm, setSearchTerm] = useState("");
+  const [query, setQuery] = useState("");
   const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage] = useState(25);
   const [viewMode, setViewMode] = useState("box");
 
+  // Search on the server once typing pauses
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setQuery(searchTerm.trim());
+      setCurrentPage(1);
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
   useEffect(() => {
+    const controller = new AbortController();
+    let retryTimer;
+
     const fetchDatasets = async () => {
+      const params = new URLSearchParams({
+        q: query,
+        offset: String((currentPage - 1) * itemsPerPage),
+        limit: String(itemsPerPage),
+      });
+      for (const [field, values] of Object.entries(filters)) {
+        values.forEach((value) => params.append(field, value));
+      }
       try {
-        // Check if data exists in session storage
-        const cachedData = sessionStorage.getItem('nasa_datasets');
-        if (cachedData) {
-          const datasets = JSON.parse(cachedData);
-          setAllDatasets(datasets);
-          setFilteredDatasets(datasets);
-          setLoading(false);
+        const res = await fetch(`${SEARCH_URL}?${params}`, { signal: controller.signal });
+        if (res.status === 503) {
+          // The server is still building its dataset snapshot
+          setBuilding(true);
+          retryTimer = setTimeout(() => setRetry((n) => n + 1), SNAPSHOT_RETRY_MS);
           return;
         }
-
-        // Fetch from API if not cached
-        const res = await fetch("http://localhost:8000/api/datasets/bulk");
         if (!res.ok) {
           throw new Error(`HTTP ${res.status}`);
         }
-        const datasets = await res.json();
-        const datasetArray = Array.isArray(datasets) ? datasets : [];
-        
-        // Store in session storage
-        sessionStorage.setItem('nasa_datasets', JSON.stringify(datasetArray));
-        
-        setAllDatasets(datasetArray);
-        setFilteredDatasets(datasetArray);
+        const data = await res.json();
+        setDatasets(data.results);
+        setTotal(data.total);
+        setFacets(data.facets);
+        setBuilding(false);
+        setError(null);
         setLoading(false);
       } catch (err) {
-        console.error("Error fetching datasets:", err);
-        setAllDatasets([]);
-        setFilteredDatasets([]);
+        if (err.name === "AbortError") return;
+        console.error("Error searching datasets:", err);
+        setDatasets([]);
+        setTotal(0);
+        setError("Could not load datasets");
+        setBuilding(false);
         setLoading(false);
       }
     };
 
     fetchDatasets();
-  }, []);
+    return () => {
+      controller.abort();
+      clearTimeout(retryTimer);
+    };
+  }, [query, filters, currentPage, itemsPerPage, retry]);
 
-  const fuse = useMemo(() => {
-    try {
-      return new Fuse(allDatasets, {
-        keys: ['title', 'accession', 'organism', 'description', 'material'],
-        threshold: 0.3,
-        includeScore: true
-      });
-    } catch (error) {
-      console.error('Error creating Fuse instance:', error);
-      return null;
-    }
-  }, [allDatasets]);
+  const toggleFilter = (field, value) => {
+    setFilters((prev) => {
+      const values = prev[field].includes(value)
+        ? prev[field].filter((v) => v !== value)
+        : [...prev[field], value];
+      return { ...prev, [field]: values };
+    });
+    setCurrentPage(1);
+  };
 
-  useEffect(() => {
-    try {
-      if (!searchTerm) {
-        setFilteredDatasets(allDatasets);
-      } else if (fuse) {
-        const results = fuse.search(searchTerm);
-        setFilteredDatasets(results.map(result => result.item));
-      } else {
-        setFilteredDatasets(allDatasets);
-      }
-      setCurrentPage(1);
-    } catch (error) {
-      console.error('Error filtering datasets:', error);
-      setFilteredDatasets(allDatasets);
-    }
-  }, [searchTerm, allDatasets, fuse]);
+  const clearAll = () => {
+    setSearchTerm("");
+    setQuery("");
+    setFilters(NO_FILTERS);
+    setCurrentPage(1);
+  };
 
-  const totalPages = Math.ceil(filteredDatasets.length / itemsPerPage);
-  const startIndex = (currentPage - 1) * itemsPerPage;
-  const currentDatasets = filteredDatasets.slice(startIndex, startIndex + itemsPerPage);
+  const hasFilters = Object.values(filters).some((values) => values.length > 0);
+  const totalPages = Math.ceil(total / itemsPerPage);
 
   const getImage = (ds) => {
     try {
@@ -149,7 +166,9 @@ function DatasetBrowser() {
       <div className="flex items-center justify-center min-h-screen bg-gradient-to-br from-slate-900 via-blue-900 to-slate-900">
         <div className="text-center">
           <div className="inline-block animate-spin rounded-full h-16 w-16 border-t-4 border-b-4 border-blue-400 mb-4"></div>
-          <p className="text-xl text-white font-light">Loading NASA Datasets...</p>
+          <p className="text-xl text-white font-light">
+            {building ? "Preparing the dataset catalog..." : "Loading NASA Datasets..."}
+          </p>
         </div>
       </div>
     );
@@ -168,11 +187,11 @@ function DatasetBrowser() {
           <div className="flex flex-col lg:flex-row justify-between items-start lg:items-center gap-6">
             <div className="flex items-center gap-3">
               <div className="bg-black text-white px-6 py-3 rounded-xl font-semibold text-lg shadow-lg">
-                {filteredDatasets.length} Datasets
+                {total} Datasets
               </div>
-              {searchTerm && (
+              {(searchTerm || hasFilters) && (
                 <button
-                  onClick={() => setSearchTerm("")}
+                  onClick={clearAll}
                   className="text-blue-300 hover:text-white transition-colors text-sm underline"
                 >
                   Clear search
@@ -188,7 +207,7 @@ function DatasetBrowser() {
                 </svg>
                 <input
                   type="text"
-                  placeholder="Search by title, ID, organism..."
+                  placeholder="Search by title, ID, description..."
                   value={searchTerm}
                   onChange={(e) => setSearchTerm(e.target.value)}
                   className="w-full pl-12 pr-4 py-3 bg-white/90 border-2 border-transparent rounded-xl focus:ring-2 focus:ring-blue-400 focus:border-blue-400 focus:bg-white transition-all shadow-lg"
@@ -231,22 +250,55 @@ function DatasetBrowser() {
               </div>
             </div>
           </div>
+
+          {/* Facets */}
+          {Object.keys(FACET_LABELS).some((field) => facets[field]?.length || filters[field].length) && (
+            <div className="mt-6 space-y-3">
+              {Object.entries(FACET_LABELS).map(([field, label]) => {
+                const options = facets[field] || [];
+                const listed = new Set(options.map((option) => option.value));
+                const selectedOnly = filters[field].filter((value) => !listed.has(value));
+                if (!options.length && !selectedOnly.length) return null;
+                return (
+                  <div key={field} className="flex flex-wrap items-center gap-2 text-sm">
+                    <span className="text-gray-500 font-medium w-20">{label}:</span>
+                    {[...selectedOnly.map((value) => ({ value, count: 0 })), ...options].map(({ value, count }) => {
+                      const selected = filters[field].includes(value);
+                      return (
+                        <button
+                          key={value}
+                          onClick={() => toggleFilter(field, value)}
+                          className={`px-3 py-1 rounded-full border transition-colors ${
+                            selected
+                              ? "bg-black text-white border-black"
+                              : "bg-white text-gray-700 border-gray-300 hover:bg-gray-100"
+                          }`}
+                        >
+                          {value} <span className={selected ? "text-gray-300" : "text-gray-400"}>({count})</span>
+                        </button>
+                      );
+                    })}
+                  </div>
+                );
+              })}
+            </div>
+          )}
         </div>
 
         {/* Results Container */}
         <div className="bg-gray-50 rounded-2xl shadow-lg border border-gray-200 p-6">
           <div className="max-h-[600px] overflow-y-auto custom-scrollbar">
-            {currentDatasets.length === 0 ? (
+            {datasets.length === 0 ? (
               <div className="text-center py-16">
                 <svg className="w-20 h-20 text-blue-300 mx-auto mb-4 opacity-50" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M9.172 16.172a4 4 0 015.656 0M9 10h.01M15 10h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z" />
                 </svg>
-                <p className="text-white text-xl">No datasets found</p>
-                <p className="text-blue-300 mt-2">Try adjusting your search terms</p>
+                <p className="text-white text-xl">{error || "No datasets found"}</p>
+                <p className="text-blue-300 mt-2">{error ? "Please try again later" : "Try adjusting your search terms or filters"}</p>
               </div>
             ) : (
               <div className={viewMode === "box" ? "grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6" : "space-y-4"}>
-                {currentDatasets.map((ds) => {
+                {datasets.map((ds) => {
                   try {
                     const image = getImage(ds);
                     return (
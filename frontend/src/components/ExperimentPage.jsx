@@ -54,57 +54,19 @@ export default function ExperimentPage() {
     try {
       setLoading(true);
       
-      const expResponse = await axios.get(`http://localhost:8000/api/dataset/${id}`);
-      const datasetKey = Object.keys(expResponse.data)[0];
-      setExperiment(expResponse.data[datasetKey]);
-      
-      try {
-        const assaysResponse = await axios.get(`http://localhost:8000/api/dataset/${id}/assays`);
-        const assaysData = assaysResponse.data;
-        
-        const assaysList = [];
-        if (assaysData && typeof assaysData === 'object') {
-          Object.keys(assaysData).forEach(datasetId => {
-            if (assaysData[datasetId] && assaysData[datasetId].assays) {
-              Object.entries(assaysData[datasetId].assays).forEach(([key, value]) => {
-                assaysList.push({
-                  name: key,
-                  url: value.REST_URL
-                });
-              });
-            }
-          });
-        }
-        setAssays(assaysList);
-      } catch (err) {
-        console.error('Error fetching assays:', err);
-        setAssays([]);
-      }
-      
-      try {
-        const filesResponse = await axios.get(`http://localhost:8000/api/dataset/${id}/files`);
-        const filesData = filesResponse.data;
-        
-        let filesList = [];
-        if (filesData && typeof filesData === 'object') {
-          Object.keys(filesData).forEach(datasetKey => {
-            if (filesData[datasetKey] && filesData[datasetKey].files) {
-              Object.entries(filesData[datasetKey].files).forEach(([fileName, fileInfo]) => {
-                filesList.push({
-                  name: fileName,
-                  url: fileInfo.URL || fileInfo.REST_URL,
-                  restUrl: fileInfo.REST_URL
-                });
-              });
-            }
-          });
-        }
-        setFiles(filesList);
-      } catch (err) {
-        console.error('Error fetching files:', err);
-        setFiles([]);
+      // Dataset, assays and files resolved concurrently by the backend in one round trip
+      const expResponse = await axios.get(`http://localhost:8000/api/dataset/${id}/experiment?depth=1`);
+      const doc = expResponse.data;
+      setExperiment(doc.dataset);
+
+      if (doc.errors) {
+        console.error('Partial experiment data:', doc.errors);
       }
-      
+      setAssays(Array.isArray(doc.assays) ? doc.assays : []);
+      setFiles(Array.isArray(doc.files)
+        ? doc.files.map(file => ({ name: file.name, url: file.url, restUrl: file.rest_url }))
+        : []);
+
       setLoading(false);
     } catch (error) {
       console.error('Error fetching experiment:', error);
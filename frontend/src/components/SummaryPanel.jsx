@@ -1,10 +1,12 @@
 import { useState } from 'react'
 import { BarChart, Bar, LineChart, Line, PieChart, Pie, XAxis, YAxis, Tooltip, ResponsiveContainer, Cell, Legend } from 'recharts'
+import { readEventStream } from '../readEventStream'
 
 const API_BASE = "http://127.0.0.1:8000"
 
 function SummaryPanel({ article, content }) {
   const [summary, setSummary] = useState('')
+  const [incomplete, setIncomplete] = useState(false)
   const [keywords, setKeywords] = useState([])
   const [chartInfo, setChartInfo] = useState(null)
   const [loading, setLoading] = useState(false)
@@ -13,8 +15,9 @@ function SummaryPanel({ article, content }) {
   const generateSummary = async () => {
     setIsOpen(true)
     setLoading(true)
+    setIncomplete(false)
     try {
-      const res = await fetch(`${API_BASE}/ai/comprehensive-summary`, {
+      const res = await fetch(`${API_BASE}/ai/comprehensive-summary/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ 
@@ -22,10 +25,25 @@ function SummaryPanel({ article, content }) {
           content: content.replace(/<[^>]*>/g, '')
         })
       })
-      const data = await res.json()
-      setSummary(data.summary || '')
-      setKeywords(data.keywords || [])
-      setChartInfo(data.chartData || null)
+      // Chart and keywords arrive first; the summary then streams in
+      let streamed = ''
+      await readEventStream(res, (event, data) => {
+        if (event === 'meta') {
+          setKeywords(data.keywords || [])
+          setChartInfo(data.chartData || null)
+          setLoading(false)
+        } else if (event === 'token') {
+          streamed += data.text
+          setSummary(streamed)
+        } else if (event === 'keywords') {
+          setKeywords(data.keywords || [])
+        } else if (event === 'done') {
+          setSummary(data.summary || '')
+          setIncomplete(Boolean(data.incomplete))
+          setKeywords(data.keywords || [])
+          setChartInfo(data.chartData || null)
+        }
+      })
     } catch (err) {
       console.error('Summary generation failed:', err)
     }
@@ -205,7 +223,7 @@ function SummaryPanel({ article, content }) {
             </div>
           )}
 
-          {!loading && summary && (
+          {!loading && (summary || chartInfo) && (
             <>
               <div style={{
                 background: '#f9fafb',
@@ -215,6 +233,9 @@ function SummaryPanel({ article, content }) {
               }}>
                 <h4 style={{ color: '#374151', fontSize: '16px', fontWeight: '600', marginBottom: '10px' }}>📄 Summary</h4>
                 <p style={{ color: '#4b5563', lineHeight: '1.6', margin: 0 }}>{summary}</p>
+                {incomplete && (
+                  <p style={{ color: '#b45309', fontSize: '13px', margin: '10px 0 0 0' }}>The AI summary was interrupted and may be incomplete.</p>
+                )}
               </div>
 
               {keywords.length > 0 && (
@@ -241,7 +262,7 @@ function SummaryPanel({ article, content }) {
             </>
           )}
 
-          {!loading && !summary && (
+          {!loading && !summary && !chartInfo && (
             <div style={{ textAlign: 'center', padding: '40px', color: '#9ca3af' }}>
               <p>Click "Generate Summary & Chart" to analyze this article</p>
             </div>